@@ -1,9 +1,26 @@
-from fastapi import APIRouter, HTTPException
-from app.business_logic.inference import infer_emotion
-from app.models.schemas import InferenceRequest, InferenceResponse
+import hmac
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+from typing import List, Literal, Optional
+from app.business_logic.batching import batcher
+from app.business_logic.cache import result_cache
+from app.business_logic.executor import executor
+from app.business_logic.backends import BACKENDS
+from app.business_logic.inference import (
+    DEFAULT_TOP_K, EMOTIONS, infer_emotions_bulk, infer_emotion_long, start_model_swap
+)
+from app.business_logic.registry import registry
+from app.business_logic.streaming import stream_inference
+from app.models.schemas import (
+    InferenceRequest, InferenceResponse, BatchInferenceRequest, BatchInferenceResponse, BatchInferenceItem,
+    CacheStatsResponse, EmotionsResponse, ModelSwapRequest, ModelStatusResponse
+)
 from app.config.logger import get_logger
+from app.config.settings import settings
 from app.utils.validators import validate_non_empty_string, validate_string_length
-from app.utils.exceptions import InferenceValidationError
+from app.utils.exceptions import InferenceValidationError, InferenceOverloadedError, ModelSwapInProgressError
 
 # Initialize the logger
 logger = get_logger(__name__)
@@ -11,6 +28,28 @@ logger = get_logger(__name__)
 # Initialize the router
 router = APIRouter()
 
+# Maximum number of characters accepted per text
+MAX_TEXT_LENGTH = 500
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body iterator reads the request body while it writes.
+
+    StreamingResponse watches for the client disconnecting by reading from the
+    request in parallel, which would swallow the body chunks the iterator still has
+    to read. Here the iterator is the only reader, and a disconnect surfaces as a
+    ClientDisconnect from `request.stream()`.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except ClientDisconnect:
+            logger.warning("Client disconnected during streaming inference.")
+            return
+        if self.background is not None:
+            await self.background()
+
 @router.post("/inference", response_model=InferenceResponse)
 async def inference(request: InferenceRequest):
     """
@@ -23,24 +62,217 @@ async def inference(request: InferenceRequest):
         InferenceResponse: The inferred emotions with confidence scores.
 
     Raises:
-        HTTPException: If an error occurs during inference.
+        HTTPException: If an error occurs during inference, or with a 503 status code
+            if the service has too many pending requests.
     """
     try:
-        # Validate input string
+        # Validate input string; long-text mode accepts texts beyond the model's token budget
         validate_non_empty_string(request.text)
-        validate_string_length(request.text, max_length=500)  # Limiting max length of the input text
+        max_length = settings.LONG_TEXT_MAX_LENGTH if request.long_text else MAX_TEXT_LENGTH
+        validate_string_length(request.text, max_length=max_length)  # Limiting max length of the input text
 
-        result = infer_emotion(request.text)
+        scoring = request.scoring or settings.SCORING
+        if request.long_text:
+            # Windows of a long text are already batched together, so they bypass the micro-batcher
+            key = result_cache.make_key(
+                request.text, registry.identity, request.top_k, request.include_probabilities, scoring,
+                request.threshold, "long", request.aggregation
+            )
+            result = await result_cache.get_or_compute(key, lambda: executor.submit(
+                infer_emotion_long, request.text, request.aggregation, request.top_k, request.include_probabilities,
+                scoring, request.threshold
+            ))
+        else:
+            # Serve repeats from the cache; otherwise queue the text for the next micro-batch
+            key = result_cache.make_key(
+                request.text, registry.identity, request.top_k, request.include_probabilities, scoring, request.threshold
+            )
+            result = await result_cache.get_or_compute(key, lambda: batcher.submit(
+                (request.text, request.top_k, request.include_probabilities, scoring, request.threshold)
+            ))
         logger.info(f"Inference successful for text: {request.text[:50]}...")  # Log first 50 characters
         return InferenceResponse(
             emotions=result["emotions"],
             predominant_emotion=result["predominant_emotion"],
-            confidence=result["confidence"]
+            confidence=result["confidence"],
+            tokens=result["tokens"],
+            windows=result.get("windows"),
+            probabilities=result.get("probabilities"),
+            scoring=result["scoring"],
+            labels=result.get("labels"),
+            model_version=result.get("model_version")
         )
     except InferenceValidationError as e:
         # Catch validation errors and return a 422 response
         logger.error(f"Inference validation error: {e}")
         raise HTTPException(status_code=422, detail=str(e))
+    except InferenceOverloadedError as e:
+        # Shed load instead of queueing requests without bound
+        logger.warning(f"Inference rejected: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         logger.error(f"Inference error: {e}")
-        raise HTTPException(status_code=500, detail="An error occurred during model inference.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="An error occurred during model inference.")
+
+@router.post("/inference/batch", response_model=BatchInferenceResponse)
+async def batch_inference(request: BatchInferenceRequest):
+    """
+    Endpoint to perform emotion inference on several texts in a single call.
+
+    Invalid texts are reported individually instead of failing the whole batch.
+
+    Args:
+        request (BatchInferenceRequest): Input texts for emotion inference.
+
+    Returns:
+        BatchInferenceResponse: One result or error per text, in request order.
+
+    Raises:
+        HTTPException: If the batch is too large, the service is overloaded (503),
+            or an unexpected error occurs during inference.
+    """
+    if len(request.texts) > settings.BULK_MAX_TEXTS:
+        logger.error(f"Batch inference rejected: {len(request.texts)} texts exceed the limit")
+        raise HTTPException(
+            status_code=422,
+            detail=f"A batch should not contain more than {settings.BULK_MAX_TEXTS} texts. "
+                   f"Given: {len(request.texts)}"
+        )
+
+    try:
+        outcomes = await executor.run(
+            infer_emotions_bulk, request.texts, settings.BULK_SUB_BATCH_SIZE, MAX_TEXT_LENGTH, request.top_k,
+            request.include_probabilities, request.scoring, request.threshold
+        )
+        logger.info(f"Batch inference completed for {len(request.texts)} texts")
+        return BatchInferenceResponse(
+            results=[BatchInferenceItem(index=index, **outcome) for index, outcome in enumerate(outcomes)]
+        )
+    except InferenceOverloadedError as e:
+        logger.warning(f"Batch inference rejected: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        logger.error(f"Batch inference error: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred during model inference.")
+
+@router.post("/inference/stream")
+async def streaming_inference(
+    request: Request,
+    top_k: int = Query(DEFAULT_TOP_K, ge=1, le=len(EMOTIONS)),
+    include_probabilities: bool = Query(False),
+    scoring: Optional[Literal["softmax", "sigmoid"]] = Query(None),
+    threshold: Optional[float] = Query(None, ge=0, le=1)
+):
+    """
+    Endpoint to score an unbounded stream of texts.
+
+    The request body is newline-delimited JSON, one text per line, either as a JSON
+    string or as an object with a "text" and an optional "id". It is read as it
+    arrives and scored in batches of STREAM_BATCH_SIZE lines; the NDJSON results of
+    each batch are streamed back as soon as it completes, so memory stays flat
+    whatever the size of the input.
+
+    Args:
+        request (Request): The incoming request, whose body is streamed.
+        top_k (int): The number of top emotions to return for each text.
+        include_probabilities (bool): Whether to return the full probability vector of each text.
+        scoring (Optional[str]): The scoring head (defaults to SCORING).
+        threshold (Optional[float]): The sigmoid threshold (defaults to the configured thresholds).
+
+    Returns:
+        StreamingResponse: One NDJSON record per non-empty input line, in input order,
+            with its "index", its "id" if given, and a "result" or an "error".
+    """
+    async def score(texts: List[str]) -> List[dict]:
+        # Wait for a free worker rather than failing a long-running job on a burst of traffic
+        return await executor.run(
+            infer_emotions_bulk, texts, settings.BULK_SUB_BATCH_SIZE, MAX_TEXT_LENGTH, top_k, include_probabilities,
+            scoring, threshold, wait=True
+        )
+
+    return DuplexStreamingResponse(
+        stream_inference(request.stream(), score, settings.STREAM_BATCH_SIZE, settings.STREAM_MAX_LINE_BYTES),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/emotions", response_model=EmotionsResponse)
+async def emotions():
+    """
+    Endpoint to list the emotions of the model.
+
+    Returns:
+        EmotionsResponse: The emotion labels, in the order of the `probabilities` arrays.
+    """
+    return EmotionsResponse(emotions=EMOTIONS)
+
+def check_admin_token(token: Optional[str]) -> None:
+    """
+    Rejects admin requests without the configured ADMIN_TOKEN.
+
+    The admin endpoints fail closed: they do not exist until ADMIN_TOKEN is set.
+
+    Raises:
+        HTTPException: With a 404 status code if no ADMIN_TOKEN is configured, or a
+            401 status code if the token is missing or wrong.
+    """
+    if not settings.ADMIN_TOKEN:
+        logger.warning("Admin request rejected: ADMIN_TOKEN is not configured")
+        raise HTTPException(status_code=404, detail="Not Found")
+    if token is None or not hmac.compare_digest(token.encode("utf-8"), settings.ADMIN_TOKEN.encode("utf-8")):
+        logger.warning("Admin request rejected: invalid token")
+        raise HTTPException(status_code=401, detail="A valid X-Admin-Token header is required.")
+
+@router.get("/admin/model", response_model=ModelStatusResponse)
+async def model_status(x_admin_token: Optional[str] = Header(None)):
+    """
+    Endpoint to inspect the serving model version and any swap in progress.
+
+    Returns:
+        ModelStatusResponse: The active version and the state of the last swap.
+    """
+    check_admin_token(x_admin_token)
+    return ModelStatusResponse(**registry.status())
+
+@router.post("/admin/model", response_model=ModelStatusResponse, status_code=202)
+async def swap_model(request: ModelSwapRequest, x_admin_token: Optional[str] = Header(None)):
+    """
+    Endpoint to swap in a new model version without downtime.
+
+    The version is loaded and warmed up in the background while the active one keeps
+    serving; it then replaces it atomically and the previous version is drained.
+    Progress is reported by GET /api/admin/model.
+
+    Args:
+        request (ModelSwapRequest): The model version to load.
+
+    Returns:
+        ModelStatusResponse: The status right after the swap started.
+
+    Raises:
+        HTTPException: With a 422 status code for an unknown backend, or 409 if
+            another swap is still running.
+    """
+    check_admin_token(x_admin_token)
+    if request.backend is not None and request.backend not in BACKENDS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown model backend '{request.backend}'. Available backends: {', '.join(BACKENDS)}"
+        )
+
+    try:
+        start_model_swap(request.model_name, request.backend, request.version, request.onnx_path)
+    except ModelSwapInProgressError as e:
+        logger.warning(f"Model swap rejected: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    logger.info(f"Model swap started: {request.model_name} (version: {request.version or request.model_name})")
+    return ModelStatusResponse(**registry.status())
+
+@router.get("/cache/stats", response_model=CacheStatsResponse)
+async def cache_stats():
+    """
+    Endpoint to inspect the inference result cache.
+
+    Returns:
+        CacheStatsResponse: The cache size and its hit, miss and eviction counters.
+    """
+    return CacheStatsResponse(**result_cache.stats())
@@ -0,0 +1,140 @@
+from transformers import AutoModelForSequenceClassification
+import torch
+from typing import Optional
+from app.config.logger import get_logger
+from app.utils.exceptions import ModelLoadingError
+
+# Initialize the logger
+logger = get_logger(__name__)
+
+class TorchBackend:
+    """
+    Runs the GoEmotions model with PyTorch in full fp32 precision.
+    """
+    name = "pytorch"
+
+    def __init__(self, model_name: str):
+        """
+        Loads the model weights.
+
+        Args:
+            model_name (str): The name or path of the pre-trained model.
+        """
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        self.model.eval()  # Disable dropout; the model is only used for inference
+
+    def __call__(self, inputs) -> torch.Tensor:
+        """
+        Runs a forward pass on already tokenized inputs.
+
+        The forward pass runs in inference mode, so no autograd graph is recorded and
+        intermediate activations are released as soon as they are consumed.
+
+        Args:
+            inputs: The padded tokenizer output for a batch of texts.
+
+        Returns:
+            torch.Tensor: A (batch size, number of emotions) tensor of logits.
+        """
+        with torch.inference_mode():
+            return self.model(**inputs).logits
+
+class QuantizedTorchBackend(TorchBackend):
+    """
+    Runs the GoEmotions model with PyTorch after dynamic int8 quantization.
+
+    The weights of every Linear layer are stored as int8 and activations are
+    quantized on the fly, which roughly quarters the memory used by those layers
+    and speeds up CPU inference. Embeddings and layer norms stay in fp32.
+    """
+    name = "pytorch-int8"
+
+    def __init__(self, model_name: str):
+        """
+        Loads the model weights and quantizes the Linear layers.
+
+        Args:
+            model_name (str): The name or path of the pre-trained model.
+        """
+        super().__init__(model_name)
+        self.model = torch.ao.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+class OnnxBackend:
+    """
+    Runs an ONNX export of the GoEmotions model with ONNX Runtime on CPU.
+
+    The graph is produced by `python -m app.business_logic.onnx_export` and returns
+    the same logits as the PyTorch model, so the postprocessing is shared.
+    """
+    name = "onnx"
+
+    def __init__(self, onnx_path: str):
+        """
+        Creates an ONNX Runtime session for the exported graph.
+
+        Args:
+            onnx_path (str): The path of the exported .onnx file.
+
+        Raises:
+            ModelLoadingError: If onnxruntime is not installed.
+        """
+        try:
+            import onnxruntime
+        except ImportError:
+            raise ModelLoadingError("The 'onnx' backend requires the onnxruntime package.")
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Share the CPU budget configured for torch
+        options.intra_op_num_threads = torch.get_num_threads()
+        self.session = onnxruntime.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [graph_input.name for graph_input in self.session.get_inputs()]
+
+    def __call__(self, inputs) -> torch.Tensor:
+        """
+        Runs the exported graph on already tokenized inputs.
+
+        Args:
+            inputs: The padded tokenizer output for a batch of texts.
+
+        Returns:
+            torch.Tensor: A (batch size, number of emotions) tensor of logits.
+        """
+        feed = {name: inputs[name].numpy() for name in self.input_names}
+        logits = self.session.run(["logits"], feed)[0]
+        return torch.from_numpy(logits)
+
+# Available backends, selected with the MODEL_BACKEND setting
+BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    QuantizedTorchBackend.name: QuantizedTorchBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+def load_backend(backend_name: str, model_name: str, onnx_path: Optional[str] = None):
+    """
+    Instantiates the requested inference backend.
+
+    Args:
+        backend_name (str): One of the keys of BACKENDS.
+        model_name (str): The name or path of the pre-trained model.
+        onnx_path (Optional[str]): The exported graph, required by the "onnx" backend.
+
+    Returns:
+        The loaded backend, callable on tokenized inputs and returning logits.
+
+    Raises:
+        ModelLoadingError: If the backend is unknown.
+    """
+    if backend_name not in BACKENDS:
+        raise ModelLoadingError(
+            f"Unknown model backend '{backend_name}'. Available backends: {', '.join(BACKENDS)}"
+        )
+    if backend_name == OnnxBackend.name:
+        if not onnx_path:
+            raise ModelLoadingError("The 'onnx' backend requires the path of an exported model (ONNX_MODEL_PATH).")
+        logger.info(f"Loading ONNX model from {onnx_path}...")
+        return OnnxBackend(onnx_path)
+
+    logger.info(f"Loading model '{model_name}' with the '{backend_name}' backend...")
+    return BACKENDS[backend_name](model_name)
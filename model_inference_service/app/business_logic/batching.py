@@ -0,0 +1,283 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+from app.business_logic.executor import InferenceExecutor, executor, tokenizer_executor
+from app.business_logic.inference import EncodedBatch, encode_batch, score_batch
+from app.config.logger import get_logger
+from app.config.settings import settings
+from app.utils.exceptions import InferenceOverloadedError
+
+# Initialize the logger
+logger = get_logger(__name__)
+
+# Marker placed on the queue to ask the worker thread to exit
+_STOP = object()
+
+class InferenceBatcher:
+    """
+    Groups concurrent inference requests into micro-batches.
+
+    Submitted items are queued and collected by a background worker thread until
+    either `max_batch_size` items are pending or `max_wait_ms` milliseconds have
+    elapsed since the first one arrived. The whole batch is then processed with a
+    single call to `batch_fn`, and each result is delivered to the future of the
+    request that produced it.
+
+    When an executor is given, batches run on its worker threads and the batcher
+    only starts collecting the next batch once a worker is free, so requests keep
+    accumulating into larger batches while the model is busy.
+
+    When a `prepare_fn` is given, it turns the items of a batch into the input of
+    `batch_fn` (e.g. tokenizes the texts). With a `prepare_executor` as well, that
+    stage runs on its own workers: the next batch is prepared while the current one
+    is still in `batch_fn`, so the model does not wait for it.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int,
+        max_wait_ms: float,
+        executor: Optional[InferenceExecutor] = None,
+        max_queue_size: int = 0,
+        prepare_fn: Optional[Callable[[List[Any]], Any]] = None,
+        prepare_executor: Optional[InferenceExecutor] = None
+    ):
+        """
+        Initializes the batcher.
+
+        Args:
+            batch_fn (Callable): Function that processes a list of items (or the output
+                of `prepare_fn`) and returns one result per item, in the same order.
+            max_batch_size (int): The maximum number of items processed together.
+            max_wait_ms (float): The maximum time to wait for a batch to fill up.
+            executor (Optional[InferenceExecutor]): Executor running the batches. If None,
+                batches run on the batcher's own worker thread.
+            max_queue_size (int): The maximum number of queued requests (0 means unbounded).
+            prepare_fn (Optional[Callable]): Function run on the items of a batch before `batch_fn`.
+            prepare_executor (Optional[InferenceExecutor]): Executor running `prepare_fn` ahead
+                of `batch_fn`. If None, both run one after the other as a single task.
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.executor = executor
+        self.max_queue_size = max(0, max_queue_size)
+        self.prepare_fn = prepare_fn
+        self.prepare_executor = prepare_executor if prepare_fn is not None else None
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Starts the worker thread if it is not already running.
+        """
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+            self._worker.start()
+            logger.info(f"Inference batcher started (max batch size: {self.max_batch_size}, "
+                        f"max wait: {self.max_wait * 1000:.1f} ms).")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the worker thread once the requests already queued have been processed.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait for the worker.
+        """
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is None or not worker.is_alive():
+            return
+        self._queue.put(_STOP)
+        worker.join(timeout)
+        logger.info("Inference batcher stopped.")
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queues an item for the next batch.
+
+        Args:
+            item (Any): The item to process.
+
+        Returns:
+            Future: A future that resolves to the result for this item.
+
+        Raises:
+            InferenceOverloadedError: If the queue already holds `max_queue_size` requests.
+        """
+        if self.max_queue_size and self._queue.qsize() >= self.max_queue_size:
+            logger.warning(f"Inference batcher queue is full ({self._queue.qsize()} requests).")
+            raise InferenceOverloadedError()
+
+        self.start()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    async def infer(self, item: Any) -> Any:
+        """
+        Queues an item for the next batch and waits for its result without blocking the event loop.
+
+        Args:
+            item (Any): The item to process.
+
+        Returns:
+            Any: The result produced by `batch_fn` for this item.
+        """
+        return await asyncio.wrap_future(self.submit(item))
+
+    def _collect(self) -> Optional[list]:
+        """
+        Blocks until at least one request is queued, then keeps collecting requests
+        until the batch is full or the wait window closes.
+
+        Returns:
+            Optional[list]: The collected (item, future) pairs, or None if the batcher is stopping.
+        """
+        entry = self._queue.get()
+        if entry is _STOP:
+            return None
+
+        batch = [entry]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                # Process what was already collected, then exit on the next iteration
+                self._queue.put(_STOP)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self) -> None:
+        """
+        Worker loop: collects batches and processes them until the batcher is stopped.
+        """
+        while True:
+            # The first stage a batch goes through decides when the next one is collected
+            stage, task = (
+                (self.prepare_executor, self._prepare) if self.prepare_executor is not None
+                else (self.executor, self._process)
+            )
+            if stage is not None:
+                stage.wait_for_capacity()
+
+            batch = self._collect()
+            if batch is None:
+                return
+
+            if stage is None:
+                self._process(batch)
+                continue
+            try:
+                stage.submit(task, batch, wait=True)
+            except Exception as e:
+                self._fail(self._start(batch), e)
+
+    @staticmethod
+    def _start(batch: list) -> list:
+        """
+        Marks the futures of a batch as running, dropping requests whose caller gave up while they were queued.
+        """
+        return [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+
+    @staticmethod
+    def _fail(batch: list, error: Exception) -> None:
+        """
+        Delivers an error to every request of a started batch.
+        """
+        for _, future in batch:
+            future.set_exception(error)
+
+    def _prepare(self, batch: list) -> None:
+        """
+        Runs `prepare_fn` over a collected batch, then hands it to the executor running `batch_fn`.
+
+        Args:
+            batch (list): The (item, future) pairs to process.
+        """
+        batch = self._start(batch)
+        if not batch:
+            return
+
+        try:
+            prepared = self.prepare_fn([item for item, _ in batch])
+            if self.executor is None:
+                self._forward(batch, prepared)
+            else:
+                # Block this stage until the model is free, which bounds the batches prepared ahead
+                self.executor.submit(self._forward, batch, prepared, wait=True)
+        except Exception as e:
+            self._fail(batch, e)
+
+    def _process(self, batch: list) -> None:
+        """
+        Runs `prepare_fn` (if any) and `batch_fn` over a collected batch.
+
+        Args:
+            batch (list): The (item, future) pairs to process.
+        """
+        batch = self._start(batch)
+        if not batch:
+            return
+
+        try:
+            items = [item for item, _ in batch]
+            prepared = self.prepare_fn(items) if self.prepare_fn is not None else items
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        self._forward(batch, prepared)
+
+    def _forward(self, batch: list, prepared: Any) -> None:
+        """
+        Runs `batch_fn` and fans the results back to each future.
+
+        Args:
+            batch (list): The started (item, future) pairs.
+            prepared (Any): The input of `batch_fn` for these items.
+        """
+        try:
+            results = self.batch_fn(prepared)
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+def encode_items(items: List[Tuple[str, int, bool, Optional[str], Optional[float]]]) -> EncodedBatch:
+    """
+    Prepare function of the shared batcher: tokenizes
+    (text, top_k, include_probabilities, scoring, threshold) requests in one call.
+
+    Args:
+        items (List[Tuple[str, int, bool, Optional[str], Optional[float]]]): The queued requests.
+
+    Returns:
+        EncodedBatch: The model inputs for the requests, in the same order.
+    """
+    texts, top_ks, include_probabilities, scorings, thresholds = zip(*items)
+    return encode_batch(list(texts), top_ks, include_probabilities, scorings, thresholds)
+
+# Shared batcher used by the inference routes
+batcher = InferenceBatcher(
+    score_batch,
+    max_batch_size=settings.BATCH_MAX_SIZE,
+    max_wait_ms=settings.BATCH_MAX_WAIT_MS,
+    executor=executor,
+    max_queue_size=settings.INFERENCE_MAX_QUEUE_SIZE,
+    prepare_fn=encode_items,
+    prepare_executor=tokenizer_executor
+)
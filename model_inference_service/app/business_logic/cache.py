@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
+from app.config.logger import get_logger
+from app.config.settings import settings
+from app.utils.normalizer import NORMALIZER_VERSION, normalize_text
+
+# Initialize the logger
+logger = get_logger(__name__)
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of inference results with a time-to-live.
+
+    Keys are content hashes of the canonical text (see `app.utils.normalizer`),
+    the model identity and any option that changes the result. Identical requests that arrive while the
+    first one is still being computed share its future instead of running the
+    model again (single-flight).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        """
+        Initializes the cache.
+
+        Args:
+            max_entries (int): The maximum number of cached results; the least recently used are evicted.
+            ttl_seconds (float): How long a result stays valid (0 or less means forever).
+            enabled (bool): If False, every lookup is computed and nothing is stored.
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(text: str, model_identity: str, *options: Any) -> str:
+        """
+        Builds the cache key of a request.
+
+        Args:
+            text (str): The raw input text; it is brought to its canonical form before hashing.
+            model_identity (str): Identifies the model (and version) producing the result.
+            *options (Any): Request options that change the result.
+
+        Returns:
+            str: A SHA-256 hex digest.
+        """
+        canonical = normalize_text(text, lowercase=settings.NORMALIZER_LOWERCASE)
+        parts = [NORMALIZER_VERSION, model_identity, canonical, *(repr(option) for option in options)]
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def get_or_submit(self, key: str, compute: Callable[[], Future]) -> Future:
+        """
+        Returns a future for the result of `key`, computing it only if needed.
+
+        Args:
+            key (str): The cache key (see `make_key`).
+            compute (Callable[[], Future]): Starts the computation and returns its future.
+
+        Returns:
+            Future: A future resolving to the cached, in-flight or newly computed result.
+        """
+        if not self.enabled:
+            return compute()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    future: Future = Future()
+                    future.set_result(value)
+                    return future
+                del self._entries[key]
+                self.expirations += 1
+
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                self.deduplicated += 1
+                return in_flight
+
+            self.misses += 1
+            future = compute()
+            self._in_flight[key] = future
+
+        future.add_done_callback(lambda done: self._complete(key, done))
+        return future
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Future]) -> Any:
+        """
+        Awaits the result of `key` without blocking the event loop.
+
+        The shared future is shielded, so a client disconnecting does not cancel
+        the computation for the other requests waiting on it.
+
+        Args:
+            key (str): The cache key (see `make_key`).
+            compute (Callable[[], Future]): Starts the computation and returns its future.
+
+        Returns:
+            Any: The result.
+        """
+        return await asyncio.shield(asyncio.wrap_future(self.get_or_submit(key, compute)))
+
+    def _complete(self, key: str, future: Future) -> None:
+        """
+        Stores a finished computation, unless it failed, and evicts the least recently used entries.
+        """
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+
+            expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else float("inf")
+            self._entries[key] = (expires_at, future.result())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drops every cached result. Computations in flight are not affected.
+        """
+        with self._lock:
+            self._entries.clear()
+        logger.info("Inference result cache cleared.")
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses + self.deduplicated
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "in_flight": len(self._in_flight),
+                "hits": self.hits,
+                "misses": self.misses,
+                "deduplicated": self.deduplicated,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round((self.hits + self.deduplicated) / lookups, 4) if lookups else 0.0,
+            }
+
+# Shared cache in front of the inference route
+result_cache = ResultCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED
+)
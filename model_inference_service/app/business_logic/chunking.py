@@ -0,0 +1,81 @@
+import re
+from typing import List
+
+# Sentence boundaries: whitespace following terminal punctuation, or line breaks
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+|\n+")
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split a text into sentences on terminal punctuation and line breaks.
+
+    Args:
+        text (str): The input text.
+
+    Returns:
+        List[str]: The non-empty sentences, stripped, in order.
+    """
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+def split_into_windows(text: str, tokenizer, max_tokens: int) -> List[str]:
+    """
+    Split a long text into windows of whole sentences that each fit the model's token budget.
+
+    Sentences are packed greedily into a window until adding the next one would
+    exceed `max_tokens`. A sentence that is longer than the budget on its own is
+    split on word boundaries.
+
+    Args:
+        text (str): The input text.
+        tokenizer: The tokenizer used to count tokens.
+        max_tokens (int): The maximum number of tokens per window, special tokens excluded.
+
+    Returns:
+        List[str]: The windows, in order. Never empty for a non-blank text.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+
+    # Count the tokens of every sentence in a single tokenizer call
+    lengths = [len(ids) for ids in tokenizer(sentences, add_special_tokens=False)["input_ids"]]
+
+    windows: List[str] = []
+    current: List[str] = []
+    current_length = 0
+    for sentence, length in zip(sentences, lengths):
+        if length > max_tokens:
+            if current:
+                windows.append(" ".join(current))
+                current, current_length = [], 0
+            windows.extend(_split_long_sentence(sentence, tokenizer, max_tokens))
+            continue
+        if current and current_length + length > max_tokens:
+            windows.append(" ".join(current))
+            current, current_length = [], 0
+        current.append(sentence)
+        current_length += length
+
+    if current:
+        windows.append(" ".join(current))
+    return windows
+
+def _split_long_sentence(sentence: str, tokenizer, max_tokens: int) -> List[str]:
+    """
+    Split a sentence that exceeds the token budget into windows of whole words.
+    """
+    words = sentence.split()
+    lengths = [len(ids) for ids in tokenizer(words, add_special_tokens=False)["input_ids"]]
+
+    windows: List[str] = []
+    current: List[str] = []
+    current_length = 0
+    for word, length in zip(words, lengths):
+        if current and current_length + length > max_tokens:
+            windows.append(" ".join(current))
+            current, current_length = [], 0
+        # A single word longer than the budget is left to the tokenizer's truncation
+        current.append(word)
+        current_length += length
+    if current:
+        windows.append(" ".join(current))
+    return windows
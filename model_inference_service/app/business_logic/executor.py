@@ -0,0 +1,145 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from app.config.logger import get_logger
+from app.config.settings import settings
+from app.utils.exceptions import InferenceOverloadedError
+
+# Initialize the logger
+logger = get_logger(__name__)
+
+class InferenceExecutor:
+    """
+    Bounded thread pool that runs model forward passes away from the event loop.
+
+    At most `max_workers` tasks run at the same time and at most `max_queue_size`
+    more may wait for a free worker. Submitting beyond that raises an
+    InferenceOverloadedError instead of letting latency grow without bound.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int, name: str = "inference"):
+        """
+        Initializes the executor.
+
+        Args:
+            max_workers (int): The number of worker threads running tasks concurrently.
+            max_queue_size (int): The number of tasks allowed to wait for a free worker.
+            name (str): The prefix of the worker thread names.
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max(0, max_queue_size)
+        self.name = name
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of tasks currently running or waiting for a worker.
+        """
+        return self._pending
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """
+        Returns the underlying thread pool, creating it on first use.
+        """
+        with self._condition:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+            return self._pool
+
+    def wait_for_capacity(self) -> None:
+        """
+        Blocks until at least one worker is free.
+        """
+        with self._condition:
+            while self._pending >= self.max_workers:
+                self._condition.wait()
+
+    def submit(self, fn: Callable, *args: Any, wait: bool = False) -> Future:
+        """
+        Schedules a task on the pool.
+
+        Args:
+            fn (Callable): The function to run.
+            *args (Any): Positional arguments for `fn`.
+            wait (bool): If True, block until a worker is free instead of queueing the task.
+
+        Returns:
+            Future: A future that resolves to the result of `fn`.
+
+        Raises:
+            InferenceOverloadedError: If the pool and its queue are full and `wait` is False.
+        """
+        with self._condition:
+            if wait:
+                while self._pending >= self.max_workers:
+                    self._condition.wait()
+            elif self._pending >= self.max_workers + self.max_queue_size:
+                logger.warning(f"Inference executor saturated ({self._pending} pending tasks).")
+                raise InferenceOverloadedError()
+            self._pending += 1
+
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable, *args: Any, wait: bool = False) -> Any:
+        """
+        Runs a task on the pool and waits for its result without blocking the event loop.
+
+        Args:
+            fn (Callable): The function to run.
+            *args (Any): Positional arguments for `fn`.
+            wait (bool): If True, wait for a free worker instead of failing when the pool is full.
+
+        Returns:
+            Any: The result of `fn`.
+
+        Raises:
+            InferenceOverloadedError: If the pool and its queue are full and `wait` is False.
+        """
+        if wait:
+            # Block a helper thread, not the event loop, until a worker is free
+            future = await asyncio.to_thread(self.submit, fn, *args, wait=True)
+        else:
+            future = self.submit(fn, *args)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shuts down the pool. A new pool is created if the executor is used again.
+
+        Args:
+            wait (bool): Whether to wait for running tasks to finish.
+        """
+        with self._condition:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def _release(self, _: Optional[Future] = None) -> None:
+        """
+        Frees the slot held by a finished task.
+        """
+        with self._condition:
+            self._pending -= 1
+            self._condition.notify_all()
+
+# Shared executor running every forward pass of the service
+executor = InferenceExecutor(
+    max_workers=settings.INFERENCE_WORKERS,
+    max_queue_size=settings.INFERENCE_MAX_QUEUE_SIZE
+)
+
+# Optional executor tokenizing the next micro-batches while the model runs (see TOKENIZER_WORKERS)
+tokenizer_executor = (
+    InferenceExecutor(max_workers=settings.TOKENIZER_WORKERS, max_queue_size=0, name="tokenizer")
+    if settings.TOKENIZER_WORKERS > 0 else None
+)
@@ -1,8 +1,16 @@
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+import numpy as np
+import threading
+import time
 import torch
+from collections.abc import Mapping
+from typing import List, Optional, Sequence, Union
+from app.business_logic.chunking import split_into_windows
+from app.business_logic.registry import LoadedModel, registry
+from app.business_logic.warmup import run_warm_up
 from app.config.logger import get_logger
-from app.utils.exceptions import InferenceValidationError, ModelLoadingError, InferenceRuntimeError
-from app.utils.validators import validate_non_empty_string
+from app.config.settings import settings
+from app.utils.exceptions import InferenceValidationError, InferenceRuntimeError
+from app.utils.validators import validate_non_empty_string, validate_string_length
 
 # Initialize the logger
 logger = get_logger(__name__)
@@ -15,22 +23,593 @@ EMOTIONS = [
     "surprise", "neutral"
 ]
 
-# Load the GoEmotions model and tokenizer
-try:
-    # Load tokenizer and model from pre-trained GoEmotions model
-    tokenizer = AutoTokenizer.from_pretrained("monologg/bert-base-cased-goemotions-original", clean_up_tokenization_spaces=True)
-    model = AutoModelForSequenceClassification.from_pretrained("monologg/bert-base-cased-goemotions-original")
-    logger.info("GoEmotions model loaded successfully.")
-except Exception as e:
-    logger.error("Failed to load GoEmotions model: %s", str(e))
-    raise ModelLoadingError(f"Failed to load model: {str(e)}")
+# Emotion labels as an array, to map a whole matrix of class indices at once
+_EMOTION_LABELS = np.array(EMOTIONS)
 
-def infer_emotion(text: str) -> dict:
+# Number of top emotions returned when the request does not specify it
+DEFAULT_TOP_K = 5
+
+# Decimals kept in the full probability vector returned on request
+PROBABILITY_DECIMALS = 6
+
+# Scoring heads: softmax makes the emotions compete for a single label, while sigmoid
+# scores each emotion independently, as GoEmotions is a multi-label dataset
+SCORINGS = ("softmax", "sigmoid")
+
+# Ways of combining the scores of the windows of a long text
+AGGREGATIONS = ("mean", "max", "weighted")
+
+# Short texts used to exercise the model before it starts serving traffic
+WARM_UP_TEXTS = ["I am very happy today!", "This is a warm-up request for the model."]
+
+def _max_tokens(model: LoadedModel) -> int:
+    """
+    The maximum number of tokens per text: MAX_TOKENS, capped by what the model supports.
+    """
+    return min(settings.MAX_TOKENS, model.tokenizer.model_max_length)
+
+def _bucket_length(length: int, max_tokens: int) -> int:
+    """
+    Return the sequence length a batch is padded to: the smallest configured bucket
+    that fits its longest text, capped at `max_tokens`.
+
+    Padding to a few fixed lengths keeps the set of tensor shapes small (and covered
+    by the warm-up), while still avoiding padding short batches to the model maximum.
+
+    Args:
+        length (int): The number of tokens of the longest text in the batch.
+        max_tokens (int): The maximum number of tokens per text.
+
+    Returns:
+        int: The padded sequence length.
+    """
+    for bucket in sorted(settings.SEQUENCE_LENGTH_BUCKETS):
+        if bucket >= length:
+            return min(bucket, max_tokens)
+    return length
+
+def _warm_up_lengths(model: LoadedModel) -> List[int]:
+    """
+    Return every sequence length a batch can be padded to: the SEQUENCE_LENGTH_BUCKETS
+    and the token budget itself, capped at `_max_tokens`.
+    """
+    max_tokens = _max_tokens(model)
+    return sorted({min(bucket, max_tokens) for bucket in settings.SEQUENCE_LENGTH_BUCKETS} | {max_tokens})
+
+def _encode(model: LoadedModel, texts: List[str]):
+    """
+    Tokenize texts without padding, truncating each one to the token budget.
+
+    Args:
+        model (LoadedModel): The model whose tokenizer is used.
+        texts (List[str]): The texts to tokenize.
+
+    Returns:
+        The tokenizer output, as Python lists.
+    """
+    return model.tokenizer(texts, truncation=True, max_length=_max_tokens(model))
+
+def _encode_each(model: LoadedModel, texts: List[str]) -> List[Union[dict, Exception]]:
+    """
+    Tokenize texts like `_encode`, returning the features of each text on its own.
+
+    The texts are tokenized in one call; if that call fails, they are tokenized one
+    by one, so that a text the tokenizer rejects only fails itself.
+
+    Args:
+        model (LoadedModel): The model whose tokenizer is used.
+        texts (List[str]): The texts to tokenize.
+
+    Returns:
+        List[Union[dict, Exception]]: The unpadded features of each text, or the error that text raised.
+    """
+    try:
+        encodings = _encode(model, texts)
+        return [{key: encodings[key][position] for key in encodings.keys()} for position in range(len(texts))]
+    except Exception as e:
+        logger.warning(f"Tokenizing {len(texts)} text(s) together failed, tokenizing them one by one: {e}")
+
+    features = []
+    for text in texts:
+        try:
+            encoding = _encode(model, [text])
+            features.append({key: encoding[key][0] for key in encoding.keys()})
+        except Exception as e:
+            features.append(e)
+    return features
+
+def _pad(model: LoadedModel, features):
+    """
+    Pad tokenized texts to the length bucket of the longest one.
+
+    Args:
+        model (LoadedModel): The model whose tokenizer is used.
+        features: Unpadded tokenizer output, either batched or as a list of per-text dicts.
+
+    Returns:
+        The padded inputs, as PyTorch tensors.
+    """
+    input_ids = features["input_ids"] if isinstance(features, Mapping) else [f["input_ids"] for f in features]
+    length = _bucket_length(max(len(ids) for ids in input_ids), _max_tokens(model))
+    return model.tokenizer.pad(features, padding="max_length", max_length=length, return_tensors="pt")
+
+def _score(model: LoadedModel, inputs, scorings: Optional[List[str]] = None) -> torch.Tensor:
+    """
+    Run the model on already tokenized inputs and return the emotion scores.
+
+    Args:
+        model (LoadedModel): The model to run.
+        inputs: The padded tokenizer output for a batch of texts.
+        scorings (Optional[List[str]]): The scoring head of each row (see SCORINGS); softmax if None.
+
+    Returns:
+        torch.Tensor: A (batch size, number of emotions) tensor of probabilities.
+    """
+    # Perform inference using the configured backend, counted as in flight so a replaced version can drain
+    with model.in_use():
+        logits = model.backend(inputs)
+
+    # Apply softmax (or sigmoid, for multi-label rows) to get emotion scores
+    sigmoid_rows = torch.tensor([scoring == "sigmoid" for scoring in scorings or []], dtype=torch.bool)
+    if not sigmoid_rows.any():
+        return torch.nn.functional.softmax(logits, dim=1)
+    if sigmoid_rows.all():
+        return torch.sigmoid(logits)
+    # A micro-batch may mix both heads: compute both over the whole batch and pick per row
+    return torch.where(sigmoid_rows.unsqueeze(1), torch.sigmoid(logits), torch.nn.functional.softmax(logits, dim=1))
+
+def _top_k_list(top_k: Union[int, Sequence[int]], count: int) -> List[int]:
+    """
+    Expand a single top-k value, or validate a per-text list, into one value per text.
+    """
+    top_ks = [top_k] * count if isinstance(top_k, int) else list(top_k)
+    if len(top_ks) != count:
+        raise InferenceValidationError(f"Expected {count} top-k values but got {len(top_ks)}.")
+    for k in top_ks:
+        if not 1 <= k <= len(EMOTIONS):
+            raise InferenceValidationError(f"top_k must be between 1 and {len(EMOTIONS)}. Given: {k}")
+    return top_ks
+
+def _option_list(value, count: int) -> list:
+    """
+    Expand a single option value, or validate a per-text list or tuple, into one value per text.
+    """
+    values = list(value) if isinstance(value, (list, tuple)) else [value] * count
+    if len(values) != count:
+        raise InferenceValidationError(f"Expected {count} option values but got {len(values)}.")
+    return values
+
+def _scoring_list(scoring: Union[Optional[str], Sequence[Optional[str]]], count: int) -> List[str]:
+    """
+    Expand and validate the scoring head of each text, defaulting to the SCORING setting.
+    """
+    scorings = [value or settings.SCORING for value in _option_list(scoring, count)]
+    for value in scorings:
+        if value not in SCORINGS:
+            raise InferenceValidationError(f"scoring must be one of {', '.join(SCORINGS)}. Given: {value}")
+    return scorings
+
+def _threshold_list(threshold: Union[Optional[float], Sequence[Optional[float]]], count: int) -> List[Optional[float]]:
+    """
+    Expand and validate the sigmoid threshold of each text (None keeps the configured thresholds).
+    """
+    thresholds = _option_list(threshold, count)
+    for value in thresholds:
+        if value is not None and not 0 <= value <= 1:
+            raise InferenceValidationError(f"threshold must be between 0 and 1. Given: {value}")
+    return thresholds
+
+def _threshold_matrix(thresholds: List[Optional[float]]) -> np.ndarray:
+    """
+    Build the (rows, number of emotions) matrix of sigmoid thresholds: the request value
+    if given, otherwise the per-emotion SIGMOID_THRESHOLDS, otherwise SIGMOID_THRESHOLD.
+    """
+    configured = np.array([settings.SIGMOID_THRESHOLDS.get(emotion, settings.SIGMOID_THRESHOLD) for emotion in EMOTIONS])
+    matrix = np.tile(configured, (len(thresholds), 1))
+    for row, value in enumerate(thresholds):
+        if value is not None:
+            matrix[row] = value
+    return matrix
+
+def _build_results(
+    scores: torch.Tensor,
+    token_counts: List[int],
+    top_ks: List[int],
+    include_probabilities: Optional[List[bool]] = None,
+    scorings: Optional[List[str]] = None,
+    thresholds: Optional[List[Optional[float]]] = None,
+    model_version: Optional[str] = None
+) -> List[dict]:
+    """
+    Convert a batch of emotion scores into one result dictionary per row.
+
+    A single top-k selection runs over the whole batch and the selected values are
+    converted to Python in one go, instead of sorting all classes and calling
+    `.item()` on every element.
+
+    Args:
+        scores (torch.Tensor): A (batch size, number of emotions) tensor of probabilities.
+        token_counts (List[int]): The number of tokens processed for each row, padding excluded.
+        top_ks (List[int]): The number of top emotions to return for each row.
+        include_probabilities (Optional[List[bool]]): Whether to add the full probability
+            vector of each row, ordered as EMOTIONS.
+        scorings (Optional[List[str]]): The scoring head each row was scored with; softmax if None.
+        thresholds (Optional[List[Optional[float]]]): The sigmoid threshold of each row
+            (None keeps the configured thresholds).
+        model_version (Optional[str]): The version of the model that produced the scores.
+
+    Returns:
+        List[dict]: The top emotions, predominant emotion, confidence and token count for each row,
+                    plus every emotion above threshold for sigmoid rows.
+    """
+    # Select the largest k needed by any row, in descending order of score
+    values, indices = torch.topk(scores, max(top_ks), dim=1)
+    # Round in float64: float32 values rounded to 2 decimals serialize as e.g. 3.690000057220459
+    percentages = np.round(values.numpy().astype(np.float64) * 100, 2).tolist()
+    labels = _EMOTION_LABELS[indices.numpy()].tolist()
+
+    # Convert the full distributions only if a row asked for them, again in one go
+    include_probabilities = include_probabilities or [False] * len(top_ks)
+    probabilities = (
+        np.round(scores.numpy().astype(np.float64), PROBABILITY_DECIMALS).tolist()
+        if any(include_probabilities) else None
+    )
+
+    # Compare every sigmoid row against its thresholds at once, keeping the labels by descending score
+    scorings = scorings or ["softmax"] * len(top_ks)
+    sigmoid_rows = [row for row, scoring in enumerate(scorings) if scoring == "sigmoid"]
+    above_threshold = {}
+    if sigmoid_rows:
+        sigmoid_scores = scores[sigmoid_rows].numpy().astype(np.float64)
+        matrix = _threshold_matrix([(thresholds or [None] * len(top_ks))[row] for row in sigmoid_rows])
+        selected = sigmoid_scores >= matrix
+        order = np.argsort(-sigmoid_scores, axis=1, kind="stable")
+        sigmoid_percentages = np.round(sigmoid_scores * 100, 2).tolist()
+        for position, row in enumerate(sigmoid_rows):
+            above_threshold[row] = [
+                {"emotion": EMOTIONS[index], "percentage": sigmoid_percentages[position][index]}
+                for index in order[position].tolist() if selected[position, index]
+            ]
+
+    results = []
+    for row, (row_labels, row_percentages, tokens, k) in enumerate(zip(labels, percentages, token_counts, top_ks)):
+        result = {
+            "emotions": [
+                {"emotion": emotion, "percentage": percentage}
+                for emotion, percentage in zip(row_labels[:k], row_percentages[:k])
+            ],
+            "predominant_emotion": row_labels[0],
+            "confidence": row_percentages[0],
+            "tokens": tokens,
+            "scoring": scorings[row],
+            "model_version": model_version
+        }
+        if row in above_threshold:
+            result["labels"] = above_threshold[row]
+        if include_probabilities[row]:
+            result["probabilities"] = probabilities[row]
+        results.append(result)
+    return results
+
+class EncodedBatch:
+    """
+    A batch of texts tokenized and padded for a forward pass.
+    """
+
+    def __init__(
+        self,
+        model: LoadedModel,
+        inputs,
+        token_counts: List[int],
+        top_ks: List[int],
+        include_probabilities: List[bool],
+        scorings: List[str],
+        thresholds: List[Optional[float]]
+    ):
+        """
+        Args:
+            model (LoadedModel): The model the batch was tokenized for.
+            inputs: The padded tokenizer output, as PyTorch tensors.
+            token_counts (List[int]): The number of tokens of each text, padding excluded.
+            top_ks (List[int]): The number of top emotions to return for each text.
+            include_probabilities (List[bool]): Whether to return the full probability vector of each text.
+            scorings (List[str]): The scoring head of each text.
+            thresholds (List[Optional[float]]): The sigmoid threshold of each text.
+        """
+        self.model = model
+        self.inputs = inputs
+        self.token_counts = token_counts
+        self.top_ks = top_ks
+        self.include_probabilities = include_probabilities
+        self.scorings = scorings
+        self.thresholds = thresholds
+
+def encode_batch(
+    texts: List[str],
+    top_k: Union[int, Sequence[int]] = DEFAULT_TOP_K,
+    include_probabilities: Union[bool, Sequence[bool]] = False,
+    scoring: Union[Optional[str], Sequence[Optional[str]]] = None,
+    threshold: Union[Optional[float], Sequence[Optional[float]]] = None
+) -> EncodedBatch:
+    """
+    Validate and tokenize several texts for a single forward pass.
+
+    All the texts go through the fast tokenizer in one call, are truncated to
+    MAX_TOKENS and padded together to the length bucket of the longest one.
+
+    Args:
+        texts (List[str]): The input texts to analyze.
+        top_k (Union[int, Sequence[int]]): The number of top emotions to return, either
+            for every text or one value per text.
+        include_probabilities (Union[bool, Sequence[bool]]): Whether to return the full
+            probability vector, either for every text or one value per text.
+        scoring (Union[Optional[str], Sequence[Optional[str]]]): The scoring head (see SCORINGS,
+            None for the SCORING setting), either for every text or one value per text.
+        threshold (Union[Optional[float], Sequence[Optional[float]]]): The sigmoid threshold
+            (None for the configured thresholds), either for every text or one value per text.
+
+    Returns:
+        EncodedBatch: The model inputs, ready for `score_batch`.
+
+    Raises:
+        InferenceValidationError: If any of the input texts or top-k values is invalid.
+        ModelLoadingError: If the model cannot be loaded.
+        InferenceRuntimeError: If tokenization fails.
+    """
+    # Validate every input string before running the model
+    for text in texts:
+        validate_non_empty_string(text)
+    top_ks = _top_k_list(top_k, len(texts))
+    flags = _option_list(include_probabilities, len(texts))
+    scorings = _scoring_list(scoring, len(texts))
+    thresholds = _threshold_list(threshold, len(texts))
+
+    model = registry.get()
+    try:
+        encodings = _encode(model, texts)
+        token_counts = [len(ids) for ids in encodings["input_ids"]]
+        return EncodedBatch(model, _pad(model, encodings), token_counts, top_ks, flags, scorings, thresholds)
+
+    except Exception as e:
+        logger.error(f"Error during tokenization: {e}")
+        raise InferenceRuntimeError(f"Inference failed: {str(e)}")
+
+def score_batch(batch: EncodedBatch) -> List[dict]:
+    """
+    Run the forward pass on a tokenized batch and build one result per text.
+
+    Args:
+        batch (EncodedBatch): The output of `encode_batch`.
+
+    Returns:
+        List[dict]: One result per text, in the order they were encoded.
+
+    Raises:
+        InferenceRuntimeError: If an unexpected error occurs during inference.
+    """
+    try:
+        logger.info(f"Performing inference on a batch of {len(batch.token_counts)} text(s)...")
+        return _build_results(
+            _score(batch.model, batch.inputs, batch.scorings), batch.token_counts, batch.top_ks,
+            batch.include_probabilities, batch.scorings, batch.thresholds, batch.model.version
+        )
+
+    except Exception as e:
+        logger.error(f"Error during inference: {e}")
+        raise InferenceRuntimeError(f"Inference failed: {str(e)}")
+
+def infer_emotions_batch(
+    texts: List[str],
+    top_k: Union[int, Sequence[int]] = DEFAULT_TOP_K,
+    include_probabilities: Union[bool, Sequence[bool]] = False,
+    scoring: Union[Optional[str], Sequence[Optional[str]]] = None,
+    threshold: Union[Optional[float], Sequence[Optional[float]]] = None
+) -> List[dict]:
+    """
+    Perform emotion inference on several texts with a single forward pass.
+
+    The texts are truncated to MAX_TOKENS and padded together into one batch, so the
+    cost of running the model is shared by all of them.
+
+    Args:
+        texts (List[str]): The input texts to analyze.
+        top_k (Union[int, Sequence[int]]): The number of top emotions to return, either
+            for every text or one value per text.
+        include_probabilities (Union[bool, Sequence[bool]]): Whether to return the full
+            probability vector, either for every text or one value per text.
+        scoring (Union[Optional[str], Sequence[Optional[str]]]): The scoring head (see SCORINGS,
+            None for the SCORING setting), either for every text or one value per text.
+        threshold (Union[Optional[float], Sequence[Optional[float]]]): The sigmoid threshold
+            (None for the configured thresholds), either for every text or one value per text.
+
+    Returns:
+        List[dict]: One result per input text, in the same order as `texts`.
+
+    Raises:
+        InferenceValidationError: If any of the input texts or top-k values is invalid.
+        ModelLoadingError: If the model cannot be loaded.
+        InferenceRuntimeError: If an unexpected error occurs during inference.
+    """
+    return score_batch(encode_batch(texts, top_k, include_probabilities, scoring, threshold))
+
+def infer_emotions_bulk(
+    texts: List[str],
+    sub_batch_size: int,
+    max_length: int,
+    top_k: int = DEFAULT_TOP_K,
+    include_probabilities: bool = False,
+    scoring: Optional[str] = None,
+    threshold: Optional[float] = None
+) -> List[dict]:
+    """
+    Perform emotion inference on a large list of texts, reporting errors per item.
+
+    The valid texts are tokenized once, sorted by token length and run in padded
+    sub-batches of similar length, which keeps padding (and wasted computation)
+    to a minimum. Results are returned in the original order; an invalid text, a
+    text the tokenizer rejects or a failing sub-batch only affects the items concerned.
+
+    Args:
+        texts (List[str]): The input texts to analyze.
+        sub_batch_size (int): The maximum number of texts per forward pass.
+        max_length (int): The maximum allowed length (in characters) of each text.
+        top_k (int): The number of top emotions to return for each text.
+        include_probabilities (bool): Whether to return the full probability vector of each text.
+        scoring (Optional[str]): The scoring head (see SCORINGS, None for the SCORING setting).
+        threshold (Optional[float]): The sigmoid threshold (None for the configured thresholds).
+
+    Returns:
+        List[dict]: One entry per input text, with a "status" of "success" and the
+                    inference "result", or a "status" of "error" and an "error" message.
+
+    Raises:
+        InferenceValidationError: If `top_k` is out of range.
+        ModelLoadingError: If the model cannot be loaded.
+    """
+    _top_k_list(top_k, 1)
+    scoring = _scoring_list(scoring, 1)[0]
+    _threshold_list(threshold, 1)
+    outcomes: List[dict] = [None] * len(texts)
+
+    # Validate each text on its own so that one bad item does not fail the batch
+    valid_indices = []
+    for index, text in enumerate(texts):
+        try:
+            validate_non_empty_string(text)
+            validate_string_length(text, max_length)
+            valid_indices.append(index)
+        except InferenceValidationError as e:
+            outcomes[index] = {"status": "error", "error": str(e)}
+
+    if not valid_indices:
+        return outcomes
+
+    logger.info(f"Performing bulk inference on {len(valid_indices)} text(s)...")
+    model = registry.get()
+
+    # Tokenize once, without padding, and order the texts by token length
+    indices, features = [], []
+    for index, feature in zip(valid_indices, _encode_each(model, [texts[index] for index in valid_indices])):
+        if isinstance(feature, Exception):
+            outcomes[index] = {"status": "error", "error": f"Tokenization failed: {str(feature)}"}
+        else:
+            indices.append(index)
+            features.append(feature)
+    order = sorted(range(len(features)), key=lambda position: len(features[position]["input_ids"]))
+
+    for start in range(0, len(order), max(1, sub_batch_size)):
+        chunk = order[start:start + max(1, sub_batch_size)]
+        try:
+            # Pad the sub-batch only up to the length bucket of its own longest text
+            chunk_features = [features[position] for position in chunk]
+            inputs = _pad(model, chunk_features)
+            token_counts = [len(feature["input_ids"]) for feature in chunk_features]
+            count = len(chunk)
+            results = _build_results(
+                _score(model, inputs, [scoring] * count), token_counts, [top_k] * count,
+                [include_probabilities] * count, [scoring] * count, [threshold] * count, model.version
+            )
+        except Exception as e:
+            logger.error(f"Error during bulk inference: {e}")
+            for position in chunk:
+                outcomes[indices[position]] = {"status": "error", "error": f"Inference failed: {str(e)}"}
+            continue
+
+        for position, result in zip(chunk, results):
+            outcomes[indices[position]] = {"status": "success", "result": result}
+
+    return outcomes
+
+def infer_emotion_long(
+    text: str,
+    aggregation: str = "mean",
+    top_k: int = DEFAULT_TOP_K,
+    include_probabilities: bool = False,
+    scoring: Optional[str] = None,
+    threshold: Optional[float] = None
+) -> dict:
+    """
+    Perform emotion inference on a text longer than the model's token budget.
+
+    The text is split into windows of whole sentences that fit MAX_TOKENS, all the
+    windows are scored in a single batched forward pass, and their emotion scores
+    are aggregated into one result:
+
+    - "mean": the average score of each emotion over the windows.
+    - "max": the highest score each emotion reaches in any window.
+    - "weighted": the average score weighted by the number of tokens of each window.
+
+    Args:
+        text (str): The input text to analyze.
+        aggregation (str): One of AGGREGATIONS.
+        top_k (int): The number of top emotions to return.
+        include_probabilities (bool): Whether to return the full aggregated probability vector.
+        scoring (Optional[str]): The scoring head (see SCORINGS, None for the SCORING setting).
+        threshold (Optional[float]): The sigmoid threshold (None for the configured thresholds).
+
+    Returns:
+        dict: The aggregated result, including the total number of tokens processed
+              and the number of windows.
+
+    Raises:
+        InferenceValidationError: If the input text or an option is invalid.
+        ModelLoadingError: If the model cannot be loaded.
+        InferenceRuntimeError: If an unexpected error occurs during inference.
+    """
+    validate_non_empty_string(text)
+    if aggregation not in AGGREGATIONS:
+        raise InferenceValidationError(
+            f"aggregation must be one of {', '.join(AGGREGATIONS)}. Given: {aggregation}"
+        )
+    _top_k_list(top_k, 1)
+    scoring = _scoring_list(scoring, 1)[0]
+    _threshold_list(threshold, 1)
+
+    model = registry.get()
+    try:
+        # Leave room for the special tokens added around every window
+        windows = split_into_windows(text, model.tokenizer, _max_tokens(model) - 2)
+        logger.info(f"Performing long-text inference on {len(windows)} window(s)...")
+
+        encodings = _encode(model, windows)
+        token_counts = np.array([len(ids) for ids in encodings["input_ids"]])
+        scores = _score(model, _pad(model, encodings), [scoring] * len(windows))
+
+        if aggregation == "max":
+            aggregated = scores.max(dim=0).values
+        elif aggregation == "weighted":
+            weights = torch.from_numpy(token_counts / token_counts.sum()).to(scores.dtype)
+            aggregated = weights @ scores
+        else:
+            aggregated = scores.mean(dim=0)
+
+        result = _build_results(
+            aggregated.unsqueeze(0), [int(token_counts.sum())], [top_k], [include_probabilities], [scoring], [threshold],
+            model.version
+        )[0]
+        result["windows"] = len(windows)
+        return result
+
+    except Exception as e:
+        logger.error(f"Error during long-text inference: {e}")
+        raise InferenceRuntimeError(f"Inference failed: {str(e)}")
+
+def infer_emotion(
+    text: str,
+    top_k: int = DEFAULT_TOP_K,
+    include_probabilities: bool = False,
+    scoring: Optional[str] = None,
+    threshold: Optional[float] = None
+) -> dict:
     """
     Perform emotion inference using the GoEmotions model with the provided text.
 
     Args:
         text (str): The input text to analyze.
+        top_k (int): The number of top emotions to return.
+        include_probabilities (bool): Whether to return the full probability vector, ordered as EMOTIONS.
+        scoring (Optional[str]): The scoring head (see SCORINGS, None for the SCORING setting).
+        threshold (Optional[float]): The sigmoid threshold (None for the configured thresholds).
 
     Returns:
         dict: A dictionary containing detected emotions and their respective scores.
@@ -42,34 +621,105 @@ def infer_emotion(text: str) -> dict:
     # Validate the input string
     validate_non_empty_string(text)
 
+    logger.info(f"Performing inference on text: {text[:100]}...")  # Log only the first 100 characters
+    return infer_emotions_batch([text], top_k, include_probabilities, scoring, threshold)[0]
+
+def warm_up() -> None:
+    """
+    Load the model if needed, warm it up and flag the registry as ready.
+
+    A short batch runs through the full inference path, then, if WARMUP_ENABLED is
+    set, synthetic batches are run for every sequence length requests can be padded
+    to and every configured batch size, so that the first real requests do not pay
+    for cold allocator pools and kernel paths.
+
+    Raises:
+        ModelLoadingError: If the model cannot be loaded.
+        InferenceRuntimeError: If the warm-up batch fails.
+    """
+    model = registry.load()
+    registry.timings["warm_up"] = _warm_up_model(model)
+    registry.mark_ready()
+
+def _warm_up_model(model: LoadedModel) -> float:
+    """
+    Run the warm-up batches on a model and return how many seconds they took.
+    """
+    logger.info(f"Running warm-up inference on model version '{model.version}'...")
+    started = time.perf_counter()
+    encodings = _encode(model, WARM_UP_TEXTS)
+    _build_results(_score(model, _pad(model, encodings)), [0] * len(WARM_UP_TEXTS), [DEFAULT_TOP_K] * len(WARM_UP_TEXTS))
+
+    if settings.WARMUP_ENABLED:
+        run_warm_up(
+            model,
+            sequence_lengths=_warm_up_lengths(model),
+            batch_sizes=settings.WARMUP_BATCH_SIZES,
+            iterations=settings.WARMUP_ITERATIONS
+        )
+    return time.perf_counter() - started
+
+def _run_swap(model_name: str, backend_name: str, version: str, onnx_path: Optional[str]) -> None:
+    """
+    Load, warm up and activate a model version reserved with `registry.begin_swap()`, then drain the previous one.
+    """
     try:
-        logger.info(f"Performing inference on text: {text[:100]}...")  # Log only the first 100 characters
+        model = registry.load_version(model_name, backend_name, onnx_path=onnx_path, version=version)
+        _warm_up_model(model)
+        previous = registry.activate(model, model_name, backend_name, onnx_path)
+    except Exception as e:
+        logger.error(f"Swapping to model version '{version}' failed: {e}")
+        registry.end_swap(error=str(e))
+        raise
 
-        # Tokenize the input text
-        inputs = tokenizer([text], return_tensors="pt", padding=True, truncation=True)
+    registry.end_swap()
+    if previous is not None:
+        registry.drain(previous, timeout=settings.MODEL_DRAIN_TIMEOUT_SECONDS)
 
-        # Perform inference using the model
-        outputs = model(**inputs)
+def swap_model(
+    model_name: str, backend_name: Optional[str] = None, version: Optional[str] = None, onnx_path: Optional[str] = None
+) -> None:
+    """
+    Replace the serving model with a new version without dropping requests.
 
-        # Apply softmax to get emotion scores
-        scores = torch.nn.functional.softmax(outputs.logits, dim=1)
+    The new version is loaded and warmed up next to the active one, which keeps
+    serving meanwhile. It is then switched in atomically, and the previous version
+    is drained: the batches already running on it finish before it is released.
 
-        # Sort emotions by their scores in descending order
-        sorted_scores, indices = torch.sort(scores, descending=True)
+    Args:
+        model_name (str): A Hugging Face model id or a local directory.
+        backend_name (Optional[str]): The inference backend (defaults to the active one).
+        version (Optional[str]): The version label reported with results (defaults to `model_name`).
+        onnx_path (Optional[str]): The exported graph for the "onnx" backend (defaults to the active one).
 
-        # Create a list of emotions and their corresponding percentages
-        top_emotions = [
-            {"emotion": EMOTIONS[idx], "percentage": round(score.item() * 100, 2)}
-            for idx, score in zip(indices[0], sorted_scores[0])
-        ]
+    Raises:
+        ModelSwapInProgressError: If another swap is still running.
+        ModelLoadingError: If the new version cannot be loaded.
+    """
+    version = version or model_name
+    registry.begin_swap(version)
+    _run_swap(model_name, backend_name or registry.backend_name, version, onnx_path or registry.onnx_path)
 
-        # Return the top 5 emotions and the predominant emotion with confidence score
-        return {
-            "emotions": top_emotions[:5],  # Limit to top 5 emotions
-            "predominant_emotion": top_emotions[0]["emotion"],
-            "confidence": top_emotions[0]["percentage"]
-        }
+def start_model_swap(
+    model_name: str, backend_name: Optional[str] = None, version: Optional[str] = None, onnx_path: Optional[str] = None
+) -> None:
+    """
+    Start `swap_model()` in a background thread and return immediately.
 
-    except Exception as e:
-        logger.error(f"Error during inference: {e}")
-        raise InferenceRuntimeError(f"Inference failed: {str(e)}")
+    The swap is reserved before returning, so a concurrent request is rejected
+    right away; its progress is reported by `registry.status()`.
+
+    Raises:
+        ModelSwapInProgressError: If another swap is still running.
+    """
+    version = version or model_name
+    registry.begin_swap(version)
+    args = (model_name, backend_name or registry.backend_name, version, onnx_path or registry.onnx_path)
+
+    def run() -> None:
+        try:
+            _run_swap(*args)
+        except Exception:
+            pass  # Already logged and reported through registry.status()
+
+    threading.Thread(target=run, name="model-swap", daemon=True).start()
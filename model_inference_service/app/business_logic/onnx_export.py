@@ -0,0 +1,72 @@
+import argparse
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from app.config.logger import get_logger
+from app.config.settings import settings
+
+# Initialize the logger
+logger = get_logger(__name__)
+
+# Names of the graph inputs, matching the keys produced by the BERT tokenizer
+ONNX_INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+class _LogitsOnly(torch.nn.Module):
+    """
+    Wraps a sequence classification model so that the exported graph returns the logits tensor only.
+    """
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids).logits
+
+def export_onnx(model_name: str, output_path: str, opset_version: int = 17) -> None:
+    """
+    Export the GoEmotions model to an ONNX graph with dynamic batch and sequence axes.
+
+    Args:
+        model_name (str): The name or path of the pre-trained model.
+        output_path (str): Where to write the .onnx file.
+        opset_version (int): The ONNX opset to target.
+    """
+    logger.info(f"Exporting '{model_name}' to ONNX at {output_path}...")
+    tokenizer = AutoTokenizer.from_pretrained(model_name, clean_up_tokenization_spaces=True)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+
+    # Sample inputs only fix the rank of each tensor; both axes stay dynamic
+    sample = tokenizer(["A sample sentence.", "Another one."], return_tensors="pt", padding=True)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in ONNX_INPUT_NAMES}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    with torch.inference_mode():
+        torch.onnx.export(
+            _LogitsOnly(model),
+            tuple(sample[name] for name in ONNX_INPUT_NAMES),
+            output_path,
+            input_names=ONNX_INPUT_NAMES,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset_version,
+            dynamo=False,
+        )
+    logger.info("ONNX export completed.")
+
+def main() -> None:
+    """
+    Command-line entry point:
+        python -m app.business_logic.onnx_export --output goemotions.onnx
+    """
+    parser = argparse.ArgumentParser(description="Export the GoEmotions model to ONNX.")
+    # Default to the model and path the "onnx" backend loads, so the graph matches its tokenizer
+    parser.add_argument("--model", default=settings.MODEL_NAME,
+                        help="Name or path of the pre-trained model (defaults to MODEL_NAME).")
+    parser.add_argument("--output", default=settings.ONNX_MODEL_PATH,
+                        help="Path of the exported .onnx file (defaults to ONNX_MODEL_PATH).")
+    parser.add_argument("--opset", type=int, default=17, help="ONNX opset version.")
+    args = parser.parse_args()
+    export_onnx(args.model, args.output, args.opset)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+import torch
+from contextlib import contextmanager
+from huggingface_hub import snapshot_download
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from typing import Dict, List, Optional
+from app.business_logic.backends import load_backend
+from app.config.logger import get_logger
+from app.config.settings import settings
+from app.utils.exceptions import ModelLoadingError, ModelSwapInProgressError
+
+# Initialize the logger
+logger = get_logger(__name__)
+
+# Pin torch to the configured CPU budget before any parallel work starts
+if settings.TORCH_NUM_THREADS:
+    torch.set_num_threads(settings.TORCH_NUM_THREADS)
+if settings.TORCH_INTEROP_THREADS:
+    torch.set_num_interop_threads(settings.TORCH_INTEROP_THREADS)
+
+# Weights file written by `save_pretrained(safe_serialization=True)`
+SAFETENSORS_WEIGHTS = "model.safetensors"
+
+def _source_fingerprint(model_name: str) -> str:
+    """
+    Identifies the exact weights behind a model name, so a changed source is converted again.
+
+    For a local directory this hashes the name, size and modification time of its
+    files. For a hub id it is the commit of the resolved revision, looked up in the
+    local cache when the hub is offline.
+    """
+    if os.path.isdir(model_name):
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(model_name):
+            dirs.sort()
+            for file_name in sorted(files):
+                path = os.path.join(root, file_name)
+                stat = os.stat(path)
+                digest.update(f"{os.path.relpath(path, model_name)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    snapshot = snapshot_download(model_name, allow_patterns=["config.json"])
+    return os.path.basename(os.path.normpath(snapshot))[:16]
+
+def prepare_safetensors_checkpoint(model_name: str, checkpoint_dir: str) -> str:
+    """
+    Returns a local directory holding the model as safetensors, converting it on first use.
+
+    A pickled checkpoint is read and deserialized into freshly allocated memory, while
+    a safetensors file is memory-mapped and its tensors are read straight from the page
+    cache, so converting once makes every later cold start much cheaper. The converted
+    copy is written to a temporary directory and renamed, so a crash mid-conversion
+    never leaves a partial checkpoint behind. The directory name includes the hub
+    revision or a fingerprint of the local files, so a retrained model published
+    under the same name gets a conversion of its own instead of the stale one.
+
+    Args:
+        model_name (str): A Hugging Face model id or a local directory.
+        checkpoint_dir (str): The directory holding converted checkpoints (see MODEL_CACHE_DIR).
+
+    Returns:
+        str: The directory of the safetensors checkpoint, tokenizer included.
+    """
+    name = model_name.strip("/").replace("/", "--")
+    target = os.path.join(checkpoint_dir, f"{name}--{_source_fingerprint(model_name)}")
+    if os.path.isfile(os.path.join(target, SAFETENSORS_WEIGHTS)):
+        return target
+
+    started = time.perf_counter()
+    logger.info(f"Converting {model_name} to safetensors in {target}...")
+    local_only = os.path.isdir(model_name)
+    tokenizer = AutoTokenizer.from_pretrained(
+        model_name, use_fast=True, clean_up_tokenization_spaces=True, local_files_only=local_only
+    )
+    model = AutoModelForSequenceClassification.from_pretrained(model_name, local_files_only=local_only)
+
+    staging = f"{target}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    model.save_pretrained(staging, safe_serialization=True)
+    tokenizer.save_pretrained(staging)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    logger.info(f"Converted {model_name} to safetensors in {time.perf_counter() - started:.2f} s.")
+    return target
+
+class LoadedModel:
+    """
+    A tokenizer and inference backend loaded for a given model version.
+    """
+
+    def __init__(self, name: str, tokenizer, backend, version: Optional[str] = None):
+        """
+        Args:
+            name (str): The name or local path the model was loaded from.
+            tokenizer: The Hugging Face tokenizer of the model.
+            backend: The inference backend, callable on tokenized inputs and returning logits.
+            version (Optional[str]): The version label reported with results (defaults to `name`).
+        """
+        self.name = name
+        self.tokenizer = tokenizer
+        self.backend = backend
+        self.version = version or name
+        self._in_flight = 0
+        self._idle = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        """
+        The number of forward passes currently running on this model.
+        """
+        return self._in_flight
+
+    @contextmanager
+    def in_use(self):
+        """
+        Counts a forward pass as in flight for as long as the context is open.
+        """
+        with self._idle:
+            self._in_flight += 1
+        try:
+            yield self
+        finally:
+            with self._idle:
+                self._in_flight -= 1
+                if self._in_flight == 0:
+                    self._idle.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until no forward pass is running on this model.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait (None waits forever).
+
+        Returns:
+            bool: True if the model became idle, False on timeout.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout)
+
+class ModelRegistry:
+    """
+    Owns the model used by the service and controls when it is loaded.
+
+    Nothing is loaded at import time. The application lifespan calls `load()` and,
+    once a warm-up batch has run, `mark_ready()`. Code paths that need the model
+    before that (tests, tooling) load it lazily through `get()`. Once a load has
+    failed, `get()` raises at once instead of loading again: the lifespan retries
+    the load in the background, so requests do not queue up behind it.
+
+    A new model version can be swapped in while serving: it is loaded with
+    `load_version()` next to the active one, switched in with `activate()`, and the
+    previous version is released with `drain()` once its forward passes finish.
+    Requests hold on to the model they started with, so none of them is dropped.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        backend_name: str,
+        onnx_path: Optional[str] = None,
+        checkpoint_dir: Optional[str] = None,
+        require_fast_tokenizer: bool = True,
+        version: Optional[str] = None
+    ):
+        """
+        Args:
+            model_name (str): A Hugging Face model id, or the path of a local directory
+                holding the tokenizer and weights (loaded without network access).
+            backend_name (str): The inference backend to use (see MODEL_BACKEND).
+            onnx_path (Optional[str]): The exported graph used by the "onnx" backend.
+            checkpoint_dir (Optional[str]): If set, the PyTorch backends load a safetensors
+                copy of the model kept in this directory (see `prepare_safetensors_checkpoint`).
+            require_fast_tokenizer (bool): If True, loading fails unless the Rust-backed
+                fast tokenizer is available.
+            version (Optional[str]): The version label of the model (defaults to `model_name`).
+        """
+        self.model_name = model_name
+        self.backend_name = backend_name
+        self.onnx_path = onnx_path
+        self.checkpoint_dir = checkpoint_dir
+        self.require_fast_tokenizer = require_fast_tokenizer
+        self.version = version or model_name
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}  # Seconds spent in each startup step
+        self.swapping: Optional[str] = None  # The version being loaded to replace the active one
+        self.swap_error: Optional[str] = None  # Why the last swap failed, if it did
+        self.draining: List[str] = []  # Replaced versions still finishing forward passes
+        self._model: Optional[LoadedModel] = None
+        self._ready = False
+        self._lock = threading.Lock()
+
+    @property
+    def identity(self) -> str:
+        """
+        Identifies the model version and backend producing results, e.g. for cache keys.
+        """
+        return f"{self.model_name}:{self.backend_name}:{self.version}"
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Whether the tokenizer and weights are loaded.
+        """
+        return self._model is not None
+
+    @property
+    def ready(self) -> bool:
+        """
+        Whether the model is loaded and warmed up, i.e. able to serve traffic at full speed.
+        """
+        return self._ready
+
+    def _load_model(
+        self, model_name: str, backend_name: str, onnx_path: Optional[str], version: str, timings: Dict[str, float]
+    ) -> LoadedModel:
+        """
+        Loads the tokenizer and backend of a model, without making it the active one.
+
+        Raises:
+            ModelLoadingError: If the model cannot be loaded.
+        """
+        try:
+            source = model_name
+            if self.checkpoint_dir and backend_name != "onnx":
+                started = time.perf_counter()
+                source = prepare_safetensors_checkpoint(model_name, self.checkpoint_dir)
+                timings["checkpoint"] = time.perf_counter() - started
+
+            # A local directory is loaded as is, without contacting the Hugging Face Hub
+            local_only = os.path.isdir(source)
+            logger.info(f"Loading GoEmotions model from {'local directory' if local_only else 'hub'}: {source}")
+            started = time.perf_counter()
+            tokenizer = AutoTokenizer.from_pretrained(
+                source, use_fast=True, clean_up_tokenization_spaces=True, local_files_only=local_only
+            )
+            if not tokenizer.is_fast:
+                # transformers silently falls back to the slow Python tokenizer when the fast one is unavailable
+                if self.require_fast_tokenizer:
+                    raise ModelLoadingError(
+                        f"No fast tokenizer available for '{source}'; install the tokenizers package "
+                        "or set REQUIRE_FAST_TOKENIZER=false."
+                    )
+                logger.warning(f"Using the slow Python tokenizer for '{source}'.")
+            timings["tokenizer"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            backend = load_backend(backend_name, source, onnx_path=onnx_path)
+            timings["weights"] = time.perf_counter() - started
+        except ModelLoadingError as e:
+            logger.error(f"Failed to load GoEmotions model: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to load GoEmotions model: {e}")
+            raise ModelLoadingError(f"Failed to load model: {str(e)}")
+
+        return LoadedModel(source, tokenizer, backend, version=version)
+
+    def load(self) -> LoadedModel:
+        """
+        Loads the tokenizer and backend if they are not loaded yet.
+
+        Returns:
+            LoadedModel: The loaded model.
+
+        Raises:
+            ModelLoadingError: If the model cannot be loaded.
+        """
+        with self._lock:
+            if self._model is not None:
+                return self._model
+
+            try:
+                self._model = self._load_model(
+                    self.model_name, self.backend_name, self.onnx_path, self.version, self.timings
+                )
+            except ModelLoadingError as e:
+                self.error = e.detail
+                raise
+
+            self.error = None
+            logger.info("GoEmotions model loaded successfully.")
+            return self._model
+
+    def get(self) -> LoadedModel:
+        """
+        Returns the loaded model, loading it first if no load has failed yet.
+
+        Returns:
+            LoadedModel: The loaded model.
+
+        Raises:
+            ModelLoadingError: If the model cannot be loaded, or the last load failed.
+        """
+        model = self._model
+        if model is not None:
+            return model
+        if self.error is not None:
+            raise ModelLoadingError(self.error)
+        return self.load()
+
+    def begin_swap(self, version: str) -> None:
+        """
+        Reserves the registry for swapping in a new model version.
+
+        Args:
+            version (str): The version that will be loaded.
+
+        Raises:
+            ModelSwapInProgressError: If another swap has not finished yet.
+        """
+        with self._lock:
+            if self.swapping is not None:
+                raise ModelSwapInProgressError(f"Model version '{self.swapping}' is still being loaded.")
+            self.swapping = version
+            self.swap_error = None
+
+    def load_version(
+        self, model_name: str, backend_name: str, onnx_path: Optional[str] = None, version: Optional[str] = None
+    ) -> LoadedModel:
+        """
+        Loads a model version next to the active one, without serving it yet.
+
+        Args:
+            model_name (str): A Hugging Face model id or a local directory.
+            backend_name (str): The inference backend to use (see MODEL_BACKEND).
+            onnx_path (Optional[str]): The exported graph used by the "onnx" backend.
+            version (Optional[str]): The version label of the model (defaults to `model_name`).
+
+        Returns:
+            LoadedModel: The loaded model.
+
+        Raises:
+            ModelLoadingError: If the model cannot be loaded.
+        """
+        return self._load_model(model_name, backend_name, onnx_path, version or model_name, timings={})
+
+    def activate(
+        self, model: LoadedModel, model_name: str, backend_name: str, onnx_path: Optional[str] = None
+    ) -> Optional[LoadedModel]:
+        """
+        Atomically makes a loaded model version the one serving new requests.
+
+        Args:
+            model (LoadedModel): The model returned by `load_version()`.
+            model_name (str): The name it was loaded from.
+            backend_name (str): The backend it was loaded with.
+            onnx_path (Optional[str]): The exported graph it was loaded from, for the "onnx" backend.
+
+        Returns:
+            Optional[LoadedModel]: The previously active model, to be drained.
+        """
+        with self._lock:
+            previous, self._model = self._model, model
+            self.model_name = model_name
+            self.backend_name = backend_name
+            self.onnx_path = onnx_path
+            self.version = model.version
+            self.error = None
+        logger.info(f"Model version '{model.version}' is now serving requests.")
+        return previous
+
+    def end_swap(self, error: Optional[str] = None) -> None:
+        """
+        Releases the registry after a swap, recording why it failed if it did.
+        """
+        with self._lock:
+            self.swapping = None
+            self.swap_error = error
+
+    def drain(self, model: LoadedModel, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for the forward passes running on a replaced model version to finish.
+
+        The registry drops its reference to the model; its memory is released once
+        the last request holding it completes.
+
+        Args:
+            model (LoadedModel): The replaced model.
+            timeout (Optional[float]): Maximum number of seconds to wait (None waits forever).
+
+        Returns:
+            bool: True if the model drained, False on timeout.
+        """
+        self.draining.append(model.version)
+        try:
+            drained = model.wait_idle(timeout)
+        finally:
+            self.draining.remove(model.version)
+        if drained:
+            logger.info(f"Model version '{model.version}' drained.")
+        else:
+            logger.warning(f"Model version '{model.version}' still had {model.in_flight} forward pass(es) "
+                           f"running after {timeout} s; releasing it anyway.")
+        return drained
+
+    def status(self) -> dict:
+        """
+        Returns the active model version and the state of any swap in progress.
+        """
+        return {
+            "model_name": self.model_name,
+            "backend": self.backend_name,
+            "version": self.version,
+            "ready": self.ready,
+            "swapping": self.swapping,
+            "draining": list(self.draining),
+            "swap_error": self.swap_error,
+        }
+
+    def mark_ready(self) -> None:
+        """
+        Flags the model as warmed up and ready to serve traffic.
+        """
+        self._ready = True
+        logger.info("GoEmotions model is ready.")
+
+# Shared registry holding the model configured for the service
+registry = ModelRegistry(
+    settings.MODEL_NAME,
+    settings.MODEL_BACKEND,
+    onnx_path=settings.ONNX_MODEL_PATH,
+    checkpoint_dir=settings.MODEL_CACHE_DIR,
+    require_fast_tokenizer=settings.REQUIRE_FAST_TOKENIZER,
+    version=settings.MODEL_VERSION
+)
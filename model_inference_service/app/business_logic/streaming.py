@@ -0,0 +1,143 @@
+import asyncio
+import json
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+from app.config.logger import get_logger
+from app.utils.exceptions import InferenceValidationError
+
+# Initialize the logger
+logger = get_logger(__name__)
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Optional[bytes]]:
+    """
+    Split a stream of byte chunks into lines, holding at most one partial line in memory.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The request body, in chunks of any size.
+        max_line_bytes (int): The maximum length of a line. Longer lines are discarded
+            as they arrive instead of being buffered.
+
+    Yields:
+        Optional[bytes]: Each line without its line break, or None for a line that was too long.
+    """
+    buffer = b""
+    overlong = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield None if overlong or len(line) > max_line_bytes else line
+            overlong = False
+        if len(buffer) > max_line_bytes:
+            # Drop the rest of the line as it arrives; it is reported once its line break is reached
+            buffer = b""
+            overlong = True
+    if overlong or buffer:
+        yield None if overlong or len(buffer) > max_line_bytes else buffer
+
+def parse_entry(index: int, line: Optional[bytes]) -> dict:
+    """
+    Parse one NDJSON input line, either a JSON string or an object with a "text" and an optional "id".
+
+    Args:
+        index (int): The position of the line among the non-empty input lines.
+        line (Optional[bytes]): The raw line, or None if it exceeded the maximum length.
+
+    Returns:
+        dict: The "index", the "id" if any, and either the "text" or an "error" message.
+    """
+    entry = {"index": index}
+    try:
+        if line is None:
+            raise InferenceValidationError("The line exceeds the maximum allowed length.")
+        try:
+            value = json.loads(line)
+        except ValueError:
+            raise InferenceValidationError("The line is not valid JSON.")
+        if isinstance(value, dict):
+            if "id" in value:
+                entry["id"] = value["id"]
+            value = value.get("text")
+        if not isinstance(value, str):
+            raise InferenceValidationError("Each line must be a JSON string or an object with a \"text\" string.")
+        entry["text"] = value
+    except InferenceValidationError as e:
+        entry["error"] = str(e)
+    return entry
+
+async def _score_entries(entries: List[dict], score_fn: Callable[[List[str]], Awaitable[List[dict]]]) -> List[dict]:
+    """
+    Score the parsed entries of a batch and merge each outcome into its output record.
+    """
+    valid = [entry for entry in entries if "text" in entry]
+    try:
+        outcomes = await score_fn([entry["text"] for entry in valid]) if valid else []
+    except Exception as e:
+        logger.error(f"Streaming inference batch failed: {e}")
+        outcomes = [{"status": "error", "error": "An error occurred during model inference."}] * len(valid)
+    outcome_by_index = {entry["index"]: outcome for entry, outcome in zip(valid, outcomes)}
+
+    records = []
+    for entry in entries:
+        record = {key: entry[key] for key in ("index", "id") if key in entry}
+        record.update(outcome_by_index.get(entry["index"]) or {"status": "error", "error": entry.get("error")})
+        records.append(record)
+    return records
+
+def _encode_records(records: List[dict]) -> bytes:
+    """
+    Serialize output records as NDJSON.
+    """
+    return "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+
+async def stream_inference(
+    chunks: AsyncIterator[bytes],
+    score_fn: Callable[[List[str]], Awaitable[List[dict]]],
+    batch_size: int,
+    max_line_bytes: int
+) -> AsyncIterator[bytes]:
+    """
+    Score an NDJSON stream of texts batch by batch, yielding NDJSON results as batches complete.
+
+    While a batch is being scored the next one is read from the input, so at most
+    two batches are held in memory however long the stream is. Output records keep
+    the input order; empty lines are skipped.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The request body.
+        score_fn (Callable): Scores a list of texts, returning one bulk outcome per text
+            (see `infer_emotions_bulk`).
+        batch_size (int): The number of lines scored together.
+        max_line_bytes (int): The maximum length of an input line.
+
+    Yields:
+        bytes: The NDJSON records of a completed batch.
+    """
+    batch_size = max(1, batch_size)
+    pending: Optional[asyncio.Future] = None
+    entries: List[dict] = []
+    index = 0
+    try:
+        async for line in iter_lines(chunks, max_line_bytes):
+            if line is not None and not line.strip():
+                continue
+            entries.append(parse_entry(index, line))
+            index += 1
+            if len(entries) < batch_size:
+                continue
+
+            scoring = asyncio.ensure_future(_score_entries(entries, score_fn))
+            entries = []
+            if pending is not None:
+                yield _encode_records(await pending)
+            pending = scoring
+
+        if pending is not None:
+            yield _encode_records(await pending)
+            pending = None
+        if entries:
+            yield _encode_records(await _score_entries(entries, score_fn))
+        logger.info(f"Streaming inference completed for {index} lines")
+    finally:
+        # The client went away mid-stream: do not leave the last batch running
+        if pending is not None:
+            pending.cancel()
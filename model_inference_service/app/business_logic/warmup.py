@@ -0,0 +1,71 @@
+import statistics
+import time
+from typing import Dict, List, Tuple
+from app.business_logic.registry import LoadedModel
+from app.config.logger import get_logger
+
+# Initialize the logger
+logger = get_logger(__name__)
+
+# Filler word repeated to build synthetic inputs of a given token length
+_FILLER = "warm "
+
+def _synthetic_inputs(model: LoadedModel, sequence_length: int, batch_size: int):
+    """
+    Build a tokenized batch of exactly `batch_size` rows of `sequence_length` tokens.
+
+    Args:
+        model (LoadedModel): The model whose tokenizer is used.
+        sequence_length (int): The number of tokens per row, special tokens included.
+        batch_size (int): The number of rows.
+
+    Returns:
+        The tokenizer output, as PyTorch tensors.
+    """
+    return model.tokenizer(
+        [_FILLER * sequence_length] * batch_size,
+        return_tensors="pt",
+        padding="max_length",
+        truncation=True,
+        max_length=sequence_length
+    )
+
+def run_warm_up(
+    model: LoadedModel,
+    sequence_lengths: List[int],
+    batch_sizes: List[int],
+    iterations: int = 2
+) -> Dict[Tuple[int, int], float]:
+    """
+    Run synthetic batches through the backend for every (sequence length, batch size) bucket.
+
+    The first pass of each bucket warms up allocator pools and kernel paths for
+    that shape and is not timed; the following `iterations` passes are timed and
+    their median latency is logged as a per-node baseline.
+
+    Args:
+        model (LoadedModel): The model to warm up.
+        sequence_lengths (List[int]): The token lengths to exercise.
+        batch_sizes (List[int]): The batch sizes to exercise.
+        iterations (int): The number of timed passes per bucket.
+
+    Returns:
+        Dict[Tuple[int, int], float]: The median latency in milliseconds per (sequence length, batch size).
+    """
+    max_length = model.tokenizer.model_max_length
+    latencies = {}
+    for sequence_length in sorted({min(length, max_length) for length in sequence_lengths}):
+        for batch_size in sorted(set(batch_sizes)):
+            inputs = _synthetic_inputs(model, sequence_length, batch_size)
+            model.backend(inputs)  # Untimed pass to warm up this shape
+
+            timings = []
+            for _ in range(max(1, iterations)):
+                start = time.perf_counter()
+                model.backend(inputs)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            latencies[(sequence_length, batch_size)] = statistics.median(timings)
+            logger.info(f"Warm-up bucket seq_len={sequence_length} batch_size={batch_size}: "
+                        f"{latencies[(sequence_length, batch_size)]:.1f} ms")
+    return latencies
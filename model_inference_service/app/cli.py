@@ -0,0 +1,379 @@
+"""
+Score a file of texts offline, without the HTTP stack.
+
+The input is read as a stream, cut into chunks and scored with the same engine as
+the service (`infer_emotions_bulk`: length-sorted, padded sub-batches), optionally
+in several worker processes. Results are written as they complete, in input order.
+
+Usage (from the model_inference_service directory):
+    python -m app.cli messages.jsonl scores.jsonl --processes 4
+    python -m app.cli messages.csv scores.parquet --text-field body --id-field message_id
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from app.business_logic.inference import DEFAULT_TOP_K, SCORINGS, infer_emotions_bulk
+from app.business_logic.registry import registry
+from app.config.logger import get_logger
+from app.config.settings import settings
+
+# Initialize the logger
+logger = get_logger(__name__)
+
+# Input formats, inferred from the file extension unless --input-format is given
+INPUT_FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".txt": "text"}
+
+# Output formats, inferred from the file extension unless --output-format is given
+OUTPUT_FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+
+# A record read from the input: its id, its text, and the error if the input could not be read
+Record = Tuple[Any, Optional[str], Optional[str]]
+
+def read_jsonl(path: str, text_field: str, id_field: str) -> Iterator[Record]:
+    """
+    Stream records from a JSON Lines file of objects (or bare JSON strings).
+
+    Args:
+        path (str): The input file.
+        text_field (str): The key holding the text.
+        id_field (str): The key holding the id; the line number is used when it is missing.
+
+    Yields:
+        Record: The id and text of each non-empty line (None if the text is missing).
+            A line that is not valid JSON is yielded with an error instead of stopping the run.
+    """
+    with open(path, encoding="utf-8") as file:
+        index = 0
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError:
+                yield index, None, "The line is not valid JSON."
+            else:
+                if isinstance(value, dict):
+                    yield value.get(id_field, index), value.get(text_field), None
+                else:
+                    yield index, value if isinstance(value, str) else None, None
+            index += 1
+
+def read_csv(path: str, text_field: str, id_field: str) -> Iterator[Record]:
+    """
+    Stream records from a CSV file with a header row.
+
+    Args:
+        path (str): The input file.
+        text_field (str): The column holding the text.
+        id_field (str): The column holding the id; the row number is used when it is missing.
+
+    Yields:
+        Record: The id and text of each row.
+    """
+    with open(path, encoding="utf-8", newline="") as file:
+        for index, row in enumerate(csv.DictReader(file)):
+            yield row.get(id_field, index), row.get(text_field), None
+
+def read_text(path: str, text_field: str, id_field: str) -> Iterator[Record]:
+    """
+    Stream records from a plain-text file, one text per non-empty line.
+
+    Args:
+        path (str): The input file.
+        text_field (str): Unused; plain-text lines have no fields.
+        id_field (str): Unused; the line number is used as the id.
+
+    Yields:
+        Record: The line number and text of each non-empty line.
+    """
+    with open(path, encoding="utf-8") as file:
+        index = 0
+        for line in file:
+            text = line.rstrip("\r\n")
+            if not text.strip():
+                continue
+            yield index, text, None
+            index += 1
+
+# Streaming readers for each input format
+READERS = {"jsonl": read_jsonl, "csv": read_csv, "text": read_text}
+
+def iter_chunks(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    """
+    Group a stream of records into lists of at most `size` records.
+    """
+    iterator = iter(records)
+    while chunk := list(islice(iterator, max(1, size))):
+        yield chunk
+
+def score_chunk(
+    chunk: List[Record],
+    sub_batch_size: int,
+    max_length: int,
+    top_k: int,
+    include_probabilities: bool = False,
+    scoring: Optional[str] = None,
+    threshold: Optional[float] = None
+) -> List[dict]:
+    """
+    Score a chunk of records with the bulk inference engine.
+
+    Args:
+        chunk (List[Record]): The records to score.
+        sub_batch_size (int): The maximum number of texts per forward pass.
+        max_length (int): The maximum allowed length (in characters) of each text.
+        top_k (int): The number of top emotions to return for each text.
+        include_probabilities (bool): Whether to return the full probability vector of each text.
+        scoring (Optional[str]): The scoring head (defaults to SCORING).
+        threshold (Optional[float]): The sigmoid threshold (defaults to the configured thresholds).
+
+    Returns:
+        List[dict]: One output record per input record, with its "id" and either a "result" or an "error".
+    """
+    readable = [record for record in chunk if record[2] is None]
+    # A missing text is reported per item by the validation of infer_emotions_bulk
+    outcomes = iter(infer_emotions_bulk(
+        [text or "" for _, text, _ in readable], sub_batch_size, max_length, top_k, include_probabilities, scoring,
+        threshold
+    ) if readable else [])
+    return [
+        {"id": record_id, **(next(outcomes) if error is None else {"status": "error", "error": error})}
+        for record_id, _, error in chunk
+    ]
+
+class JsonlWriter:
+    """
+    Writes output records as JSON Lines.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The output file, overwritten if it exists.
+        """
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, records: List[dict]) -> None:
+        """
+        Appends a chunk of output records.
+        """
+        self.file.write("".join(json.dumps(record) + "\n" for record in records))
+
+    def close(self) -> None:
+        """
+        Closes the output file.
+        """
+        self.file.close()
+
+class ParquetWriter:
+    """
+    Writes output records as Parquet, one row group per chunk.
+
+    Requires the optional pyarrow package.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The output file, overwritten if it exists.
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("Writing Parquet requires the pyarrow package (pip install pyarrow).")
+
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([
+            ("id", pyarrow.string()),
+            ("status", pyarrow.string()),
+            ("error", pyarrow.string()),
+            ("predominant_emotion", pyarrow.string()),
+            ("confidence", pyarrow.float64()),
+            ("tokens", pyarrow.int64()),
+            ("emotions", pyarrow.list_(pyarrow.struct([
+                ("emotion", pyarrow.string()), ("percentage", pyarrow.float64())
+            ]))),
+            ("probabilities", pyarrow.list_(pyarrow.float32())),
+            ("scoring", pyarrow.string()),
+            ("labels", pyarrow.list_(pyarrow.string())),
+        ])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write(self, records: List[dict]) -> None:
+        """
+        Writes a chunk of output records as a row group, flattening the inference results.
+        """
+        rows = []
+        for record in records:
+            result = record.get("result") or {}
+            rows.append({
+                "id": str(record["id"]),
+                "status": record["status"],
+                "error": record.get("error"),
+                "predominant_emotion": result.get("predominant_emotion"),
+                "confidence": result.get("confidence"),
+                "tokens": result.get("tokens"),
+                "emotions": result.get("emotions"),
+                "probabilities": result.get("probabilities"),
+                "scoring": result.get("scoring"),
+                "labels": [label["emotion"] for label in result["labels"]] if "labels" in result else None,
+            })
+        self.writer.write_table(self.pyarrow.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self) -> None:
+        """
+        Writes the Parquet footer and closes the output file.
+        """
+        self.writer.close()
+
+# Writers for each output format
+WRITERS = {"jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+def _init_worker(num_threads: int) -> None:
+    """
+    Splits the CPU cores between the worker processes.
+    """
+    import torch
+    torch.set_num_threads(num_threads)
+
+def score_stream(
+    chunks: Iterable[List[Record]],
+    processes: int,
+    sub_batch_size: int,
+    max_length: int,
+    top_k: int,
+    include_probabilities: bool = False,
+    scoring: Optional[str] = None,
+    threshold: Optional[float] = None
+) -> Iterator[List[dict]]:
+    """
+    Score chunks of records, in worker processes if more than one is requested.
+
+    At most two chunks per process are in flight, so memory does not grow with the
+    size of the input. Results are yielded in input order.
+
+    Args:
+        chunks (Iterable[List[Record]]): The input, in chunks.
+        processes (int): The number of worker processes (1 scores in this process).
+        sub_batch_size (int): The maximum number of texts per forward pass.
+        max_length (int): The maximum allowed length (in characters) of each text.
+        top_k (int): The number of top emotions to return for each text.
+        include_probabilities (bool): Whether to return the full probability vector of each text.
+        scoring (Optional[str]): The scoring head (defaults to SCORING).
+        threshold (Optional[float]): The sigmoid threshold (defaults to the configured thresholds).
+
+    Yields:
+        List[dict]: The output records of each chunk.
+    """
+    options = (sub_batch_size, max_length, top_k, include_probabilities, scoring, threshold)
+
+    # Load the weights before forking, so the workers share them copy-on-write
+    registry.get()
+    if processes <= 1:
+        for chunk in chunks:
+            yield score_chunk(chunk, *options)
+        return
+
+    num_threads = settings.TORCH_NUM_THREADS or max(1, multiprocessing.cpu_count() // processes)
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+    with context.Pool(processes, initializer=_init_worker, initargs=(num_threads,)) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.apply_async(score_chunk, (chunk, *options)))
+            if len(in_flight) >= 2 * processes:
+                yield in_flight.popleft().get()
+        while in_flight:
+            yield in_flight.popleft().get()
+
+def _infer_format(path: str, formats: dict, given: Optional[str]) -> str:
+    """
+    Returns the given format, or the one matching the extension of `path`.
+    """
+    if given:
+        return given
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in formats:
+        raise SystemExit(f"Cannot infer the format of '{path}'; use one of {', '.join(formats)} or pass it explicitly.")
+    return formats[extension]
+
+def run(args: argparse.Namespace) -> dict:
+    """
+    Scores the input file and writes the output file.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+
+    Returns:
+        dict: The number of texts scored, failed, and the throughput in texts per second.
+    """
+    reader = READERS[_infer_format(args.input, INPUT_FORMATS, args.input_format)]
+    writer = WRITERS[_infer_format(args.output, OUTPUT_FORMATS, args.output_format)](args.output)
+
+    records = reader(args.input, args.text_field, args.id_field)
+    chunks = iter_chunks(records, args.chunk_size)
+    started = last_report = time.perf_counter()
+    scored = failed = 0
+    try:
+        for results in score_stream(
+            chunks, args.processes, args.sub_batch_size, args.max_length, args.top_k, args.include_probabilities,
+            args.scoring, args.threshold
+        ):
+            writer.write(results)
+            scored += len(results)
+            failed += sum(result["status"] != "success" for result in results)
+
+            now = time.perf_counter()
+            if now - last_report >= args.progress_interval:
+                last_report = now
+                logger.info(f"Scored {scored} texts ({scored / (now - started):.1f} texts/s, {failed} failed)")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    summary = {"texts": scored, "failed": failed, "texts_per_second": round(scored / elapsed, 1) if elapsed else 0.0}
+    logger.info(f"Scored {scored} texts in {elapsed:.1f} s ({summary['texts_per_second']} texts/s, {failed} failed)")
+    return summary
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command-line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Score a file of texts with the GoEmotions model.")
+    parser.add_argument("input", help="Input file: JSON Lines (.jsonl), CSV with a header (.csv) or plain text (.txt).")
+    parser.add_argument("output", help="Output file: JSON Lines (.jsonl) or Parquet (.parquet, requires pyarrow).")
+    parser.add_argument("--input-format", choices=sorted(READERS), help="Input format (default: from the extension).")
+    parser.add_argument("--output-format", choices=sorted(WRITERS), help="Output format (default: from the extension).")
+    parser.add_argument("--text-field", default="text", help="JSON key or CSV column holding the text.")
+    parser.add_argument("--id-field", default="id", help="JSON key or CSV column holding the id (default: the row number).")
+    parser.add_argument("--processes", type=int, default=1, help="Number of worker processes.")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="Number of texts sent to a worker at a time.")
+    parser.add_argument("--sub-batch-size", type=int, default=64, help="Maximum number of texts per forward pass.")
+    parser.add_argument("--max-length", type=int, default=settings.LONG_TEXT_MAX_LENGTH,
+                        help="Maximum number of characters per text; longer texts are reported as errors.")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Number of top emotions per text.")
+    parser.add_argument("--include-probabilities", action="store_true",
+                        help="Also write the probability of every emotion, ordered as EMOTIONS.")
+    parser.add_argument("--scoring", choices=SCORINGS, help="Scoring head (default: the SCORING setting).")
+    parser.add_argument("--threshold", type=float,
+                        help="Sigmoid score an emotion needs to be reported as a label (default: configured thresholds).")
+    parser.add_argument("--progress-interval", type=float, default=10.0, help="Seconds between progress reports.")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Command-line entry point:
+        python -m app.cli messages.jsonl scores.jsonl --processes 4
+    """
+    summary = run(parse_args(argv))
+    print(json.dumps(summary), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
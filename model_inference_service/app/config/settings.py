@@ -1,3 +1,4 @@
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -16,7 +17,51 @@ class Settings(BaseSettings):
 
     # Model settings
     MODEL_NAME: str
-    MAX_TOKENS: int
+    MODEL_VERSION: Optional[str] = None  # Version label reported with results (defaults to MODEL_NAME)
+    MODEL_LOAD_RETRY_SECONDS: float = 5  # Delay before retrying a failed startup load (doubles after each failure)
+    MODEL_LOAD_RETRY_MAX_SECONDS: float = 300  # Longest delay between two load attempts
+    MODEL_DRAIN_TIMEOUT_SECONDS: float = 60  # How long a replaced model version may finish its batches
+    ADMIN_TOKEN: Optional[str] = None  # Required in the X-Admin-Token header; admin endpoints are disabled while unset
+    MAX_TOKENS: int  # Texts are truncated to this many tokens (capped by the model maximum)
+    SEQUENCE_LENGTH_BUCKETS: List[int] = [16, 32, 64, 128, 256, 512]  # Lengths a batch is padded up to
+    MODEL_BACKEND: str = "pytorch"  # Inference backend: "pytorch" (fp32), "pytorch-int8" (dynamic quantization) or "onnx"
+    ONNX_MODEL_PATH: str = "goemotions.onnx"  # Exported graph used by the "onnx" backend
+    SCORING: str = "softmax"  # Default scoring head: "softmax" (single label) or "sigmoid" (multi-label)
+    SIGMOID_THRESHOLD: float = 0.5  # Sigmoid score an emotion needs to be reported as a label
+    SIGMOID_THRESHOLDS: Dict[str, float] = {}  # Per-emotion overrides of SIGMOID_THRESHOLD
+    REQUIRE_FAST_TOKENIZER: bool = True  # Refuse to start with the slow Python tokenizer
+    MODEL_CACHE_DIR: Optional[str] = None  # Directory of the safetensors copy loaded at startup (None loads MODEL_NAME directly)
+
+    # Batching settings
+    BATCH_MAX_SIZE: int = 16  # Maximum number of requests grouped into a single forward pass
+    BATCH_MAX_WAIT_MS: float = 5.0  # Maximum time (ms) to wait for a batch to fill up
+
+    # Executor settings
+    INFERENCE_WORKERS: int = 1  # Number of threads running forward passes concurrently
+    INFERENCE_MAX_QUEUE_SIZE: int = 256  # Requests allowed to wait before the service answers 503
+    TOKENIZER_WORKERS: int = 0  # Threads tokenizing the next batches during forward passes (0 tokenizes inline)
+    TORCH_NUM_THREADS: Optional[int] = None  # Intra-op threads used by each forward pass (None keeps torch's default)
+    TORCH_INTEROP_THREADS: Optional[int] = None  # Inter-op threads used by torch (None keeps torch's default)
+
+    # Long-text settings
+    LONG_TEXT_MAX_LENGTH: int = 10000  # Maximum characters accepted in long-text mode
+
+    # Bulk inference settings
+    BULK_MAX_TEXTS: int = 1000  # Maximum number of texts accepted by /api/inference/batch
+    BULK_SUB_BATCH_SIZE: int = 32  # Maximum number of texts per forward pass in bulk inference
+    STREAM_BATCH_SIZE: int = 256  # Lines of /api/inference/stream scored together (two batches are held in memory)
+    STREAM_MAX_LINE_BYTES: int = 16384  # Longer input lines are reported as errors without being buffered
+
+    # Result cache settings
+    CACHE_ENABLED: bool = True  # Serve repeated texts from an in-memory result cache
+    CACHE_MAX_ENTRIES: int = 10000  # Maximum number of cached results (least recently used are evicted)
+    CACHE_TTL_SECONDS: float = 3600  # Time-to-live of a cached result (0 keeps results until evicted)
+    NORMALIZER_LOWERCASE: bool = False  # Lowercase cache keys; only for uncased models (must match the tone analyzer)
+
+    # Warm-up settings
+    WARMUP_ENABLED: bool = True  # Run synthetic batches at startup before reporting ready
+    WARMUP_BATCH_SIZES: List[int] = [1, 8]  # Batch sizes exercised for each sequence-length bucket
+    WARMUP_ITERATIONS: int = 2  # Timed passes per bucket, logged as the latency baseline
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -1,5 +1,16 @@
+import time
+
+# Measure how long importing the service (torch and transformers included) takes
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from app.api.routes import router as inference_router
+from app.business_logic.batching import batcher
+from app.business_logic.executor import executor, tokenizer_executor
+from app.business_logic.inference import warm_up
+from app.business_logic.registry import registry
 from app.config.logger import get_logger
 from app.config.settings import settings
 from contextlib import asynccontextmanager
@@ -7,13 +18,49 @@ from contextlib import asynccontextmanager
 # Initialize the logger for the Model Inference Service
 logger = get_logger(__name__)
 
+# Seconds spent importing the modules above
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+async def prepare_model(stopping: asyncio.Event):
+    """
+    Loads and warms up the model in a worker thread, so /health keeps answering meanwhile.
+
+    A failed attempt is retried after MODEL_LOAD_RETRY_SECONDS, doubling the delay
+    after each failure up to MODEL_LOAD_RETRY_MAX_SECONDS, until the model is ready.
+    Meanwhile /ready reports the failure and requests fail fast.
+
+    Args:
+        stopping (asyncio.Event): Set on shutdown to stop retrying.
+    """
+    delay = settings.MODEL_LOAD_RETRY_SECONDS
+    while True:
+        try:
+            await asyncio.to_thread(warm_up)
+            break
+        except Exception as e:
+            # Keep the service up and try again later
+            logger.error(f"Model preparation failed, retrying in {delay:.1f} s: {e}")
+        try:
+            await asyncio.wait_for(stopping.wait(), timeout=delay)
+            return
+        except asyncio.TimeoutError:
+            pass
+        delay = min(delay * 2, settings.MODEL_LOAD_RETRY_MAX_SECONDS)
+
+    timings = {"import": IMPORT_SECONDS, **registry.timings}
+    logger.info("Startup timings: " + ", ".join(f"{step} {seconds:.2f} s" for step, seconds in timings.items()))
+
 # Create an async context manager for the lifespan event
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    preparation = None
+    stopping = asyncio.Event()
     try:
         # Code to run on startup
         logger.info("Starting up the Model Inference Service...")
-        
+        batcher.start()
+        preparation = asyncio.create_task(prepare_model(stopping))
+
         yield  # Control passes to the application here
         
     except Exception as e:
@@ -21,6 +68,14 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         # Code to run on shutdown
+        if preparation is not None:
+            # Stop retrying a failed load, but let an attempt in progress finish
+            stopping.set()
+            await preparation
+        batcher.stop()
+        if tokenizer_executor is not None:
+            tokenizer_executor.shutdown()
+        executor.shutdown()
         logger.info("Shutting down the Model Inference Service...")
 
 # Create an instance of the FastAPI application with lifespan
@@ -43,3 +98,19 @@ async def health_check():
     """
     return {"status": "ok", "message": "Model Inference Service is up and running!"}
 
+# Readiness check endpoint
+@app.get("/ready", tags=["Health Check"])
+async def readiness_check():
+    """
+    Readiness check endpoint: answers 200 only once the model weights are loaded
+    and a warm-up batch has run, and 503 until then.
+    """
+    if registry.ready:
+        return {"status": "ready", "message": "Model Inference Service is ready to serve requests."}
+    return JSONResponse(
+        status_code=503,
+        content={
+            "status": "error" if registry.error else "loading",
+            "message": registry.error or "The model is still loading."
+        }
+    )
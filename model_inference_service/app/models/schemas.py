@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, confloat
-from typing import List
+from pydantic import BaseModel, ConfigDict, Field, confloat
+from typing import List, Literal, Optional
 
 class InferenceRequest(BaseModel):
     """
@@ -14,6 +14,38 @@ class InferenceRequest(BaseModel):
         description="The text to be used for model inference."
     )  # The input text that will be analyzed by the model.
 
+    top_k: int = Field(
+        5,
+        ge=1,
+        le=28,  # The number of emotions of the GoEmotions model
+        description="The number of top emotions to return."
+    )  # How many of the highest scoring emotions are included in the response.
+
+    long_text: bool = Field(
+        False,
+        description="Split the text into sentence windows and aggregate their scores."
+    )  # Enables texts longer than the model's token budget (up to LONG_TEXT_MAX_LENGTH characters).
+
+    aggregation: Literal["mean", "max", "weighted"] = Field(
+        "mean",
+        description="How window scores are combined in long-text mode."
+    )  # Mean, maximum, or token-length weighted mean of the window scores.
+
+    include_probabilities: bool = Field(
+        False,
+        description="Also return the probability of every emotion, ordered as /api/emotions."
+    )  # Adds the full 28-class distribution as a compact array of floats.
+
+    scoring: Optional[Literal["softmax", "sigmoid"]] = Field(
+        None,
+        description="The scoring head: 'softmax' (emotions compete) or 'sigmoid' (multi-label). Defaults to SCORING."
+    )  # Sigmoid scores each emotion independently and reports all emotions above threshold.
+
+    threshold: Optional[confloat(ge=0, le=1)] = Field(
+        None,
+        description="The sigmoid score an emotion needs to be reported as a label. Defaults to the configured thresholds."
+    )  # Overrides SIGMOID_THRESHOLD and SIGMOID_THRESHOLDS for this request.
+
 class EmotionDetail(BaseModel):
     """
     Represents a detected emotion and its percentage.
@@ -39,6 +71,9 @@ class InferenceResponse(BaseModel):
     on the input text. It includes a list of emotions with their percentages, the 
     predominant emotion, and the confidence level of that predominant emotion.
     """
+    # Allow field names starting with "model_", which pydantic reserves by default
+    model_config = ConfigDict(protected_namespaces=())
+
     emotions: List[EmotionDetail] = Field(
         ..., 
         description="List of detected emotions with their percentages."
@@ -53,3 +88,191 @@ class InferenceResponse(BaseModel):
         ..., 
         description="The confidence percentage for the predominant emotion."
     )  # The confidence level (as a percentage) for the predominant emotion.
+
+    tokens: Optional[int] = Field(
+        None,
+        ge=0,
+        description="The number of tokens processed for the text, special tokens included."
+    )  # The number of tokens the model actually processed after truncation.
+
+    windows: Optional[int] = Field(
+        None,
+        ge=1,
+        description="The number of windows scored, in long-text mode."
+    )  # How many sentence windows the text was split into.
+
+    probabilities: Optional[List[float]] = Field(
+        None,
+        description="The probability (0-1) of every emotion, ordered as /api/emotions, when requested."
+    )  # The full distribution, without the cost of one object per emotion.
+
+    scoring: Optional[str] = Field(
+        None,
+        description="The scoring head the percentages come from: 'softmax' or 'sigmoid'."
+    )  # With sigmoid, percentages are independent and do not add up to 100.
+
+    labels: Optional[List[EmotionDetail]] = Field(
+        None,
+        description="Every emotion whose sigmoid score reaches its threshold, by descending score."
+    )  # The multi-label prediction, present with the sigmoid scoring head.
+
+    model_version: Optional[str] = Field(
+        None,
+        description="The version of the model that produced the result."
+    )  # Identifies which model served the request, e.g. around a hot swap.
+
+class BatchInferenceRequest(BaseModel):
+    """
+    Schema for the request body that will perform the inference on several texts.
+
+    This schema defines the structure of the input data required to score many
+    texts in a single call. Each text is validated and scored independently.
+    """
+    texts: List[str] = Field(
+        ...,
+        min_length=1,
+        description="The texts to be used for model inference."
+    )  # The input texts that will be analyzed by the model.
+
+    top_k: int = Field(
+        5,
+        ge=1,
+        le=28,  # The number of emotions of the GoEmotions model
+        description="The number of top emotions to return for each text."
+    )  # How many of the highest scoring emotions are included in each result.
+
+    include_probabilities: bool = Field(
+        False,
+        description="Also return the probability of every emotion for each text."
+    )  # Adds the full 28-class distribution of each text as a compact array of floats.
+
+    scoring: Optional[Literal["softmax", "sigmoid"]] = Field(
+        None,
+        description="The scoring head: 'softmax' (emotions compete) or 'sigmoid' (multi-label). Defaults to SCORING."
+    )  # Sigmoid scores each emotion independently and reports all emotions above threshold.
+
+    threshold: Optional[confloat(ge=0, le=1)] = Field(
+        None,
+        description="The sigmoid score an emotion needs to be reported as a label. Defaults to the configured thresholds."
+    )  # Overrides SIGMOID_THRESHOLD and SIGMOID_THRESHOLDS for this request.
+
+class BatchInferenceItem(BaseModel):
+    """
+    Represents the outcome of the inference for a single text of a batch.
+
+    This schema holds either the inference result or the error that prevented the
+    text from being analyzed, along with the position of the text in the request.
+    """
+    index: int = Field(
+        ...,
+        ge=0,
+        description="The position of the text in the request."
+    )  # The index of the text in the request's list of texts.
+
+    status: str = Field(
+        ...,
+        description="Either 'success' or 'error'."
+    )  # Whether the inference succeeded for this text.
+
+    result: Optional[InferenceResponse] = Field(
+        None,
+        description="The inference result, present when the status is 'success'."
+    )  # The inferred emotions for this text.
+
+    error: Optional[str] = Field(
+        None,
+        description="The error message, present when the status is 'error'."
+    )  # The reason why this text could not be analyzed.
+
+class BatchInferenceResponse(BaseModel):
+    """
+    Schema for the response body that contains the inference results of a batch.
+
+    This schema defines the structure of the response after performing inference
+    on several texts. The results are returned in the same order as the request.
+    """
+    results: List[BatchInferenceItem] = Field(
+        ...,
+        description="One entry per input text, in request order."
+    )  # The outcome of the inference for each text.
+
+class EmotionsResponse(BaseModel):
+    """
+    Schema for the response body that lists the emotions of the model.
+
+    This schema gives the order of the values of the `probabilities` arrays, so
+    that clients can map them back to emotion names once instead of per result.
+    """
+    emotions: List[str] = Field(
+        ...,
+        description="The emotion labels, in the order used by probability vectors."
+    )  # The 28 GoEmotions labels.
+
+class ModelSwapRequest(BaseModel):
+    """
+    Schema for the request body that swaps in a new model version.
+
+    The new version is loaded and warmed up in the background while the active one
+    keeps serving, then replaces it without dropping any request.
+    """
+    # Allow field names starting with "model_", which pydantic reserves by default
+    model_config = ConfigDict(protected_namespaces=())
+
+    model_name: str = Field(
+        ...,
+        min_length=1,
+        description="A Hugging Face model id or a local directory."
+    )  # The model to load.
+
+    backend: Optional[str] = Field(
+        None,
+        description="The inference backend ('pytorch', 'pytorch-int8' or 'onnx'). Defaults to the active one."
+    )  # See MODEL_BACKEND.
+
+    version: Optional[str] = Field(
+        None,
+        description="The version label reported with results. Defaults to the model name."
+    )  # Distinguishes versions loaded from the same name, e.g. after retraining.
+
+    onnx_path: Optional[str] = Field(
+        None,
+        description="The exported graph used by the 'onnx' backend. Defaults to the active one."
+    )  # See ONNX_MODEL_PATH.
+
+class ModelStatusResponse(BaseModel):
+    """
+    Schema for the response body that describes the serving model.
+
+    This schema reports the active model version and the progress of a swap: the
+    version being loaded, the replaced versions still finishing their batches, and
+    the error of the last swap if it failed.
+    """
+    # Allow field names starting with "model_", which pydantic reserves by default
+    model_config = ConfigDict(protected_namespaces=())
+
+    model_name: str = Field(..., description="The name the active model was loaded from.")
+    backend: str = Field(..., description="The inference backend of the active model.")
+    version: str = Field(..., description="The version label of the active model.")
+    ready: bool = Field(..., description="Whether the service has finished its startup warm-up.")
+    swapping: Optional[str] = Field(None, description="The version being loaded, if a swap is running.")
+    draining: List[str] = Field(..., description="Replaced versions still finishing their forward passes.")
+    swap_error: Optional[str] = Field(None, description="Why the last swap failed, if it did.")
+
+class CacheStatsResponse(BaseModel):
+    """
+    Schema for the response body that contains the inference cache counters.
+
+    This schema exposes how effective the result cache is: how many lookups were
+    served from it, how many required a forward pass and how many entries were
+    dropped to respect the size bound or the time-to-live.
+    """
+    enabled: bool = Field(..., description="Whether the cache is enabled.")
+    size: int = Field(..., description="The number of cached results.")
+    max_entries: int = Field(..., description="The maximum number of cached results.")
+    in_flight: int = Field(..., description="The number of distinct texts currently being computed.")
+    hits: int = Field(..., description="Lookups served from the cache.")
+    misses: int = Field(..., description="Lookups that required a forward pass.")
+    deduplicated: int = Field(..., description="Lookups that joined an identical request already in flight.")
+    evictions: int = Field(..., description="Entries evicted to respect the size bound.")
+    expirations: int = Field(..., description="Entries dropped because their time-to-live elapsed.")
+    hit_rate: float = Field(..., description="The fraction of lookups that did not run the model.")
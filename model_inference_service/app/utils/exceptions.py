@@ -55,3 +55,31 @@ class InferenceRuntimeError(InferenceServiceError):
             detail (str): A message providing details about the inference runtime error.
         """
         super().__init__(detail)
+
+
+class InferenceOverloadedError(InferenceServiceError):
+    """
+    Exception raised when the service has too many pending inference requests.
+    """
+    def __init__(self, detail: str = "The inference service is overloaded. Please retry later."):
+        """
+        Initializes the InferenceOverloadedError with a default message and a 503 status code.
+
+        Args:
+            detail (str): A message providing details about the overload.
+        """
+        super().__init__(detail, status_code=503)
+
+
+class ModelSwapInProgressError(InferenceServiceError):
+    """
+    Exception raised when a model swap is requested while another one is still running.
+    """
+    def __init__(self, detail: str = "A model version is already being loaded."):
+        """
+        Initializes the ModelSwapInProgressError with a default message and a 409 status code.
+
+        Args:
+            detail (str): A message providing details about the swap in progress.
+        """
+        super().__init__(detail, status_code=409)
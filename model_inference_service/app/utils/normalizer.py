@@ -0,0 +1,30 @@
+# Text normalization contract shared by the Tone Analyzer Service and the Model
+# Inference Service. Both services keep an identical copy of this module: the tone
+# analyzer sends canonical text and both result caches key on it, so the two copies
+# must produce the same output. Any change to `normalize_text` must bump
+# NORMALIZER_VERSION and the test vectors (tests/normalizer_vectors.json) of both services.
+import re
+import unicodedata
+
+NORMALIZER_VERSION = "1"
+
+# Runs of whitespace, which the tokenizer treats as a single separator
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(text: str, lowercase: bool = False) -> str:
+    """
+    Return the canonical form of a text: Unicode NFC, collapsed whitespace, stripped ends.
+
+    These transformations do not change how a cased or uncased tokenizer splits the
+    text, so texts with the same canonical form get the same inference result.
+
+    Args:
+        text (str): The raw input text.
+        lowercase (bool): Also lowercase the text. Only enable it for uncased models,
+            whose tokenizer lowercases anyway; cased models distinguish "WOW" from "wow".
+
+    Returns:
+        str: The canonical text.
+    """
+    text = _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+    return text.lower() if lowercase else text
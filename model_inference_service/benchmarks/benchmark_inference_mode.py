@@ -0,0 +1,95 @@
+"""
+Benchmark the forward pass with autograd enabled versus torch.inference_mode.
+
+Each mode runs in its own subprocess so that the peak resident set size (RSS)
+reported for one mode is not inflated by the other.
+
+Usage (from the model_inference_service directory):
+    python -m benchmarks.benchmark_inference_mode --batch-size 8 --iterations 20
+"""
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+SAMPLE_TEXTS = [
+    "I am very happy today!",
+    "This is the worst service I have ever used.",
+    "Thank you so much for your help, I really appreciate it.",
+    "I'm not sure what you mean, could you explain that again?",
+    "Wow, I did not expect that at all!",
+    "I miss my family so much.",
+    "That is disgusting, please stop.",
+    "Ok, see you tomorrow.",
+]
+
+def run_mode(mode: str, batch_size: int, iterations: int) -> dict:
+    """
+    Measure latency and peak RSS for a single mode in the current process.
+
+    Args:
+        mode (str): Either "grad" (autograd enabled) or "inference" (torch.inference_mode).
+        batch_size (int): The number of texts per forward pass.
+        iterations (int): The number of timed forward passes.
+
+    Returns:
+        dict: Latency percentiles (ms) and peak RSS (MB).
+    """
+    import torch
+    from app.business_logic.registry import registry
+
+    model = registry.get()
+    texts = (SAMPLE_TEXTS * (batch_size // len(SAMPLE_TEXTS) + 1))[:batch_size]
+    inputs = model.tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+    context = torch.enable_grad if mode == "grad" else torch.inference_mode
+
+    def forward():
+        with context():
+            torch.nn.functional.softmax(model.backend.model(**inputs).logits, dim=1)
+
+    # Warm up allocator pools and kernel paths before timing
+    for _ in range(3):
+        forward()
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        forward()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "batch_size": batch_size,
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 2),
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--mode", choices=["grad", "inference"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.batch_size, args.iterations)))
+        return
+
+    for mode in ("grad", "inference"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.benchmark_inference_mode", "--mode", mode,
+             "--batch-size", str(args.batch_size), "--iterations", str(args.iterations)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{result['mode']:>9}: p50 {result['p50_ms']:8.2f} ms | p95 {result['p95_ms']:8.2f} ms | "
+              f"peak RSS {result['peak_rss_mb']:8.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Check that the dynamic int8 backend gives the same answers as the fp32 backend.
+
+A fixed corpus is scored with both backends. For every text the predominant
+emotion and the set of top-5 emotions are compared, and the forward-pass time of
+each backend is reported. The script exits with a non-zero status if the
+agreement on the predominant emotion falls below --min-agreement.
+
+Usage (from the model_inference_service directory):
+    python -m benchmarks.check_quantization_parity --min-agreement 0.95
+"""
+import argparse
+import sys
+import time
+import torch
+from transformers import AutoTokenizer
+from app.business_logic.backends import TorchBackend, QuantizedTorchBackend
+from app.config.settings import settings
+
+CORPUS = [
+    "I am very happy today!",
+    "This is the worst service I have ever used.",
+    "Thank you so much for your help, I really appreciate it.",
+    "I'm not sure what you mean, could you explain that again?",
+    "Wow, I did not expect that at all!",
+    "I miss my family so much.",
+    "That is disgusting, please stop.",
+    "Ok, see you tomorrow.",
+    "I'm so proud of what you achieved this year.",
+    "I'm really nervous about the exam on Monday.",
+    "Why would anyone do something like that?",
+    "I love this song, it always makes me smile.",
+    "I'm sorry, I shouldn't have said that.",
+    "Finally! The package arrived after three weeks.",
+    "This is so annoying, the app keeps crashing.",
+    "I hope everything goes well for you.",
+    "Oh, now I get it, that makes sense.",
+    "What a relief, nobody got hurt.",
+    "Please leave me alone.",
+    "Congratulations on your new job!",
+    "I can't believe you forgot my birthday again.",
+    "That joke was hilarious.",
+    "I'm curious how this will turn out.",
+    "I really want to visit Japan someday.",
+    "He passed away last night.",
+    "I'm embarrassed that I tripped in front of everyone.",
+    "You're absolutely right, I agree with you.",
+    "Take care of yourself, okay?",
+    "I am disappointed with the results.",
+    "The meeting is at 10am in room 4.",
+]
+
+def top_emotions(backend, inputs, k: int = 5):
+    """
+    Score the corpus with a backend and return its top-k class indices and the forward time.
+    """
+    start = time.perf_counter()
+    scores = torch.nn.functional.softmax(backend(inputs), dim=1)
+    elapsed = time.perf_counter() - start
+    values, indices = torch.topk(scores, k, dim=1)
+    return values.numpy(), indices.numpy(), elapsed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=settings.MODEL_NAME,
+                        help="Name or path of the pre-trained model (defaults to MODEL_NAME).")
+    parser.add_argument("--min-agreement", type=float, default=0.95,
+                        help="Minimum fraction of texts whose predominant emotion must match.")
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model, clean_up_tokenization_spaces=True)
+    inputs = tokenizer(CORPUS, return_tensors="pt", padding=True, truncation=True)
+
+    reference_scores, reference, reference_time = top_emotions(TorchBackend(args.model), inputs)
+    quantized_scores, quantized, quantized_time = top_emotions(QuantizedTorchBackend(args.model), inputs)
+
+    predominant_matches = int((reference[:, 0] == quantized[:, 0]).sum())
+    top5_overlap = sum(len(set(a) & set(b)) for a, b in zip(reference, quantized)) / (5 * len(CORPUS))
+    confidence_delta = abs(reference_scores[:, 0] - quantized_scores[:, 0]).mean() * 100
+    agreement = predominant_matches / len(CORPUS)
+
+    print(f"Predominant emotion agreement: {predominant_matches}/{len(CORPUS)} ({agreement:.1%})")
+    print(f"Top-5 emotion overlap:         {top5_overlap:.1%}")
+    print(f"Mean confidence delta:         {confidence_delta:.2f} percentage points")
+    print(f"Forward pass fp32 / int8:      {reference_time * 1000:.1f} ms / {quantized_time * 1000:.1f} ms "
+          f"(speedup x{reference_time / quantized_time:.2f})")
+
+    return 0 if agreement >= args.min_agreement else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+# Gunicorn configuration for serving the Model Inference Service with several worker processes.
+#
+# Run with: gunicorn app.main:app -c gunicorn.conf.py
+#
+# The application is imported and the model weights are loaded once in the master
+# process, which then forks the workers. The weight tensors are never written to
+# after loading, so the workers share their pages copy-on-write instead of each
+# holding a private copy: memory grows with the activations of each worker, not
+# with the size of the model times the number of workers.
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8001')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+# Import the application in the master so the registry below is inherited by every worker
+preload_app = True
+
+def on_starting(server):
+    """
+    Loads the model in the master process, before any worker is forked.
+
+    Only the weights are loaded here: the warm-up forward passes run in each worker
+    (during the application lifespan), so the master never starts torch's thread pools.
+    """
+    from app.business_logic.registry import registry
+
+    registry.load()
+    # Move the objects created so far out of the collector's reach: a collection in a
+    # worker would otherwise write to their headers and unshare the pages holding them
+    gc.freeze()
+
+def post_fork(server, worker):
+    """
+    Splits the CPU budget between the workers, unless TORCH_NUM_THREADS pins it.
+    """
+    import torch
+    from app.config.settings import settings
+
+    num_threads = settings.TORCH_NUM_THREADS or max(1, multiprocessing.cpu_count() // workers)
+    torch.set_num_threads(num_threads)
+    server.log.info(f"Worker {worker.pid} uses {num_threads} torch threads.")
@@ -0,0 +1,53 @@
+import pytest
+import torch
+from app.business_logic.backends import QuantizedTorchBackend, load_backend
+from app.business_logic.inference import EMOTIONS
+from app.business_logic.registry import registry
+from app.config.settings import settings
+from app.utils.exceptions import ModelLoadingError
+
+MODEL_NAME = settings.MODEL_NAME
+
+def test_load_backend_unknown_name():
+    """
+    Test that requesting an unknown backend raises a ModelLoadingError.
+    """
+    with pytest.raises(ModelLoadingError) as exc_info:
+        load_backend("does-not-exist", MODEL_NAME)
+    assert "Unknown model backend" in str(exc_info.value)
+
+def test_quantized_backend_quantizes_linear_layers():
+    """
+    Test that the int8 backend replaces Linear layers and returns one logit per emotion.
+    """
+    backend = load_backend("pytorch-int8", MODEL_NAME)
+    assert isinstance(backend, QuantizedTorchBackend)
+    assert not any(type(module) is torch.nn.Linear for module in backend.model.modules())
+
+    inputs = registry.get().tokenizer(["I am very happy today!", "I am sad"], return_tensors="pt", padding=True)
+    logits = backend(inputs)
+    assert logits.shape == (2, len(EMOTIONS))
+
+def test_onnx_backend_matches_pytorch(tmp_path):
+    """
+    Test that the exported ONNX graph produces the same logits as the PyTorch model.
+    """
+    pytest.importorskip("onnxruntime")
+    from app.business_logic.onnx_export import export_onnx
+
+    onnx_path = str(tmp_path / "goemotions.onnx")
+    export_onnx(MODEL_NAME, onnx_path)
+    onnx_backend = load_backend("onnx", MODEL_NAME, onnx_path=onnx_path)
+    torch_backend = load_backend("pytorch", MODEL_NAME)
+
+    # A different batch and sequence size than the export sample checks the dynamic axes
+    texts = ["I am very happy today!", "This is a very long text. " * 5, "I am sad"]
+    inputs = registry.get().tokenizer(texts, return_tensors="pt", padding=True)
+    assert torch.allclose(onnx_backend(inputs), torch_backend(inputs), atol=1e-4)
+
+def test_onnx_backend_requires_model_path():
+    """
+    Test that the onnx backend cannot be loaded without the path of an exported graph.
+    """
+    with pytest.raises(ModelLoadingError):
+        load_backend("onnx", MODEL_NAME)
@@ -0,0 +1,123 @@
+import threading
+import pytest
+from app.business_logic.batching import InferenceBatcher
+from app.business_logic.executor import InferenceExecutor
+from app.utils.exceptions import InferenceOverloadedError
+
+def test_batcher_groups_concurrent_requests():
+    """
+    Test that requests queued within the wait window are processed in a single batch.
+    """
+    calls = []
+    release = threading.Event()
+
+    def batch_fn(items):
+        calls.append(list(items))
+        release.wait(1)
+        return [item.upper() for item in items]
+
+    batcher = InferenceBatcher(batch_fn, max_batch_size=8, max_wait_ms=200)
+    try:
+        futures = [batcher.submit(text) for text in ["a", "b", "c"]]
+        release.set()
+        assert [future.result(timeout=5) for future in futures] == ["A", "B", "C"]
+        assert calls == [["a", "b", "c"]]
+    finally:
+        batcher.stop(timeout=5)
+
+def test_batcher_respects_max_batch_size():
+    """
+    Test that batches never exceed the configured maximum size.
+    """
+    calls = []
+
+    def batch_fn(items):
+        calls.append(len(items))
+        return items
+
+    batcher = InferenceBatcher(batch_fn, max_batch_size=2, max_wait_ms=100)
+    try:
+        futures = [batcher.submit(i) for i in range(5)]
+        assert [future.result(timeout=5) for future in futures] == list(range(5))
+        assert max(calls) <= 2
+        assert sum(calls) == 5
+    finally:
+        batcher.stop(timeout=5)
+
+def test_batcher_propagates_errors_to_every_request():
+    """
+    Test that a failing batch raises the error for every request it contained.
+    """
+    def batch_fn(items):
+        raise RuntimeError("boom")
+
+    batcher = InferenceBatcher(batch_fn, max_batch_size=4, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(text) for text in ["a", "b"]]
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result(timeout=5)
+    finally:
+        batcher.stop(timeout=5)
+
+def test_batcher_rejects_requests_when_queue_is_full():
+    """
+    Test that the batcher sheds load once its queue holds max_queue_size requests.
+    """
+    release = threading.Event()
+    executor = InferenceExecutor(max_workers=1, max_queue_size=0)
+
+    def batch_fn(items):
+        release.wait(5)
+        return items
+
+    batcher = InferenceBatcher(batch_fn, max_batch_size=1, max_wait_ms=0, executor=executor, max_queue_size=1)
+    try:
+        first = batcher.submit("a")
+        # Wait until the first request occupies the only worker
+        while executor.pending == 0:
+            threading.Event().wait(0.01)
+        second = batcher.submit("b")
+        with pytest.raises(InferenceOverloadedError):
+            batcher.submit("c")
+        release.set()
+        assert first.result(timeout=5) == "a"
+        assert second.result(timeout=5) == "b"
+    finally:
+        release.set()
+        batcher.stop(timeout=5)
+        executor.shutdown()
+
+def test_batcher_prepares_next_batch_during_forward_pass():
+    """
+    Test that with a prepare executor the next batch is prepared while the previous one is still running.
+    """
+    executor = InferenceExecutor(max_workers=1, max_queue_size=0)
+    prepare_executor = InferenceExecutor(max_workers=1, max_queue_size=0, name="tokenizer")
+    prepared = []
+    second_prepared = threading.Event()
+
+    def prepare_fn(items):
+        prepared.append((list(items), threading.current_thread().name))
+        if len(prepared) == 2:
+            second_prepared.set()
+        return [item.upper() for item in items]
+
+    def batch_fn(items):
+        # The first forward pass only completes once the second batch has been prepared
+        if items == ["A"]:
+            assert second_prepared.wait(5)
+        return items
+
+    batcher = InferenceBatcher(
+        batch_fn, max_batch_size=1, max_wait_ms=0, executor=executor,
+        prepare_fn=prepare_fn, prepare_executor=prepare_executor
+    )
+    try:
+        futures = [batcher.submit(text) for text in ["a", "b"]]
+        assert [future.result(timeout=5) for future in futures] == ["A", "B"]
+        assert all(name.startswith("tokenizer") for _, name in prepared)
+    finally:
+        batcher.stop(timeout=5)
+        prepare_executor.shutdown()
+        executor.shutdown()
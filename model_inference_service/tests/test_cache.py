@@ -0,0 +1,120 @@
+import threading
+from concurrent.futures import Future
+from app.business_logic.cache import ResultCache
+from app.config.settings import settings
+from app.utils.normalizer import normalize_text
+
+def _computed(value):
+    """
+    Returns a compute callable producing an already resolved future, and a list recording its calls.
+    """
+    calls = []
+
+    def compute():
+        calls.append(value)
+        future = Future()
+        future.set_result(value)
+        return future
+    return compute, calls
+
+def test_normalize_text():
+    """
+    Test that normalization collapses whitespace and applies Unicode NFC.
+    """
+    assert normalize_text("  I am\t\nhappy  ") == "I am happy"
+    assert normalize_text("café") == "café"
+
+def test_cache_key_depends_on_text_model_and_options():
+    """
+    Test that keys ignore whitespace differences but not the model or the options.
+    """
+    key = ResultCache.make_key("I am happy", "model:pytorch")
+    assert ResultCache.make_key(" I  am happy ", "model:pytorch") == key
+    assert ResultCache.make_key("I am happy", "model:onnx") != key
+    assert ResultCache.make_key("I am happy", "model:pytorch", 3) != key
+
+def test_cache_hits_and_misses():
+    """
+    Test that a repeated key is served from the cache without recomputing.
+    """
+    cache = ResultCache(max_entries=10, ttl_seconds=60)
+    compute, calls = _computed("result")
+    assert cache.get_or_submit("key", compute).result() == "result"
+    assert cache.get_or_submit("key", compute).result() == "result"
+    assert calls == ["result"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+def test_cache_evicts_least_recently_used():
+    """
+    Test that the cache stays within max_entries by evicting the least recently used key.
+    """
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+    for key in ["a", "b"]:
+        cache.get_or_submit(key, _computed(key)[0])
+    cache.get_or_submit("a", _computed("a")[0])  # "a" becomes the most recently used
+    cache.get_or_submit("c", _computed("c")[0])
+
+    compute, calls = _computed("b")
+    cache.get_or_submit("b", compute)
+    assert calls == ["b"]  # "b" had been evicted
+    assert cache.stats()["evictions"] == 2
+
+def test_cache_expires_entries():
+    """
+    Test that entries older than the time-to-live are recomputed.
+    """
+    cache = ResultCache(max_entries=10, ttl_seconds=0.001)
+    cache.get_or_submit("key", _computed("old")[0])
+    threading.Event().wait(0.01)
+    assert cache.get_or_submit("key", _computed("new")[0]).result() == "new"
+    assert cache.stats()["expirations"] == 1
+
+def test_cache_deduplicates_in_flight_requests():
+    """
+    Test that identical requests in flight share a single computation.
+    """
+    cache = ResultCache(max_entries=10, ttl_seconds=60)
+    pending = Future()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return pending
+
+    first = cache.get_or_submit("key", compute)
+    second = cache.get_or_submit("key", compute)
+    assert first is second
+    pending.set_result("result")
+    assert second.result() == "result"
+    assert len(calls) == 1
+    assert cache.stats()["deduplicated"] == 1
+
+def test_cache_does_not_store_failures():
+    """
+    Test that a failed computation is not cached.
+    """
+    cache = ResultCache(max_entries=10, ttl_seconds=60)
+    failed = Future()
+    failed.set_exception(RuntimeError("boom"))
+    cache.get_or_submit("key", lambda: failed)
+    assert cache.stats()["size"] == 0
+
+def test_disabled_cache_always_computes():
+    """
+    Test that a disabled cache computes every lookup and stores nothing.
+    """
+    cache = ResultCache(max_entries=10, ttl_seconds=60, enabled=False)
+    compute, calls = _computed("result")
+    cache.get_or_submit("key", compute)
+    cache.get_or_submit("key", compute)
+    assert len(calls) == 2
+    assert cache.stats()["size"] == 0
+
+def test_cache_key_keeps_case_unless_configured(monkeypatch):
+    """
+    Test that keys distinguish case for the cased model and ignore it when NORMALIZER_LOWERCASE is set.
+    """
+    assert ResultCache.make_key("WOW", "model:pytorch") != ResultCache.make_key("wow", "model:pytorch")
+    monkeypatch.setattr(settings, "NORMALIZER_LOWERCASE", True)
+    assert ResultCache.make_key("WOW", "model:pytorch") == ResultCache.make_key("wow", "model:pytorch")
@@ -0,0 +1,30 @@
+from app.business_logic.chunking import split_sentences, split_into_windows
+from app.business_logic.registry import registry
+
+def test_split_sentences():
+    """
+    Test that texts are split on terminal punctuation and line breaks.
+    """
+    text = "I am happy. Are you?  Great!\nNew line without punctuation"
+    assert split_sentences(text) == ["I am happy.", "Are you?", "Great!", "New line without punctuation"]
+
+def test_split_into_windows_packs_sentences_within_budget():
+    """
+    Test that every window fits the token budget and that no text is lost.
+    """
+    tokenizer = registry.get().tokenizer
+    text = " ".join(f"This is sentence number {i}." for i in range(40))
+    windows = split_into_windows(text, tokenizer, max_tokens=32)
+    assert len(windows) > 1
+    assert all(len(tokenizer(window, add_special_tokens=False)["input_ids"]) <= 32 for window in windows)
+    assert " ".join(windows) == text
+
+def test_split_into_windows_splits_overlong_sentences():
+    """
+    Test that a single sentence longer than the budget is split on word boundaries.
+    """
+    tokenizer = registry.get().tokenizer
+    sentence = "happy " * 100
+    windows = split_into_windows(sentence, tokenizer, max_tokens=16)
+    assert len(windows) > 1
+    assert " ".join(windows) == sentence.strip()
@@ -0,0 +1,77 @@
+import json
+import pytest
+from app.cli import iter_chunks, main, read_csv, read_jsonl, read_text
+
+def test_readers_stream_ids_and_texts(tmp_path):
+    """
+    Test that each input format yields (id, text, error) records, falling back to the row number as id.
+    """
+    jsonl = tmp_path / "input.jsonl"
+    jsonl.write_text('{"id": "a", "text": "Hello"}\n\n"Bare string"\n{"text": "No id"}\n')
+    assert list(read_jsonl(str(jsonl), "text", "id")) == [
+        ("a", "Hello", None), (1, "Bare string", None), (2, "No id", None)
+    ]
+
+    csv_file = tmp_path / "input.csv"
+    csv_file.write_text('message_id,body\nm1,"Hello, world"\nm2,Bye\n')
+    assert list(read_csv(str(csv_file), "body", "message_id")) == [
+        ("m1", "Hello, world", None), ("m2", "Bye", None)
+    ]
+
+    text = tmp_path / "input.txt"
+    text.write_text("First\n\nSecond\n")
+    assert list(read_text(str(text), "text", "id")) == [(0, "First", None), (1, "Second", None)]
+
+def test_iter_chunks():
+    """
+    Test that records are grouped into chunks of bounded size.
+    """
+    assert [len(chunk) for chunk in iter_chunks(((i, "x", None) for i in range(5)), 2)] == [2, 2, 1]
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_cli_scores_jsonl_file(tmp_path, processes):
+    """
+    Test that the CLI scores every line, in order, reporting invalid texts per item.
+    """
+    source = tmp_path / "input.jsonl"
+    source.write_text("".join(json.dumps({"id": i, "text": f"I am happy {i} times!"}) + "\n" for i in range(10))
+                      + '{"id": 10, "text": ""}\n')
+    output = tmp_path / "output.jsonl"
+
+    main([str(source), str(output), "--processes", str(processes), "--chunk-size", "3", "--top-k", "2"])
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record["id"] for record in records] == list(range(11))
+    assert all(record["status"] == "success" for record in records[:10])
+    assert len(records[0]["result"]["emotions"]) == 2
+    assert records[10]["status"] == "error"
+
+def test_cli_reports_corrupt_jsonl_lines(tmp_path):
+    """
+    Test that a line that is not valid JSON is written as an error row without stopping the run.
+    """
+    source = tmp_path / "input.jsonl"
+    source.write_text('{"id": "a", "text": "I am happy"}\n{"id": "b", "text": \n{"id": "c", "text": "So sad"}\n')
+    output = tmp_path / "output.jsonl"
+
+    main([str(source), str(output), "--chunk-size", "2"])
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [record["id"] for record in records] == ["a", 1, "c"]
+    assert [record["status"] for record in records] == ["success", "error", "success"]
+    assert records[1]["error"] == "The line is not valid JSON."
+
+def test_cli_writes_parquet(tmp_path):
+    """
+    Test that results can be written as Parquet.
+    """
+    parquet = pytest.importorskip("pyarrow.parquet")
+    source = tmp_path / "input.txt"
+    source.write_text("I love it\nI hate it\n")
+    output = tmp_path / "output.parquet"
+
+    main([str(source), str(output)])
+
+    table = parquet.read_table(str(output))
+    assert table.num_rows == 2
+    assert table.column("status").to_pylist() == ["success", "success"]
@@ -1,5 +1,5 @@
 import pytest
-from app.utils.exceptions import InferenceValidationError, ModelLoadingError, InferenceRuntimeError
+from app.utils.exceptions import InferenceValidationError, ModelLoadingError, InferenceRuntimeError, InferenceOverloadedError, ModelSwapInProgressError
 
 def test_inference_validation_error():
     """
@@ -29,3 +29,23 @@ def test_inference_runtime_error():
     """
     with pytest.raises(InferenceRuntimeError) as exc_info:
         raise InferenceRuntimeError("Inference failed")
+
+
+def test_inference_overloaded_error():
+    """
+    Test that the InferenceOverloadedError carries a 503 status code and a default message.
+    """
+    with pytest.raises(InferenceOverloadedError) as exc_info:
+        raise InferenceOverloadedError()
+    assert "overloaded" in exc_info.value.detail
+    assert exc_info.value.status_code == 503
+
+
+def test_model_swap_in_progress_error():
+    """
+    Test that the ModelSwapInProgressError carries a 409 status code and a default message.
+    """
+    with pytest.raises(ModelSwapInProgressError) as exc_info:
+        raise ModelSwapInProgressError()
+    assert "already being loaded" in exc_info.value.detail
+    assert exc_info.value.status_code == 409
@@ -0,0 +1,36 @@
+import threading
+import pytest
+from app.business_logic.executor import InferenceExecutor
+from app.utils.exceptions import InferenceOverloadedError
+
+def test_executor_runs_tasks():
+    """
+    Test that submitted tasks run on the pool and return their results.
+    """
+    executor = InferenceExecutor(max_workers=2, max_queue_size=2)
+    try:
+        futures = [executor.submit(pow, 2, n) for n in range(3)]
+        assert [future.result(timeout=5) for future in futures] == [1, 2, 4]
+        assert executor.pending == 0
+    finally:
+        executor.shutdown()
+
+def test_executor_rejects_tasks_when_saturated():
+    """
+    Test that the executor raises InferenceOverloadedError once workers and queue are full.
+    """
+    release = threading.Event()
+    executor = InferenceExecutor(max_workers=1, max_queue_size=1)
+    try:
+        running = executor.submit(release.wait, 5)
+        queued = executor.submit(release.wait, 5)
+        with pytest.raises(InferenceOverloadedError) as exc_info:
+            executor.submit(release.wait, 5)
+        assert exc_info.value.status_code == 503
+
+        release.set()
+        assert running.result(timeout=5) and queued.result(timeout=5)
+        assert executor.submit(pow, 2, 3).result(timeout=5) == 8
+    finally:
+        release.set()
+        executor.shutdown()
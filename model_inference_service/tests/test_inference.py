@@ -1,5 +1,10 @@
 import pytest
-from app.business_logic.inference import infer_emotion
+from app.business_logic import inference as inference_module
+from app.business_logic.inference import (
+    EMOTIONS, infer_emotion, infer_emotions_batch, infer_emotions_bulk, infer_emotion_long, swap_model, _encode, _pad
+)
+from app.business_logic.registry import registry
+from app.config.settings import settings
 from app.utils.exceptions import InferenceValidationError
 
 def test_infer_emotion_valid_text():
@@ -14,6 +19,17 @@ def test_infer_emotion_valid_text():
     assert len(result["emotions"]) > 0  # Ensure there are emotions in the response
     assert result["confidence"] > 0  # Ensure confidence is a positive number
 
+def test_infer_emotion_percentages_have_two_decimals():
+    """
+    Test that every returned percentage serializes with at most 2 decimals, for both scoring heads.
+    """
+    for scoring in ("softmax", "sigmoid"):
+        result = infer_emotion("I am very happy today!", top_k=28, scoring=scoring, threshold=0.0)
+        percentages = [item["percentage"] for item in result["emotions"] + result.get("labels", [])]
+        percentages.append(result["confidence"])
+        for percentage in percentages:
+            assert len(repr(percentage).split(".")[-1]) <= 2, percentage
+
 def test_infer_emotion_empty_text():
     """
     Test inference with empty text (expect InferenceValidationError).
@@ -32,3 +48,167 @@ def test_infer_emotion_handles_long_text():
     assert len(result["emotions"]) > 0  # Ensure emotions are returned
     assert result["confidence"] > 0  # Ensure confidence is valid
 
+def test_infer_emotions_batch_preserves_order():
+    """
+    Test that batched inference returns one result per text, matching single-text inference.
+    """
+    texts = ["I am very happy today!", "This is a very long text. " * 10, "I am sad"]
+    results = infer_emotions_batch(texts)
+    assert len(results) == len(texts)
+    for text, result in zip(texts, results):
+        single = infer_emotion(text)
+        assert result["predominant_emotion"] == single["predominant_emotion"]
+        assert result["confidence"] == pytest.approx(single["confidence"], abs=0.05)
+
+def test_infer_emotions_bulk_matches_batch_inference():
+    """
+    Test that bulk inference sorts internally but returns results in the original order.
+    """
+    texts = ["This is a very long text. " * 10, "I am sad", "", "I am very happy today!"]
+    outcomes = infer_emotions_bulk(texts, sub_batch_size=2, max_length=500)
+    assert [outcome["status"] for outcome in outcomes] == ["success", "success", "error", "success"]
+    expected = infer_emotions_batch([texts[0], texts[1], texts[3]])
+    for outcome, result in zip([outcomes[0], outcomes[1], outcomes[3]], expected):
+        assert outcome["result"]["predominant_emotion"] == result["predominant_emotion"]
+        assert outcome["result"]["confidence"] == pytest.approx(result["confidence"], abs=0.05)
+
+def test_infer_emotions_bulk_reports_tokenizer_failures_per_item(monkeypatch):
+    """
+    Test that a text the tokenizer rejects is reported as an error without failing the other texts.
+    """
+    encode = inference_module._encode
+
+    def failing_encode(model, texts):
+        if "\ufffe" in "".join(texts):
+            raise ValueError("The tokenizer rejected the text.")
+        return encode(model, texts)
+
+    monkeypatch.setattr(inference_module, "_encode", failing_encode)
+    outcomes = infer_emotions_bulk(["I am happy", "Broken \ufffe text", "I am sad"], sub_batch_size=2, max_length=500)
+    assert [outcome["status"] for outcome in outcomes] == ["success", "error", "success"]
+    assert outcomes[1]["error"] == "Tokenization failed: The tokenizer rejected the text."
+
+def test_model_is_loaded_in_eval_mode():
+    """
+    Test that the model is put in eval mode at load time so dropout is disabled.
+    """
+    assert registry.get().backend.model.training is False
+
+def test_infer_emotion_reports_tokens_and_honors_max_tokens(monkeypatch):
+    """
+    Test that texts are truncated to MAX_TOKENS and that the processed token count is reported.
+    """
+    assert infer_emotion("I am very happy today!")["tokens"] > 2
+
+    monkeypatch.setattr(settings, "MAX_TOKENS", 32)
+    result = infer_emotion("This is a very long text. " * 100)
+    assert result["tokens"] == 32
+
+def test_batches_are_padded_to_length_buckets(monkeypatch):
+    """
+    Test that a batch is padded to the smallest bucket fitting its longest text.
+    """
+    monkeypatch.setattr(settings, "SEQUENCE_LENGTH_BUCKETS", [16, 64])
+    model = registry.get()
+    encodings = _encode(model, ["I am happy", "This is a very long text. " * 3])
+    assert max(len(ids) for ids in encodings["input_ids"]) <= 64
+    assert _pad(model, encodings)["input_ids"].shape[1] == 64
+    assert _pad(model, _encode(model, ["happy"]))["input_ids"].shape[1] == 16
+
+def test_infer_emotion_top_k():
+    """
+    Test that top_k controls how many emotions are returned, in descending order.
+    """
+    result = infer_emotion("I am very happy today!", top_k=3)
+    percentages = [emotion["percentage"] for emotion in result["emotions"]]
+    assert len(percentages) == 3
+    assert percentages == sorted(percentages, reverse=True)
+    assert result["confidence"] == percentages[0]
+    assert len(infer_emotion("I am very happy today!", top_k=28)["emotions"]) == 28
+
+def test_infer_emotions_batch_per_text_top_k():
+    """
+    Test that a batch can mix different top_k values, and that invalid values are rejected.
+    """
+    results = infer_emotions_batch(["I am happy", "I am sad"], [1, 7])
+    assert [len(result["emotions"]) for result in results] == [1, 7]
+    with pytest.raises(InferenceValidationError):
+        infer_emotions_batch(["I am happy"], 0)
+
+def test_infer_emotion_long_aggregations(monkeypatch):
+    """
+    Test that long texts are scored in windows and aggregated with every strategy.
+    """
+    monkeypatch.setattr(settings, "MAX_TOKENS", 32)
+    text = "I am very happy today! " * 20 + "This is a very long text. " * 20
+    for aggregation in ("mean", "max", "weighted"):
+        result = infer_emotion_long(text, aggregation=aggregation)
+        assert result["windows"] > 1
+        assert result["tokens"] > 32
+        assert len(result["emotions"]) == 5
+        assert 0 < result["confidence"] <= 100
+
+    with pytest.raises(InferenceValidationError):
+        infer_emotion_long(text, aggregation="median")
+
+def test_infer_emotions_batch_full_probabilities():
+    """
+    Test that the full probability vector is returned only for the texts that ask for it, ordered as EMOTIONS.
+    """
+    with_vector, without_vector = infer_emotions_batch(
+        ["I am very happy today!", "This is so sad."], top_k=1, include_probabilities=[True, False]
+    )
+    probabilities = with_vector["probabilities"]
+    assert len(probabilities) == len(EMOTIONS)
+    assert sum(probabilities) == pytest.approx(1.0, abs=1e-4)
+    assert EMOTIONS[probabilities.index(max(probabilities))] == with_vector["predominant_emotion"]
+    assert "probabilities" not in without_vector
+
+def test_infer_emotions_batch_sigmoid_scoring():
+    """
+    Test that the sigmoid head scores emotions independently and reports every emotion above threshold.
+    """
+    texts = ["I am very happy today!", "This is so sad.", "What a surprise!"]
+    everything, nothing, softmax = infer_emotions_batch(
+        texts, include_probabilities=True, scoring=["sigmoid", "sigmoid", "softmax"], threshold=[0.0, 1.0, None]
+    )
+    assert everything["scoring"] == "sigmoid"
+    assert len(everything["labels"]) == len(EMOTIONS)
+    percentages = [label["percentage"] for label in everything["labels"]]
+    assert percentages == sorted(percentages, reverse=True)
+    assert everything["labels"][0]["emotion"] == everything["predominant_emotion"]
+    assert sum(everything["probabilities"]) != pytest.approx(1.0, abs=1e-3)
+
+    assert nothing["labels"] == []
+    assert softmax["scoring"] == "softmax"
+    assert "labels" not in softmax
+    assert sum(softmax["probabilities"]) == pytest.approx(1.0, abs=1e-4)
+
+    with pytest.raises(InferenceValidationError):
+        infer_emotions_batch(texts[:1], scoring="tanh")
+    with pytest.raises(InferenceValidationError):
+        infer_emotions_batch(texts[:1], scoring="sigmoid", threshold=1.5)
+
+def test_sigmoid_per_emotion_thresholds(monkeypatch):
+    """
+    Test that per-emotion thresholds override the global sigmoid threshold.
+    """
+    monkeypatch.setattr(settings, "SIGMOID_THRESHOLD", 1.0)
+    monkeypatch.setattr(settings, "SIGMOID_THRESHOLDS", {"joy": 0.0})
+    result = infer_emotion("I am very happy today!", scoring="sigmoid")
+    assert [label["emotion"] for label in result["labels"]] == ["joy"]
+
+def test_swap_model_serves_new_version_and_drains_previous():
+    """
+    Test that a swapped-in version serves new requests and the previous one is released.
+    """
+    previous = registry.get()
+    try:
+        swap_model(settings.MODEL_NAME, version="v2")
+        assert registry.get() is not previous
+        assert registry.version == "v2"
+        assert previous.in_flight == 0
+        assert infer_emotion("I am very happy today!")["model_version"] == "v2"
+    finally:
+        swap_model(settings.MODEL_NAME, version=previous.version)
+    assert infer_emotion("I am very happy today!")["model_version"] == previous.version
@@ -0,0 +1,27 @@
+import json
+from pathlib import Path
+import pytest
+from app.utils.normalizer import NORMALIZER_VERSION, normalize_text
+
+# Test vectors of the normalization contract, shared verbatim by both services
+CONTRACT = json.loads((Path(__file__).parent / "normalizer_vectors.json").read_text(encoding="utf-8"))
+
+def test_normalizer_version_matches_contract():
+    """
+    Test that the normalizer implements the version of the contract the vectors were written for.
+    """
+    assert NORMALIZER_VERSION == CONTRACT["version"]
+
+@pytest.mark.parametrize("vector", CONTRACT["vectors"], ids=lambda vector: repr(vector["input"]))
+def test_normalizer_contract_vectors(vector):
+    """
+    Test that the normalizer produces the canonical text expected by the contract.
+    """
+    assert normalize_text(vector["input"], lowercase=vector["lowercase"]) == vector["expected"]
+
+def test_normalizer_is_idempotent():
+    """
+    Test that normalizing canonical text again leaves it unchanged, as the inference service does with it.
+    """
+    for vector in CONTRACT["vectors"]:
+        assert normalize_text(vector["expected"], lowercase=vector["lowercase"]) == vector["expected"]
@@ -0,0 +1,142 @@
+import os
+import pytest
+import torch
+from types import SimpleNamespace
+from app.business_logic import registry as registry_module
+from app.business_logic.registry import ModelRegistry, SAFETENSORS_WEIGHTS, prepare_safetensors_checkpoint, registry
+from app.config.settings import settings
+from app.utils.exceptions import ModelLoadingError, ModelSwapInProgressError
+
+def test_registry_does_not_load_on_creation():
+    """
+    Test that creating a registry does not load any weights.
+    """
+    new_registry = ModelRegistry("does-not-matter", "pytorch")
+    assert not new_registry.loaded
+    assert not new_registry.ready
+
+def test_registry_loads_from_local_directory(tmp_path):
+    """
+    Test that a local directory configured as the model name is loaded without network access.
+    """
+    model = registry.get()
+    model.tokenizer.save_pretrained(tmp_path)
+    model.backend.model.save_pretrained(tmp_path)
+
+    local_registry = ModelRegistry(str(tmp_path), "pytorch")
+    loaded = local_registry.load()
+    assert local_registry.loaded
+    assert loaded.name == str(tmp_path)
+    assert local_registry.get() is loaded
+
+def test_registry_reports_load_failures(tmp_path):
+    """
+    Test that a failed load raises ModelLoadingError and records the error for /ready.
+    """
+    broken_registry = ModelRegistry(str(tmp_path), "pytorch")
+    with pytest.raises(ModelLoadingError):
+        broken_registry.load()
+    assert not broken_registry.loaded
+    assert broken_registry.error.startswith("Failed to load model")
+
+def test_registry_fails_fast_after_a_failed_load(tmp_path, monkeypatch):
+    """
+    Test that, once a load has failed, requests raise at once instead of loading again.
+    """
+    broken_registry = ModelRegistry(str(tmp_path), "pytorch")
+    with pytest.raises(ModelLoadingError):
+        broken_registry.load()
+
+    monkeypatch.setattr(broken_registry, "_load_model", lambda *args, **kwargs: pytest.fail("Load retried by a request"))
+    with pytest.raises(ModelLoadingError) as exc_info:
+        broken_registry.get()
+    assert exc_info.value.detail == broken_registry.error
+
+def test_registry_loads_fast_tokenizer():
+    """
+    Test that the Rust-backed fast tokenizer is loaded.
+    """
+    assert registry.get().tokenizer.is_fast
+
+def test_registry_rejects_slow_tokenizer(monkeypatch):
+    """
+    Test that loading fails when only the slow Python tokenizer is available.
+    """
+    slow_tokenizer = SimpleNamespace(is_fast=False)
+    monkeypatch.setattr(registry_module.AutoTokenizer, "from_pretrained", lambda *args, **kwargs: slow_tokenizer)
+    slow_registry = ModelRegistry(settings.MODEL_NAME, "pytorch")
+    with pytest.raises(ModelLoadingError):
+        slow_registry.load()
+    assert "fast tokenizer" in slow_registry.error
+
+def test_prepare_safetensors_checkpoint_converts_once(tmp_path):
+    """
+    Test that the checkpoint is converted to safetensors once and reused afterwards.
+    """
+    target = prepare_safetensors_checkpoint(settings.MODEL_NAME, str(tmp_path))
+    weights = os.path.join(target, SAFETENSORS_WEIGHTS)
+    assert os.path.isfile(weights)
+    assert os.path.isfile(os.path.join(target, "tokenizer_config.json"))
+
+    modified = os.path.getmtime(weights)
+    assert prepare_safetensors_checkpoint(settings.MODEL_NAME, str(tmp_path)) == target
+    assert os.path.getmtime(weights) == modified
+
+def test_prepare_safetensors_checkpoint_reconverts_changed_source(tmp_path):
+    """
+    Test that updating a local model directory forces a new conversion instead of reusing the old one.
+    """
+    source = tmp_path / "model"
+    model = registry.get()
+    model.tokenizer.save_pretrained(source)
+    model.backend.model.save_pretrained(source)
+
+    first = prepare_safetensors_checkpoint(str(source), str(tmp_path / "converted"))
+    assert prepare_safetensors_checkpoint(str(source), str(tmp_path / "converted")) == first
+
+    # Retrain: same directory, different weights
+    retrained = registry_module.AutoModelForSequenceClassification.from_pretrained(str(source))
+    with torch.no_grad():
+        retrained.classifier.bias.add_(1.0)
+    retrained.save_pretrained(source)
+
+    second = prepare_safetensors_checkpoint(str(source), str(tmp_path / "converted"))
+    assert second != first
+    reloaded = registry_module.AutoModelForSequenceClassification.from_pretrained(second)
+    assert torch.equal(reloaded.classifier.bias, retrained.classifier.bias)
+
+def test_registry_loads_converted_checkpoint(tmp_path):
+    """
+    Test that the registry loads the safetensors copy and records its startup timings.
+    """
+    test_registry = ModelRegistry(settings.MODEL_NAME, "pytorch", checkpoint_dir=str(tmp_path))
+    model = test_registry.load()
+    assert model.name.startswith(str(tmp_path))
+    assert {"checkpoint", "tokenizer", "weights"} <= set(test_registry.timings)
+
+def test_loaded_model_tracks_forward_passes_in_flight():
+    """
+    Test that a model reports forward passes in flight and becomes idle once they finish.
+    """
+    model = registry.get()
+    with model.in_use():
+        assert model.in_flight == 1
+        assert not model.wait_idle(timeout=0.01)
+    assert model.in_flight == 0
+    assert model.wait_idle(timeout=0.01)
+
+def test_registry_rejects_concurrent_swaps():
+    """
+    Test that a second swap cannot start while one is running, and that activation switches the version.
+    """
+    swap_registry = ModelRegistry(settings.MODEL_NAME, "pytorch")
+    swap_registry.begin_swap("v2")
+    with pytest.raises(ModelSwapInProgressError):
+        swap_registry.begin_swap("v3")
+
+    model = swap_registry.load_version(settings.MODEL_NAME, "pytorch", version="v2")
+    assert swap_registry.activate(model, settings.MODEL_NAME, "pytorch") is None
+    swap_registry.end_swap()
+    assert swap_registry.get() is model
+    assert swap_registry.identity.endswith(":v2")
+    assert swap_registry.status()["swapping"] is None
@@ -1,5 +1,10 @@
+import json
+import time
 from fastapi.testclient import TestClient
+from app.business_logic.registry import LoadedModel, registry
+from app.config.settings import settings
 from app.main import app
+from app.utils.exceptions import ModelLoadingError
 
 client = TestClient(app)
 
@@ -43,3 +48,214 @@ def test_inference_route_text_too_long():
     assert "detail" in json_data
     # Check for specific error message related to length
     assert "The string length should not exceed 500 characters" in str(json_data["detail"])
+
+def test_batch_inference_route_valid():
+    """
+    Test the batch inference route returns one result per text in request order.
+    """
+    texts = ["I am very happy today!", "This is a very long text. " * 10, "I am sad"]
+    response = client.post("/api/inference/batch", json={"texts": texts})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["index"] for item in results] == [0, 1, 2]
+    assert all(item["status"] == "success" for item in results)
+    assert all("predominant_emotion" in item["result"] for item in results)
+
+def test_batch_inference_route_reports_item_errors():
+    """
+    Test that invalid texts are reported per item without failing the whole batch.
+    """
+    response = client.post("/api/inference/batch", json={"texts": ["I am happy", "   ", "a" * 501]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["status"] == "success"
+    assert results[1]["status"] == "error"
+    assert results[1]["error"] == "The value must be a non-empty string."
+    assert results[2]["status"] == "error"
+    assert "The string length should not exceed 500 characters" in results[2]["error"]
+
+def test_batch_inference_route_empty_list():
+    """
+    Test the batch inference route with an empty list of texts (should return 422).
+    """
+    response = client.post("/api/inference/batch", json={"texts": []})
+    assert response.status_code == 422
+
+def test_ready_route_after_startup():
+    """
+    Test that /ready turns green once the lifespan has loaded and warmed up the model.
+    """
+    with TestClient(app) as lifespan_client:
+        for _ in range(100):
+            response = lifespan_client.get("/ready")
+            if response.status_code == 200:
+                break
+            time.sleep(0.1)
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert lifespan_client.get("/health").status_code == 200
+
+def test_ready_route_recovers_from_a_failed_startup_load(monkeypatch):
+    """
+    Test that the lifespan retries a failed startup load and that /ready turns green once it succeeds.
+    """
+    model = registry.get()
+    attempts = []
+
+    def flaky_load(*args, **kwargs):
+        attempts.append(args)
+        if len(attempts) == 1:
+            raise ModelLoadingError("Failed to load model: the hub is unreachable.")
+        return model
+
+    monkeypatch.setattr(registry, "_load_model", flaky_load)
+    monkeypatch.setattr(registry, "_model", None)
+    monkeypatch.setattr(registry, "_ready", False)
+    monkeypatch.setattr(settings, "MODEL_LOAD_RETRY_SECONDS", 0.2)
+
+    with TestClient(app) as lifespan_client:
+        for _ in range(100):
+            response = lifespan_client.get("/ready")
+            if response.status_code == 200:
+                break
+            time.sleep(0.05)
+        assert response.status_code == 200
+        assert lifespan_client.post("/api/inference", json={"text": "I am very happy today!"}).status_code == 200
+    assert len(attempts) == 2
+    assert registry.error is None
+
+def test_cache_stats_route_counts_repeated_texts():
+    """
+    Test that repeating a text is served from the cache and reflected in the statistics.
+    """
+    before = client.get("/api/cache/stats").json()
+    text = "A text that is only used by the cache statistics test."
+    first = client.post("/api/inference", json={"text": text})
+    second = client.post("/api/inference", json={"text": text + "  "})
+    assert first.json() == second.json()
+
+    after = client.get("/api/cache/stats").json()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+def test_inference_route_top_k():
+    """
+    Test that the top_k request field limits the number of returned emotions.
+    """
+    response = client.post("/api/inference", json={"text": "I am very happy today!", "top_k": 2})
+    assert response.status_code == 200
+    assert len(response.json()["emotions"]) == 2
+    assert client.post("/api/inference", json={"text": "I am happy", "top_k": 29}).status_code == 422
+
+def test_inference_route_long_text():
+    """
+    Test that long-text mode accepts texts beyond the 500 character limit.
+    """
+    long_text = "I am very happy today! This is a very long text. " * 30
+    response = client.post("/api/inference", json={"text": long_text, "long_text": True, "aggregation": "weighted"})
+    assert response.status_code == 200
+    json_data = response.json()
+    assert json_data["windows"] >= 1
+    assert "predominant_emotion" in json_data
+
+def test_streaming_inference_route():
+    """
+    Test that an NDJSON body is scored and streamed back as NDJSON, one record per line.
+    """
+    def body():
+        yield b'{"id": "a", "text": "I am very happy today!"}\n'
+        yield b'"This is so sad."\n"'
+        yield b'"\n'
+
+    response = client.post("/api/inference/stream?top_k=3", content=body())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["index"] for record in records] == [0, 1, 2]
+    assert records[0]["id"] == "a"
+    assert records[0]["status"] == "success"
+    assert len(records[0]["result"]["emotions"]) == 3
+    assert records[2]["status"] == "error"
+
+def test_inference_route_full_probabilities():
+    """
+    Test that the probability vector is returned on request and matches the order of /api/emotions.
+    """
+    emotions = client.get("/api/emotions").json()["emotions"]
+    assert len(emotions) == 28
+
+    response = client.post("/api/inference", json={"text": "What a lovely day!", "include_probabilities": True})
+    assert response.status_code == 200
+    json_data = response.json()
+    probabilities = json_data["probabilities"]
+    assert len(probabilities) == 28
+    assert emotions[probabilities.index(max(probabilities))] == json_data["predominant_emotion"]
+
+    response = client.post("/api/inference", json={"text": "What a lovely day!"})
+    assert response.json()["probabilities"] is None
+
+def test_inference_route_sigmoid_scoring():
+    """
+    Test that the sigmoid scoring head returns the emotions above the requested threshold.
+    """
+    response = client.post("/api/inference", json={"text": "I love this!", "scoring": "sigmoid", "threshold": 0.0})
+    assert response.status_code == 200
+    json_data = response.json()
+    assert json_data["scoring"] == "sigmoid"
+    assert len(json_data["labels"]) == 28
+
+    response = client.post("/api/inference", json={"text": "I love this!", "scoring": "sigmoid", "threshold": 2})
+    assert response.status_code == 422
+
+def test_admin_routes_are_disabled_without_token(monkeypatch):
+    """
+    Test that the admin endpoints reject every request, even without a token header, while ADMIN_TOKEN is unset.
+    """
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", None)
+    version = registry.version
+    response = client.post("/api/admin/model", json={"model_name": "attacker/model", "version": "evil"},
+                           headers={"X-Admin-Token": ""})
+    assert response.status_code == 404
+    assert client.get("/api/admin/model").status_code == 404
+    assert registry.version == version
+    assert registry.status()["swapping"] is None
+
+def test_admin_model_swap_route(monkeypatch):
+    """
+    Test that the admin endpoint swaps the model version in the background and reports it.
+    """
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    assert client.get("/api/admin/model").status_code == 401
+    assert client.get("/api/admin/model", headers={"X-Admin-Token": "wrong"}).status_code == 401
+    headers = {"X-Admin-Token": "secret"}
+
+    original = client.get("/api/admin/model", headers=headers).json()
+    assert original["swapping"] is None
+
+    response = client.post("/api/admin/model", json={"model_name": original["model_name"], "backend": "tpu"},
+                           headers=headers)
+    assert response.status_code == 422
+
+    # The new version reuses the loaded tokenizer and weights, so the swap never reaches the hub
+    active, onnx_path = registry.get(), registry.onnx_path
+    monkeypatch.setattr(registry, "_load_model", lambda model_name, backend_name, onnx_path, version, timings:
+                        LoadedModel(model_name, active.tokenizer, active.backend, version=version))
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+
+    try:
+        response = client.post("/api/admin/model", json={"model_name": original["model_name"], "version": "v2"},
+                               headers=headers)
+        assert response.status_code == 202
+        deadline = time.monotonic() + 30
+        while registry.swapping is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        status = client.get("/api/admin/model", headers=headers).json()
+        assert status["swapping"] is None, "The swap did not finish in time"
+        assert status["version"] == "v2"
+        assert status["swap_error"] is None
+        assert client.post("/api/inference", json={"text": "Swapped!"}).json()["model_version"] == "v2"
+    finally:
+        # Let a swap still running finish, then put the original model back in place
+        while registry.swapping is not None:
+            time.sleep(0.05)
+        registry.activate(active, original["model_name"], original["backend"], onnx_path)
@@ -0,0 +1,41 @@
+import gc
+import os
+import runpy
+import torch
+from types import SimpleNamespace
+from app.business_logic.registry import registry
+
+# Hooks of the multi-worker serving mode
+CONFIG = runpy.run_path(os.path.join(os.path.dirname(__file__), "..", "gunicorn.conf.py"))
+
+def test_gunicorn_config_preloads_app():
+    """
+    Test that the application is imported in the master process.
+    """
+    assert CONFIG["preload_app"] is True
+    assert CONFIG["worker_class"] == "uvicorn.workers.UvicornWorker"
+
+def test_on_starting_loads_model_and_freezes_gc():
+    """
+    Test that the master loads the model and freezes the objects created so far.
+    """
+    try:
+        CONFIG["on_starting"](None)
+        assert registry.loaded
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+def test_post_fork_splits_threads_between_workers():
+    """
+    Test that each forked worker gets a share of the CPU budget.
+    """
+    num_threads = torch.get_num_threads()
+    messages = []
+    server = SimpleNamespace(log=SimpleNamespace(info=messages.append))
+    try:
+        CONFIG["post_fork"](server, SimpleNamespace(pid=1234))
+        assert torch.get_num_threads() >= 1
+        assert "1234" in messages[0]
+    finally:
+        torch.set_num_threads(num_threads)
@@ -0,0 +1,54 @@
+import asyncio
+import json
+from app.business_logic.streaming import iter_lines, parse_entry, stream_inference
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+def test_iter_lines_joins_lines_split_across_chunks():
+    """
+    Test that lines are reassembled across chunk boundaries, the last one without a line break.
+    """
+    lines = asyncio.run(_collect(iter_lines(_chunks(b'"a"\n"b', b'c"\n', b'"d"'), max_line_bytes=100)))
+    assert lines == [b'"a"', b'"bc"', b'"d"']
+
+def test_iter_lines_discards_overlong_lines():
+    """
+    Test that a line longer than the limit is reported as None without being buffered.
+    """
+    lines = asyncio.run(_collect(iter_lines(_chunks(b"x" * 8, b"x" * 8, b'\n"ok"\n'), max_line_bytes=10)))
+    assert lines == [None, b'"ok"']
+
+def test_parse_entry_formats():
+    """
+    Test that lines may be JSON strings or objects with a text and an id, and that invalid lines are reported.
+    """
+    assert parse_entry(0, b'"hello"') == {"index": 0, "text": "hello"}
+    assert parse_entry(1, b'{"id": "m1", "text": "hi"}') == {"index": 1, "id": "m1", "text": "hi"}
+    assert "error" in parse_entry(2, b"not json")
+    assert "error" in parse_entry(3, b'{"id": 4}')
+    assert "error" in parse_entry(4, None)
+
+def test_stream_inference_scores_in_batches_and_keeps_order():
+    """
+    Test that lines are scored in bounded batches and results come back in input order.
+    """
+    batches = []
+
+    async def score(texts):
+        batches.append(list(texts))
+        return [{"status": "success", "result": text.upper()} for text in texts]
+
+    body = b'"a"\n\n{"id": 7, "text": "b"}\nbroken\n"c"\n"d"\n'
+    output = asyncio.run(_collect(stream_inference(_chunks(body), score, batch_size=2, max_line_bytes=100)))
+    records = [json.loads(line) for line in b"".join(output).splitlines()]
+
+    assert batches == [["a", "b"], ["c"], ["d"]]
+    assert [record["index"] for record in records] == [0, 1, 2, 3, 4]
+    assert records[1] == {"index": 1, "id": 7, "status": "success", "result": "B"}
+    assert records[2]["status"] == "error"
+    assert records[4]["result"] == "D"
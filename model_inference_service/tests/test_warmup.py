@@ -0,0 +1,33 @@
+from app.business_logic.inference import _warm_up_lengths
+from app.business_logic.registry import registry
+from app.business_logic.warmup import run_warm_up
+from app.config.settings import settings
+
+def test_run_warm_up_measures_every_bucket():
+    """
+    Test that the warm-up runs and times every (sequence length, batch size) bucket.
+    """
+    latencies = run_warm_up(registry.get(), sequence_lengths=[16, 32], batch_sizes=[1, 4], iterations=1)
+    assert set(latencies) == {(16, 1), (16, 4), (32, 1), (32, 4)}
+    assert all(latency > 0 for latency in latencies.values())
+
+def test_run_warm_up_caps_lengths_to_the_model_maximum():
+    """
+    Test that sequence lengths above the model maximum are clamped instead of failing.
+    """
+    model = registry.get()
+    latencies = run_warm_up(model, sequence_lengths=[100000], batch_sizes=[1], iterations=1)
+    assert list(latencies) == [(model.tokenizer.model_max_length, 1)]
+
+def test_warm_up_lengths_cover_every_padding_bucket(monkeypatch):
+    """
+    Test that the warm-up exercises every length a batch can be padded to, the largest bucket included.
+    """
+    model = registry.get()
+    monkeypatch.setattr(settings, "SEQUENCE_LENGTH_BUCKETS", [16, 64, 512])
+    monkeypatch.setattr(settings, "MAX_TOKENS", 512)
+    assert _warm_up_lengths(model) == [16, 64, 512]
+
+    # Buckets above the token budget are capped, and the budget itself is warmed
+    monkeypatch.setattr(settings, "MAX_TOKENS", 100)
+    assert _warm_up_lengths(model) == [16, 64, 100]
@@ -1,6 +1,11 @@
 from fastapi import APIRouter, HTTPException
-from app.business_logic.analyzer import analyze_tone
-from app.models.schemas import ToneAnalysisRequest, ToneAnalysisResponse
+from app.business_logic.analyzer import MAX_TEXT_LENGTH, analyze_tone, analyze_tones
+from app.business_logic.cache import result_cache
+from app.config.settings import settings
+from app.models.schemas import (
+    ToneAnalysisRequest, ToneAnalysisResponse, BatchToneAnalysisRequest, BatchToneAnalysisItem, BatchToneAnalysisResponse,
+    CacheStatsResponse
+)
 from app.utils.validators import validate_non_empty_string, validate_string_length
 from app.utils.exceptions import ToneValidationError, ToneProcessingError
 from app.config.logger import get_logger
@@ -34,14 +39,14 @@ async def analyze(request: ToneAnalysisRequest):
     # Custom validation
     try:
         validate_non_empty_string(request.text)  # Validate that the text is not empty
-        validate_string_length(request.text, 500)  # Validate that the text does not exceed 500 characters
+        validate_string_length(request.text, MAX_TEXT_LENGTH)  # Validate that the text does not exceed 500 characters
     except ToneValidationError as e:
         logger.error(f"Validation error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
     try:
         # Perform tone analysis
-        result = analyze_tone(request.text)
+        result = await analyze_tone(request.text)
         logger.info(f"Tone analysis successful for text: {request.text[:50]}...")
         return ToneAnalysisResponse(
             emotions=result["emotions"],
@@ -54,3 +59,52 @@ async def analyze(request: ToneAnalysisRequest):
     except Exception as e:
         logger.error(f"Unexpected error during tone analysis: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@router.post("/analyze/batch", response_model=BatchToneAnalysisResponse)
+async def analyze_batch(request: BatchToneAnalysisRequest):
+    """
+    Endpoint to analyze the tone of several texts in a single call.
+
+    The texts are forwarded to the inference service together, and invalid texts
+    are reported individually instead of failing the whole batch.
+
+    Args:
+        request (BatchToneAnalysisRequest): The request body containing the texts to be analyzed.
+
+    Returns:
+        BatchToneAnalysisResponse: One result or error per text, in request order.
+
+    Raises:
+        HTTPException: If the batch is too large or if the inference service cannot analyze it.
+    """
+    logger.info(f"Received request to analyze the tone of {len(request.texts)} texts")
+
+    if len(request.texts) > settings.ANALYZE_BATCH_MAX_TEXTS:
+        logger.error(f"Batch rejected: {len(request.texts)} texts exceed the limit")
+        raise HTTPException(
+            status_code=422,
+            detail=f"A batch should not contain more than {settings.ANALYZE_BATCH_MAX_TEXTS} texts. "
+                   f"Given: {len(request.texts)}"
+        )
+
+    try:
+        outcomes = await analyze_tones(request.texts, MAX_TEXT_LENGTH)
+        return BatchToneAnalysisResponse(
+            results=[BatchToneAnalysisItem(index=index, **outcome) for index, outcome in enumerate(outcomes)]
+        )
+    except ToneProcessingError as e:
+        logger.error(f"Processing error: {e}")
+        raise HTTPException(status_code=500, detail="Error during tone analysis")
+    except Exception as e:
+        logger.error(f"Unexpected error during batch tone analysis: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+@router.get("/cache/stats", response_model=CacheStatsResponse)
+async def cache_stats():
+    """
+    Endpoint to inspect the result cache placed in front of the inference service.
+
+    Returns:
+        CacheStatsResponse: The cache size and its hit, miss and eviction counters.
+    """
+    return CacheStatsResponse(**result_cache.stats())
@@ -1,20 +1,44 @@
-import requests
+import asyncio
+from typing import List, Optional, Union
+import httpx
+from app.business_logic.cache import result_cache
+from app.business_logic.client import inference_client
+from app.business_logic.preprocessing import pipeline
 from app.config.logger import get_logger
 from app.config.settings import settings
-from app.utils.validators import validate_non_empty_string
+from app.utils.normalizer import normalize_text
+from app.utils.validators import validate_non_empty_string, validate_string_length
 from app.utils.exceptions import ToneValidationError, ToneProcessingError
 
 # Create a logger for this module
 logger = get_logger(__name__)
 
-INFERENCE_SERVICE_URL = f"http://{settings.MODEL_INFERENCE_SERVICE_HOST}:{settings.MODEL_INFERENCE_SERVICE_PORT}/api/inference"
+INFERENCE_SERVICE_PATH = "/api/inference"
+INFERENCE_SERVICE_BATCH_PATH = "/api/inference/batch"
+
+# Maximum number of characters of an analyzed text, as accepted by the inference service
+MAX_TEXT_LENGTH = 500
 
 def preprocess_text(text: str) -> str:
     """
     Preprocess the input text before sending it to the inference service.
+
+    The text goes through the stages configured by PREPROCESSING_STAGES, in order,
+    then through the normalizer shared with the inference service, so the text sent
+    and the keys of both result caches are the same canonical text. Case is kept by
+    default: the GoEmotions model is cased.
+
+    Masking stages can make a text longer than it was when its length was checked,
+    so the result is cut back to MAX_TEXT_LENGTH, at a word boundary when possible.
     """
     validate_non_empty_string(text)  # Validate input
-    processed_text = text.lower().strip()  # Lowercase and strip whitespace
+    processed_text = normalize_text(pipeline(text), lowercase=settings.NORMALIZER_LOWERCASE)
+    if len(processed_text) > MAX_TEXT_LENGTH:
+        truncated = processed_text[:MAX_TEXT_LENGTH + 1]
+        # Drop the last, possibly cut, word (e.g. a partial "[URL]" placeholder)
+        truncated = truncated.rsplit(" ", 1)[0] if " " in truncated else truncated
+        processed_text = truncated[:MAX_TEXT_LENGTH].rstrip()
+        logger.debug(f"Preprocessed text truncated to {len(processed_text)} characters")
     logger.debug(f"Preprocessed text: {processed_text}")
     return processed_text
 
@@ -30,33 +54,162 @@ def postprocess_results(results: dict) -> dict:
     logger.debug(f"Postprocessed results: {results}")
     return results
 
-def analyze_tone(text: str) -> dict:
+async def _post_inference(path: str, payload: dict) -> httpx.Response:
+    """
+    Send a request to the inference service through the shared pooled client.
+
+    Raises:
+        ToneProcessingError: If the service cannot be reached or does not answer in time.
+    """
+    logger.info(f"Calling inference service at {inference_client.base_url}{path}")
+    try:
+        return await inference_client.client.post(path, json=payload)
+    except httpx.TimeoutException as e:
+        logger.error(f"Timeout during tone analysis: {e!r}")
+        raise ToneProcessingError(f"Inference service timed out: {e!r}")
+    except httpx.HTTPError as e:
+        logger.error(f"Request error during tone analysis: {e}")
+        raise ToneProcessingError(f"Failed to connect to inference service: {e}")
+
+async def _infer_text(preprocessed_text: str) -> dict:
+    """
+    Run the inference of a single preprocessed text.
+
+    Raises:
+        ToneProcessingError: If the inference service fails or returns an error.
+    """
+    response = await _post_inference(INFERENCE_SERVICE_PATH, {"text": preprocessed_text})
+
+    if response.status_code != 200:
+        logger.error(f"Inference service returned an error: {response.status_code}")
+        raise ToneProcessingError(f"Inference service error: {response.status_code}")
+
+    inference_results = response.json()
+    logger.info(f"Inference service returned: {inference_results}")
+    return inference_results
+
+async def analyze_tone(text: str) -> dict:
     """
     Analyze the tone of the input text using the inference service.
+
+    The call goes through the shared pooled client, so the event loop keeps serving
+    other requests while the model runs and the connection is reused afterwards.
     """
     try:
         # Preprocess the text
         preprocessed_text = preprocess_text(text)
 
-        # Send a request to the inference service
-        logger.info(f"Calling inference service at {INFERENCE_SERVICE_URL}")
-        response = requests.post(INFERENCE_SERVICE_URL, json={"text": preprocessed_text})
+        # Send a request to the inference service, unless the same text was analyzed recently
+        inference_results = await result_cache.get_or_compute(
+            preprocessed_text, lambda: _infer_text(preprocessed_text)
+        )
 
-        if response.status_code != 200:
-            logger.error(f"Inference service returned an error: {response.status_code}")
-            raise ToneProcessingError(f"Inference service error: {response.status_code}")
+        # Postprocess a copy of the inference results, which may be shared through the cache
+        return postprocess_results(dict(inference_results))
 
-        # Postprocess the inference results
-        inference_results = response.json()
-        logger.info(f"Inference service returned: {inference_results}")
-        return postprocess_results(inference_results)
-
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request error during tone analysis: {e}")
-        raise ToneProcessingError(f"Failed to connect to inference service: {e}")
     except ToneValidationError as e:
         logger.error(f"Validation error: {e}")
         raise e
+    except ToneProcessingError:
+        raise
     except Exception as e:
         logger.error(f"Unexpected error during tone analysis: {e}")
-        raise ToneProcessingError(f"Error during tone analysis: {e}")
\ No newline at end of file
+        raise ToneProcessingError(f"Error during tone analysis: {e}")
+
+def _outcome(result: Optional[dict] = None, error: Optional[str] = None) -> dict:
+    """
+    Build the outcome of one text of a batch: either its postprocessed result or its error.
+    """
+    if error is not None:
+        return {"status": "error", "result": None, "error": error}
+    return {"status": "success", "result": result, "error": None}
+
+async def _infer_fan_out(texts: List[str]) -> List[Union[dict, ToneProcessingError]]:
+    """
+    Run the inference of each text with its own call, at most INFERENCE_FANOUT_CONCURRENCY at a time.
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.INFERENCE_FANOUT_CONCURRENCY))
+
+    async def infer(text: str) -> Union[dict, ToneProcessingError]:
+        async with semaphore:
+            try:
+                return await _infer_text(text)
+            except ToneProcessingError as e:
+                return e
+
+    return await asyncio.gather(*(infer(text) for text in texts))
+
+async def _infer_batch(texts: List[str]) -> List[Union[dict, ToneProcessingError]]:
+    """
+    Run the inference of preprocessed texts in a single call to the batch inference endpoint.
+
+    Falls back to one concurrent call per text when the batch endpoint is disabled
+    or the inference service does not provide it.
+
+    Returns:
+        List[Union[dict, ToneProcessingError]]: The inference results of each text, or
+            the error of a text that could not be analyzed.
+
+    Raises:
+        ToneProcessingError: If the batch call fails as a whole.
+    """
+    if settings.INFERENCE_BATCH_ENABLED:
+        response = await _post_inference(INFERENCE_SERVICE_BATCH_PATH, {"texts": texts})
+        if response.status_code == 200:
+            items = response.json()["results"]
+            logger.info(f"Batch inference service returned {len(items)} results")
+            return [
+                item["result"] if item["status"] == "success" else ToneProcessingError(item["error"])
+                for item in items
+            ]
+        if response.status_code not in (404, 405):
+            logger.error(f"Batch inference service returned an error: {response.status_code}")
+            raise ToneProcessingError(f"Inference service error: {response.status_code}")
+        logger.warning("The inference service has no batch endpoint, falling back to one call per text.")
+    return await _infer_fan_out(texts)
+
+async def analyze_tones(texts: List[str], max_length: int) -> List[dict]:
+    """
+    Analyze the tone of several texts, forwarding them to the inference service together.
+
+    Invalid texts are reported individually instead of failing the whole batch.
+    Texts found in the result cache (or being analyzed by another request) are not
+    sent again, and only one copy of each repeated text is sent.
+
+    Args:
+        texts (List[str]): The texts to analyze.
+        max_length (int): The maximum number of characters of a text.
+
+    Returns:
+        List[dict]: One outcome per text, in order, with its "status" ("success" or
+            "error"), its postprocessed "result" and its "error" message.
+
+    Raises:
+        ToneProcessingError: If the inference service cannot analyze the batch.
+    """
+    outcomes: List[Optional[dict]] = [None] * len(texts)
+    preprocessed = {}
+    for index, text in enumerate(texts):
+        try:
+            validate_non_empty_string(text)
+            validate_string_length(text, max_length)
+            preprocessed[index] = preprocess_text(text)
+        except ToneValidationError as e:
+            outcomes[index] = _outcome(error=str(e))
+
+    if preprocessed:
+        try:
+            results = await result_cache.get_or_compute_many(list(preprocessed.values()), _infer_batch)
+        except ToneProcessingError:
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error during batch tone analysis: {e}")
+            raise ToneProcessingError(f"Error during tone analysis: {e}")
+        for index, result in zip(preprocessed, results):
+            outcomes[index] = (
+                _outcome(error=str(result)) if isinstance(result, Exception)
+                else _outcome(result=postprocess_results(dict(result)))
+            )
+
+    logger.info(f"Batch tone analysis completed for {len(texts)} texts ({len(preprocessed)} valid)")
+    return outcomes
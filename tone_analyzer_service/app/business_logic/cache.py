@@ -0,0 +1,207 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from app.config.logger import get_logger
+from app.config.settings import settings
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+class ResultCache:
+    """
+    LRU cache of inference results with a time-to-live, keyed on the preprocessed
+    (canonical) text.
+
+    Identical texts that arrive while the first one is still being analyzed wait
+    for its result instead of calling the inference service again (single-flight).
+    The cache lives on the event loop, so it needs no locking: nothing is awaited
+    between looking a key up and registering it as in flight.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        """
+        Initializes the cache.
+
+        Args:
+            max_entries (int): The maximum number of cached results; the least recently used are evicted.
+            ttl_seconds (float): How long a result stays valid (0 or less means forever).
+            enabled (bool): If False, every lookup is computed and nothing is stored.
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, key: str) -> Tuple[bool, Any]:
+        """
+        Returns whether `key` holds a valid result, and that result.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at > time.monotonic():
+            self._entries.move_to_end(key)
+            return True, value
+        del self._entries[key]
+        self.expirations += 1
+        return False, None
+
+    def _store(self, key: str, value: Any) -> None:
+        """
+        Stores a result and evicts the least recently used entries beyond `max_entries`.
+        """
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else float("inf")
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute_many(
+        self, keys: List[str], compute_many: Callable[[List[str]], Awaitable[List[Any]]]
+    ) -> List[Any]:
+        """
+        Returns the results of several keys, computing the missing ones in a single call.
+
+        Keys already cached are served from the cache, keys being computed by another
+        request are awaited, and only the remaining distinct keys are passed to
+        `compute_many`. The computation is shielded, so a client disconnecting does
+        not cancel it for the other requests waiting on it.
+
+        Args:
+            keys (List[str]): The keys to look up, possibly with duplicates.
+            compute_many (Callable): Computes a list of distinct keys, returning one result
+                per key, or an exception for a key that failed. Failures are not cached.
+
+        Returns:
+            List[Any]: One result (or exception) per key, in order.
+
+        Raises:
+            Exception: Whatever `compute_many` raised if the computation failed as a whole.
+        """
+        if not self.enabled:
+            distinct = list(dict.fromkeys(keys))
+            results = dict(zip(distinct, await compute_many(distinct)))
+            return [results[key] for key in keys]
+
+        results: Dict[str, Any] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        missing: List[str] = []
+        for key in keys:
+            if key in results or key in waiting or key in missing:
+                self.deduplicated += 1
+                continue
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                results[key] = value
+            elif key in self._in_flight:
+                self.deduplicated += 1
+                waiting[key] = self._in_flight[key]
+            else:
+                self.misses += 1
+                missing.append(key)
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in missing}
+            self._in_flight.update(futures)
+            computation = asyncio.ensure_future(self._compute(futures, compute_many))
+            results.update(await asyncio.shield(computation))
+
+        for key, future in waiting.items():
+            try:
+                results[key] = await asyncio.shield(future)
+            except Exception as e:
+                results[key] = e
+        return [results[key] for key in keys]
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the result of `key`, computing it only if it is neither cached nor in flight.
+
+        Args:
+            key (str): The cache key.
+            compute (Callable[[], Awaitable[Any]]): Computes the result.
+
+        Returns:
+            Any: The result.
+
+        Raises:
+            Exception: Whatever `compute` raised.
+        """
+        async def compute_one(keys: List[str]) -> List[Any]:
+            return [await compute()]
+
+        result = (await self.get_or_compute_many([key], compute_one))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def _compute(
+        self, futures: Dict[str, asyncio.Future], compute_many: Callable[[List[str]], Awaitable[List[Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Runs `compute_many` over the keys of `futures`, stores the successful results
+        and resolves the futures the other requests are waiting on.
+        """
+        keys = list(futures)
+        try:
+            values = await compute_many(keys)
+        except BaseException as e:
+            for key, future in futures.items():
+                self._in_flight.pop(key, None)
+                future.set_exception(e)
+                future.exception()  # Waiters are optional: do not report it as never retrieved
+            raise
+
+        for key, value in zip(keys, values):
+            self._in_flight.pop(key, None)
+            future = futures[key]
+            if isinstance(value, Exception):
+                future.set_exception(value)
+                future.exception()
+            else:
+                self._store(key, value)
+                future.set_result(value)
+        return dict(zip(keys, values))
+
+    def clear(self) -> None:
+        """
+        Drops every cached result. Computations in flight are not affected.
+        """
+        self._entries.clear()
+        logger.info("Tone analysis result cache cleared.")
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+        """
+        lookups = self.hits + self.misses + self.deduplicated
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "deduplicated": self.deduplicated,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round((self.hits + self.deduplicated) / lookups, 4) if lookups else 0.0,
+        }
+
+# Shared cache in front of the calls to the inference service
+result_cache = ResultCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED
+)
@@ -0,0 +1,79 @@
+from typing import Optional
+import httpx
+from app.config.logger import get_logger
+from app.config.settings import settings
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+INFERENCE_SERVICE_BASE_URL = f"http://{settings.MODEL_INFERENCE_SERVICE_HOST}:{settings.MODEL_INFERENCE_SERVICE_PORT}"
+
+class InferenceClient:
+    """
+    Holds the pooled async HTTP client used to call the Model Inference Service.
+
+    A single client is shared by all requests, so connections to the inference
+    service are kept alive and reused instead of being opened for every call.
+    Up to `INFERENCE_MAX_CONNECTIONS` calls can be in flight at the same time;
+    further calls wait up to `INFERENCE_POOL_TIMEOUT_SECONDS` for a free connection.
+    """
+
+    def __init__(self, base_url: str):
+        """
+        Initializes the holder. The client itself is created by `start()`.
+
+        Args:
+            base_url (str): The scheme, host and port of the inference service.
+        """
+        self.base_url = base_url
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+        """
+        Creates the client if it does not exist yet.
+
+        Args:
+            transport (Optional[httpx.AsyncBaseTransport]): A custom transport, e.g. a
+                `httpx.MockTransport` in tests. Defaults to a pooled network transport.
+
+        Returns:
+            httpx.AsyncClient: The shared client.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                transport=transport,
+                limits=httpx.Limits(
+                    max_connections=settings.INFERENCE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.INFERENCE_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.INFERENCE_KEEPALIVE_EXPIRY_SECONDS
+                ),
+                timeout=httpx.Timeout(
+                    connect=settings.INFERENCE_CONNECT_TIMEOUT_SECONDS,
+                    read=settings.INFERENCE_READ_TIMEOUT_SECONDS,
+                    write=settings.INFERENCE_WRITE_TIMEOUT_SECONDS,
+                    pool=settings.INFERENCE_POOL_TIMEOUT_SECONDS
+                )
+            )
+            logger.info(f"Inference client created for {self.base_url} "
+                        f"(max connections: {settings.INFERENCE_MAX_CONNECTIONS}).")
+        return self._client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        The shared client, created on first use if the application lifespan did not start it.
+        """
+        return self.start()
+
+    async def close(self) -> None:
+        """
+        Closes the client and its pooled connections.
+        """
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+            logger.info("Inference client closed.")
+
+# Shared client used by the analyzer, started and closed with the application lifespan
+inference_client = InferenceClient(INFERENCE_SERVICE_BASE_URL)
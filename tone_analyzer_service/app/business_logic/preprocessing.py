@@ -0,0 +1,131 @@
+import re
+import unicodedata
+from typing import Callable, Dict, Sequence
+from app.config.logger import get_logger
+from app.config.settings import settings
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Placeholders replacing masked spans. GoEmotions replaced user names with [NAME]
+# in its training data, so mentions are masked the same way.
+URL_MASK = "[URL]"
+MENTION_MASK = "[NAME]"
+EMOJI_MASK = "[EMOJI]"
+
+# Patterns are compiled once at import time, never on the request path
+_WHITESPACE = re.compile(r"\s+")
+_URL = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+_MENTION = re.compile(r"(?<![\w@])@\w+")
+_EMOJI = re.compile(
+    "(?:[\U0001F000-\U0001FAFF\u2600-\u27BF\u2B00-\u2BFF]"
+    "[\uFE0F\u200D\U0001F3FB-\U0001F3FF\u2600-\u27BF\U0001F000-\U0001FAFF]*)+"
+)
+# Letters or sentence punctuation repeated three times or more. Links and mentions are
+# matched first so they are left untouched: squashing them would break the link
+# ("www" becomes "ww" and mask_urls misses it) or change the name. Digits are never
+# squashed ("$1000" keeps its meaning).
+_REPEATS = re.compile(r"(?:https?://|www\.)\S+|(?<![\w@])@\w+|([^\W\d_]|[!?.])\1{2,}", re.IGNORECASE)
+
+# Typographic punctuation mapped to its ASCII form in a single str.translate pass
+_PUNCTUATION = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201A": "'", "\u201B": "'",
+    "\u201C": '"', "\u201D": '"', "\u201E": '"', "\u201F": '"',
+    "\u2013": "-", "\u2014": "-", "\u2212": "-",
+    "\u2026": "...",
+    "\u00A0": " ", "\u202F": " ", "\u2009": " ",
+})
+
+def normalize_unicode(text: str) -> str:
+    """
+    Compose the text to Unicode NFC, skipping the copy when it is already normalized.
+    """
+    return text if unicodedata.is_normalized("NFC", text) else unicodedata.normalize("NFC", text)
+
+def collapse_whitespace(text: str) -> str:
+    """
+    Replace every run of whitespace with a single space.
+    """
+    return _WHITESPACE.sub(" ", text)
+
+def normalize_punctuation(text: str) -> str:
+    """
+    Replace typographic quotes, dashes, ellipses and non-breaking spaces with their ASCII form.
+    """
+    return text.translate(_PUNCTUATION)
+
+def mask_urls(text: str) -> str:
+    """
+    Replace links with a placeholder.
+    """
+    return _URL.sub(URL_MASK, text)
+
+def mask_mentions(text: str) -> str:
+    """
+    Replace @mentions with a placeholder.
+    """
+    return _MENTION.sub(MENTION_MASK, text)
+
+def mask_emoji(text: str) -> str:
+    """
+    Replace each run of emoji (including modifiers and joined sequences) with a placeholder.
+    """
+    return _EMOJI.sub(EMOJI_MASK, text)
+
+def _squash(match: "re.Match") -> str:
+    """
+    Keeps two of a repeated character, and links and mentions as they are.
+    """
+    character = match.group(1)
+    return match.group(0) if character is None else character * 2
+
+def squash_repeats(text: str) -> str:
+    """
+    Shorten letters and !?. repeated three times or more to two ("soooo!!!!" becomes "soo!!").
+    """
+    return _REPEATS.sub(_squash, text)
+
+# Available stages, by the name used in the PREPROCESSING_STAGES setting. They run
+# before the shared normalizer (app/utils/normalizer.py), which always applies.
+# "lowercase" changes the predictions of the cased GoEmotions model.
+STAGES: Dict[str, Callable[[str], str]] = {
+    "nfc": normalize_unicode,
+    "lowercase": str.lower,
+    "strip": str.strip,
+    "collapse_whitespace": collapse_whitespace,
+    "normalize_punctuation": normalize_punctuation,
+    "mask_urls": mask_urls,
+    "mask_mentions": mask_mentions,
+    "mask_emoji": mask_emoji,
+    "squash_repeats": squash_repeats,
+}
+
+def build_pipeline(stage_names: Sequence[str]) -> Callable[[str], str]:
+    """
+    Build a preprocessing function that applies the named stages in order.
+
+    Args:
+        stage_names (Sequence[str]): The stages to apply, as keys of `STAGES`.
+
+    Returns:
+        Callable[[str], str]: The preprocessing function.
+
+    Raises:
+        ValueError: If a stage name is unknown.
+    """
+    unknown = [name for name in stage_names if name not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown preprocessing stage(s): {', '.join(unknown)}. "
+                         f"Available stages: {', '.join(STAGES)}")
+    stages = tuple(STAGES[name] for name in stage_names)
+
+    def preprocess(text: str) -> str:
+        for stage in stages:
+            text = stage(text)
+        return text
+
+    return preprocess
+
+# Pipeline used by the analyzer, as configured by PREPROCESSING_STAGES
+pipeline = build_pipeline(settings.PREPROCESSING_STAGES)
+logger.info(f"Preprocessing stages: {', '.join(settings.PREPROCESSING_STAGES) or 'none'}")
@@ -1,3 +1,4 @@
+from typing import List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -18,6 +19,29 @@ class Settings(BaseSettings):
     MODEL_INFERENCE_SERVICE_HOST: str
     MODEL_INFERENCE_SERVICE_PORT: int
 
+    # Preprocessing settings (ordered stage names, see app/business_logic/preprocessing.py)
+    PREPROCESSING_STAGES: List[str] = []  # JSON list in the environment, e.g. ["mask_urls", "squash_repeats"]
+    NORMALIZER_LOWERCASE: bool = False  # Lowercase the canonical text; only for uncased models (must match the inference service)
+
+    # Inference client settings (a single pooled client is shared by all requests)
+    INFERENCE_MAX_CONNECTIONS: int = 500  # Maximum concurrent connections to the inference service
+    INFERENCE_MAX_KEEPALIVE_CONNECTIONS: int = 100  # Idle connections kept open for reuse
+    INFERENCE_KEEPALIVE_EXPIRY_SECONDS: float = 30  # Close idle connections after this long
+    INFERENCE_CONNECT_TIMEOUT_SECONDS: float = 2  # Time allowed to open a connection
+    INFERENCE_READ_TIMEOUT_SECONDS: float = 30  # Time allowed to wait for the inference result
+    INFERENCE_WRITE_TIMEOUT_SECONDS: float = 5  # Time allowed to send the request body
+    INFERENCE_POOL_TIMEOUT_SECONDS: float = 5  # Time allowed to wait for a free pooled connection
+
+    # Batch analysis settings
+    ANALYZE_BATCH_MAX_TEXTS: int = 256  # Maximum number of texts accepted by /api/analyze/batch
+    INFERENCE_BATCH_ENABLED: bool = True  # Forward batches to /api/inference/batch in a single call
+    INFERENCE_FANOUT_CONCURRENCY: int = 16  # Concurrent single-text calls when the batch endpoint is not used
+
+    # Result cache settings (keyed on the preprocessed text)
+    CACHE_ENABLED: bool = True  # Serve repeated texts without calling the inference service
+    CACHE_MAX_ENTRIES: int = 10000  # Maximum number of cached results (least recently used are evicted)
+    CACHE_TTL_SECONDS: float = 3600  # Time-to-live of a cached result (0 keeps results until evicted)
+
     model_config = SettingsConfigDict(env_file=".env")
 
 # Create an instance of Settings and update DEBUG based on ENVIRONMENT
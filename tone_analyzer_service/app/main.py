@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from app.api.routes import router as tone_analyzer_router
+from app.business_logic.client import inference_client
 from app.config.settings import settings
 from app.config.logger import get_logger
 from contextlib import asynccontextmanager
@@ -11,8 +12,10 @@ logger = get_logger("tone_analyzer_service")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting up the Tone Analyzer Service...")
+    inference_client.start()
     yield
     logger.info("Shutting down the Tone Analyzer Service...")
+    await inference_client.close()
 
 # Create FastAPI app with lifespan
 app = FastAPI(
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
 class EmotionDetail(BaseModel):
     """
@@ -21,3 +21,39 @@ class ToneAnalysisResponse(BaseModel):
     emotions: List[EmotionDetail] = Field(..., description="List of detected emotions with their percentages.")
     predominant_emotion: str = Field(..., description="The predominant emotion detected.")
     confidence: float = Field(..., description="Confidence score for the predominant emotion.")
+
+class BatchToneAnalysisRequest(BaseModel):
+    """
+    Schema for the request body to analyze the tone of several texts.
+    """
+    texts: List[str] = Field(..., min_length=1, description="The texts to be analyzed.")
+
+class BatchToneAnalysisItem(BaseModel):
+    """
+    Schema for the outcome of the tone analysis of one text of a batch.
+    """
+    index: int = Field(..., ge=0, description="The position of the text in the request.")
+    status: str = Field(..., description="Either 'success' or 'error'.")
+    result: Optional[ToneAnalysisResponse] = Field(None, description="The tone analysis result, present on success.")
+    error: Optional[str] = Field(None, description="The error message, present on error.")
+
+class BatchToneAnalysisResponse(BaseModel):
+    """
+    Schema for the response body containing the tone analysis results of a batch.
+    """
+    results: List[BatchToneAnalysisItem] = Field(..., description="One entry per input text, in request order.")
+
+class CacheStatsResponse(BaseModel):
+    """
+    Schema for the response body containing the result cache counters.
+    """
+    enabled: bool = Field(..., description="Whether the cache is enabled.")
+    size: int = Field(..., description="The number of cached results.")
+    max_entries: int = Field(..., description="The maximum number of cached results.")
+    in_flight: int = Field(..., description="The number of distinct texts currently being analyzed.")
+    hits: int = Field(..., description="Lookups served from the cache.")
+    misses: int = Field(..., description="Lookups that called the inference service.")
+    deduplicated: int = Field(..., description="Lookups that joined an identical text already in flight.")
+    evictions: int = Field(..., description="Entries evicted to respect the size bound.")
+    expirations: int = Field(..., description="Entries dropped because their time-to-live elapsed.")
+    hit_rate: float = Field(..., description="The fraction of lookups that did not call the inference service.")
@@ -0,0 +1,80 @@
+"""
+Benchmark the cost per text of each preprocessing stage and of whole pipelines.
+
+Every stage runs over the same corpus of short social-media style texts, so the
+numbers show what a stage adds to the request path when it is enabled in
+PREPROCESSING_STAGES. The shared normalizer, which runs after the stages on
+every request, is measured as well.
+
+Usage (from the tone_analyzer_service directory):
+    python -m benchmarks.benchmark_preprocessing --repeat 2000
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from app.business_logic.preprocessing import STAGES, build_pipeline
+from app.config.settings import settings
+from app.utils.normalizer import normalize_text
+
+SAMPLE_TEXTS = [
+    "I am very happy today!",
+    "  This is the WORST service I have ever used!!!!!  ",
+    "Thank you sooooo much @maria_88, I really appreciate it \U0001F60D\U0001F60D",
+    "I’m not sure what you mean… could you explain that again?",
+    "Wow, check this out: https://example.com/articles/2024/surprise?ref=feed",
+    "I miss my family so much \U0001F622\n\nsee you soon",
+    "That is disgusting — please stop.",
+    "Ok, café at 5? \U0001F44D\U0001F3FD",
+]
+
+# Every stage, in the order a full normalization would apply them
+FULL_PIPELINE = [
+    "nfc", "normalize_punctuation", "mask_urls", "mask_mentions", "mask_emoji",
+    "squash_repeats", "collapse_whitespace", "lowercase", "strip",
+]
+
+def time_per_text(function: Callable[[str], str], texts: List[str], repeat: int, rounds: int = 5) -> float:
+    """
+    Measure the median cost of `function` per text, over several rounds.
+
+    Args:
+        function (Callable[[str], str]): The stage or pipeline to measure.
+        texts (List[str]): The corpus.
+        repeat (int): How many times the corpus is processed per round.
+        rounds (int): The number of timed rounds.
+
+    Returns:
+        float: The median cost per text, in microseconds.
+    """
+    for text in texts:
+        function(text)  # Warm up
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                function(text)
+        timings.append((time.perf_counter() - start) / (repeat * len(texts)) * 1e6)
+    return statistics.median(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'stage':>24}: cost per text")
+    for name, stage in STAGES.items():
+        print(f"{name:>24}: {time_per_text(stage, SAMPLE_TEXTS, args.repeat):8.3f} us")
+
+    print(f"{'normalizer':>24}: {time_per_text(normalize_text, SAMPLE_TEXTS, args.repeat):8.3f} us")
+
+    for label, stage_names in (("configured pipeline", settings.PREPROCESSING_STAGES),
+                               ("full pipeline", FULL_PIPELINE)):
+        cost = time_per_text(build_pipeline(stage_names), SAMPLE_TEXTS, args.repeat)
+        print(f"{label:>24}: {cost:8.3f} us  ({', '.join(stage_names) or 'no stages'})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import asyncio
+import httpx
+import pytest
+from app.business_logic.cache import result_cache
+from app.business_logic.client import inference_client
+
+@pytest.fixture
+def mock_inference():
+    """
+    Routes the shared inference client through a mock transport for the duration of a test, with an empty cache.
+
+    The fixture returns a function that takes the request handler of the mock transport.
+    """
+    def install(handler):
+        asyncio.run(inference_client.close())
+        inference_client.start(transport=httpx.MockTransport(handler))
+
+    result_cache.clear()
+    yield install
+    asyncio.run(inference_client.close())
+    result_cache.clear()
@@ -1,44 +1,66 @@
+import asyncio
+import json
+import httpx
 import pytest
-import requests_mock
-from app.business_logic.analyzer import analyze_tone
+from app.business_logic.analyzer import analyze_tone, analyze_tones
+from app.config.settings import settings
 from app.utils.exceptions import ToneValidationError, ToneProcessingError
 
 # Mock the inference service URL for the tests
 INFERENCE_SERVICE_URL = "http://model_inference_service:8001/api/inference"
 
-def test_analyze_tone_valid_response():
+def test_analyze_tone_valid_response(mock_inference):
     """
     Test that analyze_tone returns correct results when the inference service gives a valid response.
     """
-    with requests_mock.Mocker() as mock:
-        mock.post(INFERENCE_SERVICE_URL, json={
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={
             "emotions": [
                 {"emotion": "joy", "percentage": 80.0},
                 {"emotion": "neutral", "percentage": 20.0}
             ],
             "predominant_emotion": "joy",
             "confidence": 80.0
-        }, status_code=200)
+        })
+
+    mock_inference(handler)
+    result = asyncio.run(analyze_tone("I am happy today!"))
 
-        result = analyze_tone("I am happy today!")
-        
-        assert "emotions" in result
-        assert result["predominant_emotion"] == "joy"
-        assert result["confidence"] == 80.0
-        assert result["message"] == "Tone analysis successful with high confidence."
+    assert str(calls[0].url) == INFERENCE_SERVICE_URL
+    assert "emotions" in result
+    assert result["predominant_emotion"] == "joy"
+    assert result["confidence"] == 80.0
+    assert result["message"] == "Tone analysis successful with high confidence."
 
 
-def test_analyze_tone_inference_service_error():
+def test_analyze_tone_inference_service_error(mock_inference):
     """
     Test that analyze_tone raises a ToneProcessingError when the inference service returns an error.
     """
-    with requests_mock.Mocker() as mock:
-        mock.post(INFERENCE_SERVICE_URL, status_code=500)
+    mock_inference(lambda request: httpx.Response(500))
+
+    with pytest.raises(ToneProcessingError) as exc_info:
+        asyncio.run(analyze_tone("This will fail!"))
 
-        with pytest.raises(ToneProcessingError) as exc_info:
-            analyze_tone("This will fail!")
-        
-        assert "Inference service error: 500" in str(exc_info.value)
+    assert "Inference service error: 500" in str(exc_info.value)
+
+
+def test_analyze_tone_inference_service_timeout(mock_inference):
+    """
+    Test that analyze_tone raises a ToneProcessingError when the inference service does not answer in time.
+    """
+    def handler(request):
+        raise httpx.ReadTimeout("Timed out", request=request)
+
+    mock_inference(handler)
+
+    with pytest.raises(ToneProcessingError) as exc_info:
+        asyncio.run(analyze_tone("This will time out!"))
+
+    assert "Inference service timed out" in str(exc_info.value)
 
 
 def test_analyze_tone_empty_text():
@@ -46,28 +68,124 @@ def test_analyze_tone_empty_text():
     Test that analyze_tone raises a ToneValidationError when analyzing an empty text.
     """
     with pytest.raises(ToneValidationError) as exc_info:
-        analyze_tone("")
+        asyncio.run(analyze_tone(""))
     
     assert str(exc_info.value) == "The input value must be a non-empty string."
 
 
-def test_analyze_tone_low_confidence():
+def test_analyze_tone_low_confidence(mock_inference):
     """
     Test that analyze_tone correctly handles low-confidence results.
     """
-    with requests_mock.Mocker() as mock:
-        mock.post(INFERENCE_SERVICE_URL, json={
-            "emotions": [
-                {"emotion": "sadness", "percentage": 40.0},
-                {"emotion": "neutral", "percentage": 60.0}
-            ],
-            "predominant_emotion": "neutral",
-            "confidence": 40.0
-        }, status_code=200)
+    mock_inference(lambda request: httpx.Response(200, json={
+        "emotions": [
+            {"emotion": "sadness", "percentage": 40.0},
+            {"emotion": "neutral", "percentage": 60.0}
+        ],
+        "predominant_emotion": "neutral",
+        "confidence": 40.0
+    }))
+
+    result = asyncio.run(analyze_tone("I am not feeling great."))
+
+    assert "emotions" in result
+    assert result["predominant_emotion"] == "neutral"
+    assert result["confidence"] == 40.0
+    assert result["message"] == "Low confidence in the predominant emotion."
+
+
+def test_analyze_tone_calls_run_concurrently(mock_inference):
+    """
+    Test that concurrent analyses share the pooled client without waiting for each other.
+    """
+    in_flight = []
+
+    async def handler(request):
+        in_flight.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"emotions": [], "predominant_emotion": "joy", "confidence": 90.0,
+                                         "concurrent": len(in_flight)})
+
+    async def analyze_many():
+        return await asyncio.gather(*(analyze_tone(f"Text {i}") for i in range(20)))
+
+    mock_inference(handler)
+    results = asyncio.run(analyze_many())
+
+    assert len(results) == 20
+    assert max(result["concurrent"] for result in results) == 20
+
+
+def _inference_result(confidence: float) -> dict:
+    return {"emotions": [{"emotion": "joy", "percentage": confidence}], "predominant_emotion": "joy",
+            "confidence": confidence}
+
+
+def test_analyze_tones_uses_batch_endpoint(mock_inference):
+    """
+    Test that analyze_tones sends the valid texts in one batch call and reports invalid texts per item.
+    """
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        texts = json.loads(request.content)["texts"]
+        return httpx.Response(200, json={"results": [
+            {"index": index, "status": "success", "result": _inference_result(80.0 if text == "Good" else 30.0),
+             "error": None}
+            for index, text in enumerate(texts)
+        ]})
+
+    mock_inference(handler)
+    outcomes = asyncio.run(analyze_tones(["Good ", "  ", "Bad", "x" * 11], max_length=10))
+
+    assert len(calls) == 1
+    assert calls[0].url.path == "/api/inference/batch"
+    assert json.loads(calls[0].content) == {"texts": ["Good", "Bad"]}
+    assert [outcome["status"] for outcome in outcomes] == ["success", "error", "success", "error"]
+    assert outcomes[0]["result"]["message"] == "Tone analysis successful with high confidence."
+    assert outcomes[2]["result"]["message"] == "Low confidence in the predominant emotion."
+    assert outcomes[1]["error"] == "The input value must be a non-empty string."
+    assert "should not exceed 10 characters" in outcomes[3]["error"]
+
+
+def test_analyze_tones_falls_back_to_bounded_fan_out(mock_inference, monkeypatch):
+    """
+    Test that analyze_tones calls the single-text endpoint concurrently, within the concurrency limit,
+    when the inference service has no batch endpoint.
+    """
+    monkeypatch.setattr(settings, "INFERENCE_FANOUT_CONCURRENCY", 3)
+    active = []
+    peak = []
+
+    async def handler(request):
+        if request.url.path == "/api/inference/batch":
+            return httpx.Response(404)
+        text = json.loads(request.content)["text"]
+        if text == "broken":
+            return httpx.Response(500)
+        active.append(text)
+        peak.append(len(active))
+        await asyncio.sleep(0.01)
+        active.remove(text)
+        return httpx.Response(200, json=_inference_result(90.0))
+
+    mock_inference(handler)
+    texts = [f"text {i}" for i in range(10)] + ["broken"]
+    outcomes = asyncio.run(analyze_tones(texts, max_length=100))
+
+    assert max(peak) == 3
+    assert [outcome["status"] for outcome in outcomes] == ["success"] * 10 + ["error"]
+    assert "Inference service error: 500" in outcomes[-1]["error"]
+
+
+def test_analyze_tones_batch_failure(mock_inference):
+    """
+    Test that analyze_tones raises a ToneProcessingError when the batch call fails as a whole.
+    """
+    mock_inference(lambda request: httpx.Response(503))
 
-        result = analyze_tone("I am not feeling great.")
+    with pytest.raises(ToneProcessingError) as exc_info:
+        asyncio.run(analyze_tones(["Hello"], max_length=100))
 
-        assert "emotions" in result
-        assert result["predominant_emotion"] == "neutral"
-        assert result["confidence"] == 40.0
-        assert result["message"] == "Low confidence in the predominant emotion."
+    assert "Inference service error: 503" in str(exc_info.value)
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import httpx
+import pytest
+from app.business_logic.analyzer import analyze_tone, analyze_tones
+from app.business_logic.cache import ResultCache, result_cache
+from app.utils.exceptions import ToneProcessingError
+
+@pytest.fixture
+def counted_inference(mock_inference):
+    """
+    Routes the shared inference client through a mock transport that counts the texts sent, with an empty cache.
+    """
+    sent = []
+
+    async def handler(request):
+        payload = json.loads(request.content)
+        texts = payload.get("texts", [payload.get("text")])
+        sent.extend(texts)
+        await asyncio.sleep(0.01)
+        results = [{"emotions": [{"emotion": "joy", "percentage": 90.0}], "predominant_emotion": "joy",
+                    "confidence": 90.0} for _ in texts]
+        if "texts" in payload:
+            return httpx.Response(200, json={"results": [
+                {"index": index, "status": "success", "result": result, "error": None}
+                for index, result in enumerate(results)
+            ]})
+        return httpx.Response(200, json=results[0])
+
+    mock_inference(handler)
+    return sent
+
+def test_repeated_texts_are_served_from_cache(counted_inference):
+    """
+    Test that texts with the same canonical form only reach the inference service once.
+    """
+    hits = result_cache.hits
+    first = asyncio.run(analyze_tone("I am  Happy "))
+    second = asyncio.run(analyze_tone("  I am\tHappy"))
+    asyncio.run(analyze_tone("I AM HAPPY"))
+
+    assert counted_inference == ["I am Happy", "I AM HAPPY"]
+    assert first == second
+    assert result_cache.hits == hits + 1
+
+def test_concurrent_identical_requests_share_one_call(counted_inference):
+    """
+    Test that identical texts in flight at the same time are analyzed once (single-flight).
+    """
+    async def analyze_many():
+        singles = [analyze_tone("Same text") for _ in range(5)]
+        return await asyncio.gather(*singles, analyze_tones(["Same  text", "Other", "Other "], max_length=100))
+
+    results = asyncio.run(analyze_many())
+
+    assert sorted(counted_inference) == ["Other", "Same text"]
+    assert all(result["predominant_emotion"] == "joy" for result in results[:5])
+    assert [outcome["status"] for outcome in results[5]] == ["success"] * 3
+
+def test_cache_evicts_least_recently_used_and_expires():
+    """
+    Test the size bound and the time-to-live of the cache.
+    """
+    cache = ResultCache(max_entries=2, ttl_seconds=0.05)
+
+    async def compute_many(keys):
+        return [key.upper() for key in keys]
+
+    async def scenario():
+        await cache.get_or_compute_many(["a", "b"], compute_many)
+        await cache.get_or_compute_many(["a"], compute_many)  # "a" is now the most recently used
+        await cache.get_or_compute_many(["c"], compute_many)  # evicts "b"
+        assert cache.stats()["size"] == 2
+        assert cache.evictions == 1
+        await asyncio.sleep(0.06)
+        return await cache.get_or_compute_many(["a", "c"], compute_many)
+
+    assert asyncio.run(scenario()) == ["A", "C"]
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 5
+    assert stats["expirations"] == 2
+    assert stats["hit_rate"] == round(1 / 6, 4)
+
+def test_cache_does_not_store_failures():
+    """
+    Test that a failed text is reported to its caller and computed again on the next lookup.
+    """
+    cache = ResultCache(max_entries=10, ttl_seconds=60)
+    calls = []
+
+    async def compute_many(keys):
+        calls.append(keys)
+        return [ToneProcessingError("boom") if key == "bad" else key for key in keys]
+
+    async def scenario():
+        first = await cache.get_or_compute_many(["good", "bad"], compute_many)
+        second = await cache.get_or_compute_many(["good", "bad"], compute_many)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first[0] == "good" and isinstance(first[1], ToneProcessingError)
+    assert isinstance(second[1], ToneProcessingError)
+    assert calls == [["good", "bad"], ["bad"]]
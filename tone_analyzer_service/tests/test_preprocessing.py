@@ -0,0 +1,64 @@
+import pytest
+from app.business_logic import analyzer
+from app.business_logic.analyzer import MAX_TEXT_LENGTH, preprocess_text
+from app.business_logic.preprocessing import STAGES, build_pipeline
+
+def test_default_preprocessing_keeps_case():
+    """
+    Test that the default preprocessing only applies the shared normalizer, keeping case for the cased model.
+    """
+    assert preprocess_text("  Hello   World!  ") == "Hello World!"
+
+@pytest.mark.parametrize("stage, text, expected", [
+    ("nfc", "cafe\u0301", "caf\u00e9"),
+    ("collapse_whitespace", "so \t tired\n\nnow", "so tired now"),
+    ("normalize_punctuation", "\u201cWow\u201d \u2014 it\u2019s great\u2026", "\"Wow\" - it's great..."),
+    ("mask_urls", "see https://example.com/a?b=1 and www.test.org", "see [URL] and [URL]"),
+    ("mask_mentions", "thanks @alice and @bob_2, mail me at a@b.com", "thanks [NAME] and [NAME], mail me at a@b.com"),
+    ("mask_emoji", "great \U0001F602\U0001F602 job \U0001F44D\U0001F3FD \u2764\ufe0f", "great [EMOJI] job [EMOJI] [EMOJI]"),
+    ("squash_repeats", "sooooo happy!!!!! ok", "soo happy!! ok"),
+    ("squash_repeats", "paid $1000 for 3333 tickets", "paid $1000 for 3333 tickets"),
+    ("squash_repeats", "see www.example.com/aaa and @llllama, noooo", "see www.example.com/aaa and @llllama, noo"),
+])
+def test_stages(stage, text, expected):
+    """
+    Test each preprocessing stage on its own.
+    """
+    assert STAGES[stage](text) == expected
+
+def test_pipeline_applies_stages_in_order():
+    """
+    Test that a custom pipeline runs every configured stage in the given order.
+    """
+    preprocess = build_pipeline(["nfc", "mask_urls", "mask_mentions", "collapse_whitespace", "squash_repeats",
+                                 "lowercase", "strip"])
+    assert preprocess("  @Bob   LOOOOK at http://x.io  ") == "[name] look at [url]"
+    assert build_pipeline([])("  As Is  ") == "  As Is  "
+
+def test_squashing_before_masking_keeps_urls_maskable():
+    """
+    Test that squashing repeats does not break links that a later stage masks.
+    """
+    preprocess = build_pipeline(["squash_repeats", "mask_urls"])
+    assert preprocess("loooove www.example.com/aaa") == "loove [URL]"
+
+def test_preprocess_text_stays_within_length_after_masking(monkeypatch):
+    """
+    Test that masks making a text longer than the limit it was validated against are cut back at a word boundary.
+    """
+    monkeypatch.setattr(analyzer, "pipeline", build_pipeline(["mask_mentions"]))
+    text = "@a " * 166
+    assert len(text) <= MAX_TEXT_LENGTH
+
+    processed = preprocess_text(text)
+    assert len(processed) <= MAX_TEXT_LENGTH
+    assert processed.endswith("[NAME]")
+    assert set(processed.split(" ")) == {"[NAME]"}
+
+def test_pipeline_rejects_unknown_stages():
+    """
+    Test that an unknown stage name is reported when the pipeline is built.
+    """
+    with pytest.raises(ValueError) as exc_info:
+        build_pipeline(["lowercase", "stem"])
+    assert "stem" in str(exc_info.value)
@@ -1,28 +1,41 @@
-import pytest
-import requests_mock
+import httpx
 from fastapi.testclient import TestClient
+from app.business_logic.client import inference_client
+from app.config.settings import settings
 from app.main import app
 
 client = TestClient(app)
 INFERENCE_SERVICE_URL = "http://model_inference_service:8001/api/inference"
 
-def test_analyze_route_valid_text():
+def test_analyze_route_valid_text(mock_inference):
     # Mockear una respuesta válida del servicio de inferencia
-    with requests_mock.Mocker() as mock:
-        mock.post(INFERENCE_SERVICE_URL, json={
+    def handler(request):
+        assert str(request.url) == INFERENCE_SERVICE_URL
+        return httpx.Response(200, json={
             "emotions": [
                 {"emotion": "joy", "percentage": 80.0},
                 {"emotion": "neutral", "percentage": 20.0}
             ],
             "predominant_emotion": "joy",
             "confidence": 80.0
-        }, status_code=200)
+        })
 
-        response = client.post("/api/analyze", json={"text": "I am happy today!"})
-        assert response.status_code == 200
-        result = response.json()
-        assert result["predominant_emotion"] == "joy"
-        assert result["confidence"] == 80.0
+    mock_inference(handler)
+    response = client.post("/api/analyze", json={"text": "I am happy today!"})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["predominant_emotion"] == "joy"
+    assert result["confidence"] == 80.0
+
+def test_lifespan_manages_inference_client():
+    """
+    Test that the pooled inference client is created on startup and closed on shutdown.
+    """
+    with TestClient(app):
+        pooled = inference_client.client
+        assert not pooled.is_closed
+        assert inference_client.client is pooled
+    assert pooled.is_closed
 
 def test_analyze_route_empty_text():
     """
@@ -38,3 +51,42 @@ def test_analyze_route_too_long_text():
     long_text = "a" * 501  # 501 characters, exceeds limit of 500
     response = client.post("/api/analyze", json={"text": long_text})
     assert response.status_code == 400  # Debería devolver 400 debido a la validación de longitud
+
+def test_analyze_batch_route(mock_inference):
+    """
+    Test the /api/analyze/batch route, expecting one result or error per text in request order.
+    """
+    def handler(request):
+        assert request.url.path == "/api/inference/batch"
+        return httpx.Response(200, json={"results": [
+            {"index": 0, "status": "success", "error": None,
+             "result": {"emotions": [{"emotion": "joy", "percentage": 80.0}], "predominant_emotion": "joy",
+                        "confidence": 80.0}}
+        ]})
+
+    mock_inference(handler)
+    response = client.post("/api/analyze/batch", json={"texts": ["I am happy today!", "a" * 501]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["index"] for item in results] == [0, 1]
+    assert results[0]["status"] == "success"
+    assert results[0]["result"]["predominant_emotion"] == "joy"
+    assert results[1]["status"] == "error"
+    assert results[1]["result"] is None
+
+def test_analyze_batch_route_too_many_texts():
+    """
+    Test the /api/analyze/batch route with more texts than allowed, expecting a 422 response.
+    """
+    response = client.post("/api/analyze/batch", json={"texts": ["text"] * (settings.ANALYZE_BATCH_MAX_TEXTS + 1)})
+    assert response.status_code == 422
+
+def test_cache_stats_route():
+    """
+    Test the /api/cache/stats route, expecting the result cache counters.
+    """
+    response = client.get("/api/cache/stats")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["enabled"] is True
+    assert {"size", "hits", "misses", "deduplicated", "hit_rate"} <= set(stats)